@@ -0,0 +1,127 @@
+import json
+import os
+from os.path import expanduser, join
+from typing import Any, Optional, Type, TypeVar
+from pytezos.client import PyTezosClient
+from pytezos.context.impl import ExecutionContext
+from pytezos.contract.interface import ContractInterface
+from pytezos.contract.view import ContractView
+from pytezos.michelson.forge import forge_micheline, forge_script_expr
+from pytezos.michelson.program import MichelsonProgram
+
+from tests.helpers.contracts.contract import ContractHelper
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.utility import NULL_ADDRESS
+
+T = TypeVar('T', bound=ContractHelper)
+
+# an empty CTEZ_CACHE_DIR disables the cache
+DEFAULT_CACHE_DIR = join(expanduser('~'), '.cache', 'ctez')
+
+
+def get_code_hash(code: list) -> str:
+    return forge_script_expr(forge_micheline(code))
+
+
+def build_interface(client: PyTezosClient, address: str, code: list) -> ContractInterface:
+    """Interface of the contract parsing only its parameter and storage types, the
+    views keep their Micheline code as they run on the node. The code section,
+    most of the parsing time, is only needed to interpret the contract locally"""
+    context = ExecutionContext(shell=client.shell, key=client.key, address=address, script={'code': code})
+    program = MichelsonProgram.load(context, with_code=False)
+    interface = type(ContractInterface.__name__, (ContractInterface,), {'program': program})(context)
+    for view in context.get_views_expr():
+        name, parameter, return_type, view_code = view['args']
+        setattr(interface, name['string'], ContractView(
+            context=context,
+            name=name['string'],
+            parameter=parameter,
+            return_type=return_type,
+            code=view_code,
+        ))
+    return interface
+
+
+class ContractCache:
+    """Code of the contracts kept on disk, so that the commands neither download nor
+    fully parse it. The code at an address never changes: every address maps to the
+    hash of its code, and the code is stored once per hash, shared by all the ovens.
+    The address of the ctez fa12 token, set once, is kept with the ctez2 address.
+    The same address holds other contracts on other networks, so the addresses are
+    kept under the chain id of the node."""
+
+    def __init__(self, directory: Optional[str]):
+        self.directory = directory
+        # chain ids by node uri, read once per node
+        self.chain_ids: dict[str, str] = {}
+
+    @classmethod
+    def default(cls) -> 'ContractCache':
+        return cls(os.environ.get('CTEZ_CACHE_DIR', DEFAULT_CACHE_DIR) or None)
+
+    def read(self, *path: str) -> Optional[dict]:
+        try:
+            with open(join(self.directory, *path)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, value: Any, *path: str) -> None:
+        """Writes to a temporary file first, so that a concurrent command never reads
+        a partial file"""
+        filename = join(self.directory, *path)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        temporary = f'{filename}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(value, f)
+        os.replace(temporary, filename)
+
+    def get_chain_id(self, client: PyTezosClient) -> str:
+        uri = client.shell.node.uri[0]
+        if uri not in self.chain_ids:
+            self.chain_ids[uri] = client.shell.chains.main.chain_id()
+        return self.chain_ids[uri]
+
+    def get_entry_path(self, client: PyTezosClient, address: str) -> tuple[str, ...]:
+        return (self.get_chain_id(client), 'contracts', f'{address}.json')
+
+    def get_code(self, client: PyTezosClient, address: str) -> list:
+        entry_path = self.get_entry_path(client, address)
+        entry = self.read(*entry_path) or {}
+        code = 'code_hash' in entry and self.read('code', f'{entry["code_hash"]}.json')
+        if not code:
+            code = client.shell.contracts[address].script()['code']
+            code_hash = get_code_hash(code)
+            self.write(code, 'code', f'{code_hash}.json')
+            self.write({**entry, 'code_hash': code_hash}, *entry_path)
+        return code
+
+    def load_contract(self, client: PyTezosClient, address: str) -> ContractInterface:
+        if self.directory is None:
+            return client.contract(address)
+        return build_interface(client, address, self.get_code(client, address))
+
+    def load(self, helper_type: Type[T], client: PyTezosClient, address: str, **init_params: Any) -> T:
+        return helper_type(
+            contract=self.load_contract(client, address),
+            client=client,
+            address=address,
+            **init_params,
+        )
+
+    def get_ctez_fa12_address(self, ctez2: Ctez2) -> str:
+        if self.directory is None:
+            return ctez2.get_ctez_fa12_address()
+        entry_path = self.get_entry_path(ctez2.client, ctez2.address)
+        entry = self.read(*entry_path) or {}
+        if 'ctez_fa12_address' not in entry:
+            fa12_address = ctez2.get_ctez_fa12_address()
+            if fa12_address == NULL_ADDRESS:
+                return fa12_address
+            entry = {**entry, 'ctez_fa12_address': fa12_address}
+            self.write(entry, *entry_path)
+        return entry['ctez_fa12_address']
+
+    def load_ctez_token(self, ctez2: Ctez2) -> Fa12:
+        return self.load(Fa12, ctez2.client, self.get_ctez_fa12_address(ctez2))
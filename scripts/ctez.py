@@ -2,10 +2,11 @@ from math import floor
 from typing import Optional
 import click
 
+from scripts.contract_cache import ContractCache
 from scripts.helpers import create_manager, get_balance_mutez
 from tests.helpers.addressable import get_address
 from tests.helpers.contracts.ctez2.ctez2 import Ctez2
-from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.contracts.oven.oven import Oven
 from random import randrange, uniform
 
 @click.command()
@@ -24,7 +25,8 @@ def create_oven(
     rpc_url: Optional[str],
 ) -> None:
     manager = create_manager(private_key, rpc_url)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     print('Creating oven...')
     opg = ctez2.create_oven(oven_id, delegate, depositors=None).with_amount(deposit).send()
     manager.wait(opg)
@@ -44,8 +46,9 @@ def deposit(
     rpc_url: Optional[str],
 ) -> None:
     manager = create_manager(private_key, rpc_url)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
-    oven = ctez2.get_oven_contract(manager, manager, oven_id)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
+    oven = cache.load(Oven, manager, ctez2.get_oven(manager, oven_id).address)
     print('Depositing to oven...')
     opg = oven.deposit().with_amount(deposit).send()
     manager.wait(opg)
@@ -68,7 +71,8 @@ def withdraw(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     to_address = to_address if to_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     print('Withdrawing from oven...')
     opg = ctez2.withdraw_from_oven(oven_id, amount, to_address).send()
     manager.wait(opg)
@@ -88,7 +92,8 @@ def mint_or_burn(
     rpc_url: Optional[str],
 ) -> None:
     manager = create_manager(private_key, rpc_url)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     print('Minting or burning in oven...')
     opg = ctez2.mint_or_burn(oven_id, quantity).send()
     manager.wait(opg)
@@ -113,7 +118,8 @@ def liquidate(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     to_address = to_address if to_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     print('Liquidating oven...')
     opg = ctez2.liquidate_oven(oven_owner_address, oven_id, quantity, to_address).send()
     manager.wait(opg)
@@ -134,8 +140,9 @@ def add_ctez_liquidity(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     owner_address = owner_address if owner_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
-    ctez_token = Fa12.from_address(manager, ctez2.get_ctez_fa12_address())
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
+    ctez_token = cache.load_ctez_token(ctez2)
     deadline = manager.now() + 1000
     print('Adding ctez liquidity...')
     
@@ -162,7 +169,8 @@ def add_tez_liquidity(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     owner_address = owner_address if owner_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     deadline = manager.now() + 1000
     print('Adding tez liquidity...')
     
@@ -183,7 +191,8 @@ def collect_from_ctez_liquidity(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     to_address = to_address if to_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     print('Collecting from ctez liquidity...')
     
     opg = ctez2.collect_from_ctez_liquidity(to_address).send()
@@ -203,7 +212,8 @@ def collect_from_tez_liquidity(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     to_address = to_address if to_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     print('Collecting from tez liquidity...')
     
     opg = ctez2.collect_from_tez_liquidity(to_address).send()
@@ -225,7 +235,8 @@ def remove_ctez_liquidity(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     to_address = to_address if to_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     deadline = manager.now() + 1000
     print('Removing ctez liquidity...')
     
@@ -248,7 +259,8 @@ def remove_tez_liquidity(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     to_address = to_address if to_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     deadline = manager.now() + 1000
     print('Removing tez liquidity...')
     
@@ -271,8 +283,9 @@ def ctez_to_tez(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     to_address = to_address if to_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
-    ctez_token = Fa12.from_address(manager, ctez2.get_ctez_fa12_address())
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
+    ctez_token = cache.load_ctez_token(ctez2)
     deadline = manager.now() + 1000
     print('Swapping ctez to tez...')
     
@@ -299,7 +312,8 @@ def tez_to_ctez(
 ) -> None:
     manager = create_manager(private_key, rpc_url)
     to_address = to_address if to_address is not None else get_address(manager)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     deadline = manager.now() + 1000
     print('Swapping tez to ctez...')
     
@@ -319,7 +333,8 @@ def execute_every_entrypoint(
     rpc_url: Optional[str],
 ) -> None:
     manager = create_manager(private_key, rpc_url)
-    ctez2 = Ctez2.from_address(manager, ctez_address)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
     sender_address = get_address(manager)
     oven_id = randrange(100_000_000_000)
     initial_deposit = randrange(1_000_000, 100_000_000)
@@ -331,7 +346,7 @@ def execute_every_entrypoint(
     
     deposit = randrange(1_000_000, 100_000_000)
     print(f'Depositing {deposit} mutez...')
-    oven = ctez2.get_oven_contract(manager, sender_address, oven_id)
+    oven = cache.load(Oven, manager, ctez2.get_oven(sender_address, oven_id).address)
     opg = oven.deposit().with_amount(deposit).send()
     manager.wait(opg)
     print(f'Operation has been completed: {opg.opg_hash}')
@@ -345,7 +360,7 @@ def execute_every_entrypoint(
 
     add_ctez_liquidity_amount = floor(mint_amount / 2)
     print(f'Adding {add_ctez_liquidity_amount} to ctez liquidity...')
-    ctez_token = Fa12.from_address(manager, ctez2.get_ctez_fa12_address())
+    ctez_token = cache.load_ctez_token(ctez2)
     opg = manager.bulk(
         ctez_token.approve(ctez2, 0),
         ctez_token.approve(ctez2, add_ctez_liquidity_amount),
@@ -356,7 +371,7 @@ def execute_every_entrypoint(
 
     add_tez_liquidity_amount = floor(add_ctez_liquidity_amount * target * uniform(0, 2))
     print(f'Adding {add_tez_liquidity_amount} to tez liquidity...')
-    ctez_token = Fa12.from_address(manager, ctez2.get_ctez_fa12_address())
+    ctez_token = cache.load_ctez_token(ctez2)
     opg = ctez2.add_tez_liquidity(sender_address, 0, deadline).with_amount(add_tez_liquidity_amount).send()
     manager.wait(opg)
     print(f'Operation has been completed: {opg.opg_hash}')
@@ -0,0 +1,121 @@
+import json
+import os
+import subprocess
+import sys
+from os.path import join
+from typing import NamedTuple, Optional
+import click
+
+from tests.helpers.utility import get_tests_dir
+
+GAS_TEST = join(get_tests_dir(), 'ctez2', 'test_gas_consumption.py')
+RECORDED_FILE = join(get_tests_dir(), 'ctez2', 'gas_consumption.json')
+BASELINE_FILE = join(get_tests_dir(), 'ctez2', 'gas_baseline.json')
+FIELDS = ('consumed_gas', 'consumed_mutez', 'paid_storage_size_diff')
+
+
+class Comparison(NamedTuple):
+    key: str
+    field: str
+    baseline: Optional[int]
+    recorded: Optional[int]
+    status: str  # ok, regression, improvement, new or missing
+
+
+def compare_field(key: str, field: str, baseline: int, recorded: int, tolerance: float) -> Comparison:
+    """A value is a regression above baseline * (1 + tolerance), an improvement below
+    baseline * (1 - tolerance)"""
+    if recorded > baseline * (1 + tolerance):
+        status = 'regression'
+    elif recorded < baseline * (1 - tolerance):
+        status = 'improvement'
+    else:
+        status = 'ok'
+    return Comparison(key, field, baseline, recorded, status)
+
+
+def compare(baseline: dict, recorded: dict, tolerances: dict[str, float]) -> list[Comparison]:
+    comparisons = []
+    for key in sorted(baseline.keys() | recorded.keys()):
+        for field in FIELDS:
+            if key not in recorded:
+                comparisons.append(Comparison(key, field, baseline[key][field], None, 'missing'))
+            elif key not in baseline:
+                comparisons.append(Comparison(key, field, None, recorded[key][field], 'new'))
+            else:
+                comparisons.append(compare_field(key, field, baseline[key][field], recorded[key][field], tolerances[field]))
+    return comparisons
+
+
+def format_change(c: Comparison) -> str:
+    if c.baseline is None or c.recorded is None:
+        return ''
+    if c.baseline == 0:
+        return f'{c.recorded - c.baseline:+}'
+    return f'{c.recorded - c.baseline:+} ({(c.recorded - c.baseline) / c.baseline:+.2%})'
+
+
+def print_table(comparisons: list[Comparison], all_rows: bool) -> None:
+    print(f'{"operation":<38} {"field":<24} {"baseline":>10} {"recorded":>10} {"change":>20}  status')
+    for c in comparisons:
+        if all_rows or c.status != 'ok':
+            baseline = '' if c.baseline is None else c.baseline
+            recorded = '' if c.recorded is None else c.recorded
+            print(f'{c.key:<38} {c.field:<24} {baseline:>10} {recorded:>10} {format_change(c):>20}  {c.status}')
+
+
+def load(filename: str) -> dict:
+    with open(filename) as f:
+        return json.load(f)
+
+
+@click.command()
+@click.option('--run/--no-run', default=False, help='Run the gas consumption tests on a sandboxed node first, instead of comparing the last records.')
+@click.option('--baseline', default=BASELINE_FILE, help='Committed records to compare with.')
+@click.option('--recorded', default=RECORDED_FILE, help='Records written by the gas consumption tests.')
+@click.option('--gas-tolerance', default=0.01, type=float, help='Allowed relative increase of consumed_gas.')
+@click.option('--mutez-tolerance', default=0.01, type=float, help='Allowed relative increase of consumed_mutez.')
+@click.option('--storage-tolerance', default=0.0, type=float, help='Allowed relative increase of paid_storage_size_diff.')
+@click.option('--allow-missing', is_flag=True, help="Don't fail when an operation of the baseline wasn't recorded.")
+@click.option('--allow-new', is_flag=True, help="Don't fail when a recorded operation has no baseline yet.")
+@click.option('--all', 'all_rows', is_flag=True, help='Print the unchanged values too.')
+@click.option('--update', is_flag=True, help='Write the records as the new baseline after the comparison.')
+def gas_baseline(
+    run: bool,
+    baseline: str,
+    recorded: str,
+    gas_tolerance: float,
+    mutez_tolerance: float,
+    storage_tolerance: float,
+    allow_missing: bool,
+    allow_new: bool,
+    all_rows: bool,
+    update: bool,
+) -> None:
+    """Compares the gas, fees and paid storage recorded by the gas consumption tests
+    with the baseline, and exits with an error on a regression"""
+    if run:
+        # the records are merged into the file, start from an empty one not to compare stale keys
+        if os.path.exists(recorded):
+            os.remove(recorded)
+        result = subprocess.run([sys.executable, '-m', 'pytest', '-q', GAS_TEST])
+        if result.returncode != 0:
+            raise click.ClickException('The gas consumption tests failed')
+
+    tolerances = {
+        'consumed_gas': gas_tolerance,
+        'consumed_mutez': mutez_tolerance,
+        'paid_storage_size_diff': storage_tolerance,
+    }
+    comparisons = compare(load(baseline), load(recorded), tolerances)
+    print_table(comparisons, all_rows)
+
+    # an operation without a baseline can't regress unnoticed, it has to be added with --update
+    failing = {'regression'} | (set() if allow_missing else {'missing'}) | (set() if allow_new else {'new'})
+    count = lambda status: len({c.key for c in comparisons if c.status == status})
+    print(f'\n{count("regression")} regressed, {count("improvement")} improved, {count("new")} new, {count("missing")} missing operations')
+    if update:
+        with open(baseline, 'w') as f:
+            json.dump(load(recorded), f, indent=4)
+    elif any(c.status in failing for c in comparisons):
+        raise SystemExit(1)
@@ -0,0 +1,149 @@
+from collections import defaultdict
+from typing import NamedTuple, Optional
+import click
+from pytezos import PyTezosClient
+from pytezos.contract.call import ContractCall
+from pytezos.operation.result import OperationResult
+from pytezos.rpc.errors import RpcError
+
+from scripts.contract_cache import ContractCache
+from scripts.helpers import create_manager
+from tests.helpers.addressable import get_address
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+
+# oven created by the warm-up call, the profiled calls never touch it
+WARM_UP_OVEN_ID = 2**64 - 1
+
+
+class CallGas(NamedTuple):
+    # the ctez2 call itself, do_housekeeping included when it is the first call of the block
+    main: int
+    # milligas of the internal operations by label, like `fa12 %transfer` or `event remove_liquidity`
+    internal: dict[str, int]
+
+    @property
+    def total(self) -> int:
+        return self.main + sum(self.internal.values())
+
+
+class PhaseProfile(NamedTuple):
+    entrypoint: str
+    first: CallGas
+    after_warm_up: CallGas
+
+    @property
+    def housekeeping(self) -> int:
+        """do_housekeeping runs once per block, so the call after the warm-up only pays
+        for the entrypoint body. Both calls pay what only the first call of the sender
+        pays, like creating its liquidity owner entry."""
+        return self.first.main - self.after_warm_up.main
+
+
+def label_internal_operation(op: dict, names: dict[str, str]) -> str:
+    if op['kind'] == 'event':
+        return f'event {op.get("tag", "")}'
+    if op['kind'] != 'transaction':
+        return op['kind']
+    destination = op['destination']
+    name = names.get(destination, 'oven' if destination.startswith('KT1') else 'tez')
+    if name == 'tez':
+        return 'tez transfer'
+    return f'{name} %{op.get("parameters", {}).get("entrypoint", "default")}'
+
+
+def get_call_gas(content: dict, names: dict[str, str]) -> CallGas:
+    metadata = content['metadata']
+    internal: dict[str, int] = defaultdict(int)
+    for op in metadata.get('internal_operation_results', []):
+        internal[label_internal_operation(op, names)] += int(op['result'].get('consumed_milligas', 0))
+    return CallGas(int(metadata['operation_result'].get('consumed_milligas', 0)), dict(internal))
+
+
+def simulate_last_call(manager: PyTezosClient, calls: list[ContractCall], names: dict[str, str]) -> CallGas:
+    result = manager.bulk(*calls).fill().run()
+    if not OperationResult.is_applied(result):
+        raise RpcError.from_errors(OperationResult.errors(result))
+    return get_call_gas(result['contents'][-1], names)
+
+
+def profile_call(
+    manager: PyTezosClient,
+    entrypoint: str,
+    call: ContractCall,
+    prepare: list[ContractCall],
+    warm_up: ContractCall,
+    names: dict[str, str],
+) -> PhaseProfile:
+    """Simulates the call in two operation groups on top of the head. In the first one
+    the call runs do_housekeeping as the first ctez2 call of the block, in the second
+    one the warm-up ctez2 call runs it before. The warm-up touches nothing the call
+    does, so the call pays the same for everything but the housekeeping."""
+    first = simulate_last_call(manager, [*prepare, call], names)
+    after_warm_up = simulate_last_call(manager, [*prepare, warm_up, call], names)
+    return PhaseProfile(entrypoint, first, after_warm_up)
+
+
+def format_gas(milligas: Optional[int]) -> str:
+    return '' if milligas is None else f'{milligas / 1000:.3f}'
+
+
+def print_profile(profile: PhaseProfile) -> None:
+    print(f'{profile.entrypoint:<40} {"first in block":>16} {"after warm-up":>16}')
+    rows = [
+        ('ctez2 (housekeeping + body)', profile.first.main, profile.after_warm_up.main),
+        ('  housekeeping', profile.housekeeping, None),
+        ('  body', profile.after_warm_up.main, profile.after_warm_up.main),
+    ]
+    for label in sorted(profile.first.internal.keys() | profile.after_warm_up.internal.keys()):
+        rows.append((label, profile.first.internal.get(label), profile.after_warm_up.internal.get(label)))
+    rows.append(('total', profile.first.total, profile.after_warm_up.total))
+    for label, first, after_warm_up in rows:
+        print(f'  {label:<38} {format_gas(first):>16} {format_gas(after_warm_up):>16}')
+    print()
+
+
+@click.command()
+@click.option('--ctez-address', required=True)
+@click.option('--tez-amount', default=1_000_000, type=int, help='Mutez swapped and deposited by the profiled calls.')
+@click.option('--ctez-amount', default=1_000_000, type=int, help='Ctez swapped and deposited by the profiled calls.')
+@click.option('--oven-id', default=None, type=int, help='Own oven to profile mint_or_burn and withdraw_from_oven with.')
+@click.option('--private-key', default=None, help='Use the provided private key.')
+@click.option('--rpc-url', default=None, help='Tezos RPC URL.')
+def gas_profile(
+    ctez_address: str,
+    tez_amount: int,
+    ctez_amount: int,
+    oven_id: Optional[int],
+    private_key: Optional[str],
+    rpc_url: Optional[str],
+) -> None:
+    """Splits the gas of the ctez2 entrypoints into do_housekeeping, the entrypoint
+    body and the internal operations. Every call is only simulated, the account
+    needs the tez and ctez it would spend."""
+    manager = create_manager(private_key, rpc_url)
+    cache = ContractCache.default()
+    ctez2 = cache.load(Ctez2, manager, ctez_address)
+    ctez_token = cache.load_ctez_token(ctez2)
+    names = {ctez2.address: 'ctez2', ctez_token.address: 'fa12'}
+    sender = get_address(manager)
+    deadline = manager.now() + 1000
+    approve = [ctez_token.approve(ctez2, 0), ctez_token.approve(ctez2, ctez_amount)]
+    warm_up = ctez2.create_oven(WARM_UP_OVEN_ID, None, None)
+
+    calls = {
+        'tez_to_ctez': (ctez2.tez_to_ctez(sender, 0, deadline).with_amount(tez_amount), []),
+        'ctez_to_tez': (ctez2.ctez_to_tez(sender, ctez_amount, 0, deadline), approve),
+        'add_tez_liquidity': (ctez2.add_tez_liquidity(sender, 0, deadline).with_amount(tez_amount), []),
+        'add_ctez_liquidity': (ctez2.add_ctez_liquidity(sender, ctez_amount, 0, deadline), approve),
+        'collect_from_tez_liquidity': (ctez2.collect_from_tez_liquidity(sender), []),
+        'collect_from_ctez_liquidity': (ctez2.collect_from_ctez_liquidity(sender), []),
+    }
+    if oven_id is not None:
+        calls['mint_or_burn'] = (ctez2.mint_or_burn(oven_id, 1), [])
+        calls['withdraw_from_oven'] = (ctez2.withdraw_from_oven(oven_id, 1, sender), [])
+
+    for entrypoint, (call, prepare) in calls.items():
+        try:
+            print_profile(profile_call(manager, entrypoint, call, prepare, warm_up, names))
+        except RpcError as e:
+            print(f'{entrypoint}: simulation failed, {e}\n')
@@ -1,4 +1,6 @@
-from typing import Optional
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Optional
 from pytezos import pytezos, PyTezosClient
 
 from scripts.environment import load_or_ask
@@ -11,5 +13,27 @@ def create_manager(
     rpc_url = rpc_url or load_or_ask('RPC_URL')
     return pytezos.using(shell=rpc_url, key=private_key)
 
+def create_client(rpc_url: Optional[str]) -> PyTezosClient:
+    rpc_url = rpc_url or load_or_ask('RPC_URL')
+    return pytezos.using(shell=rpc_url)
+
 def get_balance_mutez(manager: PyTezosClient, address: str) -> int:
     return int(manager.account(address)['balance'])
+
+def get_timestamp(header: dict) -> int:
+    return int(datetime.fromisoformat(header['timestamp'].replace('Z', '+00:00')).timestamp())
+
+async def follow_blocks(
+    client: PyTezosClient,
+    level: int,
+    poll_interval: float,
+    confirmations: int = 0,
+) -> AsyncIterator[dict]:
+    """Yields every block after the given level as soon as it has the given number
+    of blocks on top of it"""
+    while True:
+        head = await asyncio.to_thread(client.shell.head.header)
+        while level < head['level'] - confirmations:
+            level += 1
+            yield await asyncio.to_thread(client.shell.blocks[level])
+        await asyncio.sleep(poll_interval)
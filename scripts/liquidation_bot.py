@@ -0,0 +1,172 @@
+import asyncio
+from collections import deque
+from dataclasses import replace
+from typing import Optional
+import click
+from pytezos import PyTezosClient
+from pytezos.rpc.errors import RpcError
+
+from scripts.helpers import create_manager, follow_blocks, get_timestamp
+from tests.helpers.addressable import get_address
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.model import ctez2 as ctez2_model
+from tests.helpers.model.liquidation import LiquidationIndex, LiquidationPlan, plan_liquidations
+from tests.helpers.model.oven import Handle
+from tests.helpers.model.tezos import Call
+from tests.helpers.utility import iter_big_map_updates
+
+# blocks to wait for a submitted liquidation to land before an oven can be picked again
+PENDING_BLOCKS = 5
+# blocks whose oven updates are kept, so that a reorganization rolls them back
+HISTORY_LEVELS = 10
+
+
+class LiquidationBot:
+    def __init__(self, manager: PyTezosClient, ctez2: Ctez2, max_liquidations: int, dry_run: bool):
+        self.manager = manager
+        self.ctez2 = ctez2
+        self.fa12 = Fa12.from_address(manager, ctez2.get_ctez_fa12_address())
+        self.address = get_address(manager)
+        self.max_liquidations = max_liquidations
+        self.dry_run = dry_run
+        constants = manager.shell.head.context.constants()
+        self.block_delay = int(constants['minimal_block_delay'])
+        self.cost_per_byte = int(constants['cost_per_byte'])
+        self.ovens_big_map_id = ctez2.get_ovens_big_map_id()
+        self.index = LiquidationIndex()
+        self.pending: dict[Handle, int] = {}
+        # hashes of the last blocks applied with the previous records of the ovens they updated
+        self.blocks: deque[tuple[str, list[tuple[Handle, Optional[ctez2_model.OvenInfo]]]]] = deque(maxlen=HISTORY_LEVELS)
+
+    @property
+    def block_hash(self) -> str:
+        return self.blocks[-1][0]
+
+    async def bootstrap(self) -> int:
+        head = await asyncio.to_thread(self.manager.shell.head.header)
+        print(f'Loading ovens at level {head["level"]}...')
+        ovens = await asyncio.to_thread(self.ctez2.get_ovens, head['hash'])
+        self.index = LiquidationIndex({Handle(*handle): ctez2_model.OvenInfo(*oven) for handle, oven in ovens.items()})
+        self.blocks = deque([(head['hash'], [])], maxlen=HISTORY_LEVELS)
+        print(f'{len(ovens)} ovens loaded, {len(self.index)} of them have ctez outstanding')
+        return head['level']
+
+    def apply_block(self, block: dict) -> None:
+        previous_ovens = []
+        for update in iter_big_map_updates(block, self.ovens_big_map_id):
+            handle = Handle(*self.ctez2.decode_oven_handle(update['key']))
+            oven = ctez2_model.OvenInfo(*self.ctez2.decode_oven(update['value'])) if 'value' in update else None
+            previous_ovens.append((handle, self.index.ovens.get(handle)))
+            self.index.update(handle, oven)
+            self.pending.pop(handle, None)
+        self.blocks.append((block['hash'], previous_ovens))
+
+    def rollback(self) -> bool:
+        """Restores the ovens updated by the last block applied, False when the block
+        before it is no longer kept"""
+        if len(self.blocks) < 2:
+            return False
+        _, previous_ovens = self.blocks.pop()
+        for handle, oven in reversed(previous_ovens):
+            self.index.update(handle, oven)
+        return True
+
+    async def switch_branch(self, block: dict) -> bool:
+        """Rolls the index back one level at a time down to the predecessors of the
+        new branch, then applies the branch up to the block. False when the branch
+        forks before the kept blocks"""
+        branch = [block]
+        while branch[-1]['header']['predecessor'] != self.block_hash:
+            if not self.rollback():
+                return False
+            branch.append(await asyncio.to_thread(self.manager.shell.blocks[branch[-1]['header']['predecessor']]))
+        for branch_block in reversed(branch):
+            self.apply_block(branch_block)
+        return True
+
+    async def get_actual_state(self, block: dict) -> tuple[ctez2_model.Storage, int, int]:
+        """Brings the ctez2 storage of the block to the timestamp of the next block
+        with the housekeeping math, and returns it with the ctez and tez balances of
+        the bot at the block"""
+        contract = self.ctez2.contract.using(block_id=block['hash'])
+        fa12 = replace(self.fa12, contract=self.fa12.contract.using(block_id=block['hash']))
+        storage, total_supply, ctez_balance, tez_balance = await asyncio.gather(
+            asyncio.to_thread(lambda: contract.storage()),
+            asyncio.to_thread(fa12.view_total_supply),
+            asyncio.to_thread(fa12.view_balance, self.address),
+            asyncio.to_thread(self.manager.shell.blocks[block['hash']].context.contracts[self.address].balance),
+        )
+        now = get_timestamp(block['header']) + self.block_delay
+        _, s = ctez2_model.get_actual_state(ctez2_model.Storage.from_contract_storage(storage), Call(now=now, ctez_total_supply=total_supply))
+        return s, ctez_balance, int(tez_balance)
+
+    async def submit(self, plan: LiquidationPlan, level: int, deadline: int, tez_balance: int) -> None:
+        """Simulates the operation group of the plan and injects it if the tez balance
+        of the bot covers the tez sold, the fees and the storage burn at most"""
+        calls = []
+        if plan.ctez_to_buy > 0:
+            calls.append(self.ctez2.tez_to_ctez(self.address, plan.ctez_to_buy, deadline).with_amount(plan.tez_to_sell))
+        for l in plan.liquidations:
+            calls.append(self.ctez2.liquidate_oven(l.handle.owner, l.handle.id, l.quantity, self.address))
+        extracted = sum(l.extracted_balance for l in plan.liquidations)
+        print(f'Level {level}: liquidating {len(plan.liquidations)} ovens for {extracted} mutez, buying {plan.ctez_to_buy} ctez for {plan.tez_to_sell} mutez')
+        try:
+            opg = await asyncio.to_thread(lambda: self.manager.bulk(*calls).autofill())
+        except RpcError as e:
+            print(f'Level {level}: skipped, the simulation failed: {e}')
+            return
+        spent = plan.tez_to_sell + sum(int(content['fee']) + int(content['storage_limit']) * self.cost_per_byte for content in opg.contents)
+        if spent > tez_balance:
+            print(f'Level {level}: skipped, {spent} mutez needed with the fees and the burn but the balance is {tez_balance} mutez')
+            return
+        for l in plan.liquidations:
+            self.pending[l.handle] = level + PENDING_BLOCKS
+        if self.dry_run:
+            return
+        result = await asyncio.to_thread(lambda: opg.sign().inject())
+        print(f'Operation has been injected: {result["hash"]}')
+
+    async def on_block(self, block: dict) -> None:
+        level = block['header']['level']
+        self.pending = {handle: expiry for handle, expiry in self.pending.items() if expiry > level}
+        s, ctez_balance, tez_balance = await self.get_actual_state(block)
+        plan = plan_liquidations(self.index, s, ctez_balance, self.max_liquidations, skip=self.pending)
+        if plan.liquidations:
+            await self.submit(plan, level, s.last_update + 10 * self.block_delay, tez_balance)
+
+    async def run(self, poll_interval: float) -> None:
+        level = await self.bootstrap()
+        async for block in follow_blocks(self.manager, level, poll_interval):
+            if block['header']['level'] <= level:
+                continue
+            if block['header']['predecessor'] == self.block_hash:
+                self.apply_block(block)
+            elif await self.switch_branch(block):
+                print(f'Reorganization at level {block["header"]["level"]}, switched branch')
+            else:
+                print(f'Reorganization at level {block["header"]["level"]} before the kept blocks, reloading ovens...')
+                level = await self.bootstrap()
+                continue
+            await self.on_block(block)
+
+@click.command()
+@click.option('--ctez-address', required=True)
+@click.option('--max-liquidations', default=10, type=int, help='Maximum number of ovens liquidated in one operation group.')
+@click.option('--poll-interval', default=1.0, type=float, help='Seconds between two head requests.')
+@click.option('--dry-run', is_flag=True, default=False, help='Print the liquidations without injecting them.')
+@click.option('--private-key', default=None, help='Use the provided private key.')
+@click.option('--rpc-url', default=None, help='Tezos RPC URL.')
+def liquidation_bot(
+    ctez_address: str,
+    max_liquidations: int,
+    poll_interval: float,
+    dry_run: bool,
+    private_key: Optional[str],
+    rpc_url: Optional[str],
+) -> None:
+    """Follows new blocks and liquidates the under-collateralized ovens, buying the
+    ctez to burn on the sell ctez dex in the same operation group"""
+    manager = create_manager(private_key, rpc_url)
+    bot = LiquidationBot(manager, Ctez2.from_address(manager, ctez_address), max_liquidations, dry_run)
+    asyncio.run(bot.run(poll_interval))
@@ -0,0 +1,186 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Iterator, NamedTuple, Optional, Union
+import click
+from pytezos import PyTezosClient
+from pytezos.rpc.errors import RpcError
+
+from scripts.helpers import create_client, follow_blocks
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.utility import iter_events
+
+# blocks fetched by one worker of a backfill before it moves to the next range
+LEVELS_PER_RANGE = 100
+
+
+class LiquidityEvent(NamedTuple):
+    level: int
+    operation_hash: str
+    tag: str
+    event: Union[Ctez2.RemoveLiquidityEvent, Ctez2.CollectFromLiquidityEvent]
+
+
+class EventGapError(Exception):
+    """Raised when the event ids don't follow each other, some events were missed"""
+
+    def __init__(self, expected_id: int, event: LiquidityEvent):
+        super().__init__(f'Expected event {expected_id}, got event {event.event.id} at level {event.level}')
+        self.expected_id = expected_id
+        self.event = event
+
+
+def get_block_events(block: dict, ctez_address: str) -> list[LiquidityEvent]:
+    events = []
+    for operation_hash, result in iter_events(block, ctez_address):
+        event = Ctez2.decode_event(result)
+        if event is not None:
+            events.append(LiquidityEvent(block['header']['level'], operation_hash, result['tag'], event))
+    return events
+
+
+def is_not_originated_error(error: RpcError, address: str) -> bool:
+    """The node answers 404 for the storage of the contract before its origination,
+    which pytezos raises as RpcError('Not found: <path>')"""
+    message = error.args[0] if error.args else None
+    return isinstance(message, str) and message.startswith('Not found') and message.endswith(f'/contracts/{address}/storage')
+
+
+def get_last_event_id(ctez2: Ctez2, level: int) -> int:
+    """last_event_id of the storage at the end of the block, 0 before the origination.
+    Any other error is raised, the level must not be after the head."""
+    try:
+        return ctez2.get_last_event_id(level)
+    except RpcError as e:
+        if is_not_originated_error(e, ctez2.address):
+            return 0
+        raise
+
+
+def find_event_level(ctez2: Ctez2, event_id: int, head_level: int) -> int:
+    """The level of the block that emitted the event, found by bisecting last_event_id"""
+    if get_last_event_id(ctez2, head_level) < event_id:
+        raise ValueError(f'Event {event_id} is not emitted yet at level {head_level}')
+    low, high = 0, head_level
+    while low < high:
+        middle = (low + high) // 2
+        if get_last_event_id(ctez2, middle) < event_id:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def check_continuity(events: Iterable[LiquidityEvent], last_event_id: int) -> Iterator[LiquidityEvent]:
+    """Passes the events through, skipping the ones up to last_event_id, and raises
+    EventGapError as soon as one is missing"""
+    for event in events:
+        if event.event.id <= last_event_id:
+            continue
+        if event.event.id != last_event_id + 1:
+            raise EventGapError(last_event_id + 1, event)
+        last_event_id = event.event.id
+        yield event
+
+
+def backfill(
+    client: PyTezosClient,
+    ctez_address: str,
+    from_level: int,
+    to_level: int,
+    workers: int,
+) -> Iterator[LiquidityEvent]:
+    """Yields the events of the blocks from from_level to to_level inclusive, in order.
+    Ranges of levels are fetched in parallel."""
+
+    def get_range_events(start: int) -> list[LiquidityEvent]:
+        end = min(start + LEVELS_PER_RANGE, to_level + 1)
+        return [event for level in range(start, end) for event in get_block_events(client.shell.blocks[level](), ctez_address)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # map submits every range at once, keep the number of pending ranges bounded
+        window = workers * 4 * LEVELS_PER_RANGE
+        for window_start in range(from_level, to_level + 1, window):
+            window_end = min(window_start + window, to_level + 1)
+            for events in executor.map(get_range_events, range(window_start, window_end, LEVELS_PER_RANGE)):
+                yield from events
+
+
+async def stream_events(
+    client: PyTezosClient,
+    ctez2: Ctez2,
+    from_level: Optional[int] = None,
+    from_event_id: Optional[int] = None,
+    to_level: Optional[int] = None,
+    workers: int = 8,
+    poll_interval: float = 1.0,
+    confirmations: int = 2,
+) -> AsyncIterator[LiquidityEvent]:
+    """Yields the events starting from the given level or event id, the history is
+    backfilled in parallel, then the new blocks are followed once they have the given
+    number of confirmations, up to to_level if any. By default only the events
+    emitted after the current head are yielded."""
+    head_level = (await asyncio.to_thread(client.shell.head.header))['level'] - confirmations
+    if from_event_id is not None:
+        from_level = await asyncio.to_thread(find_event_level, ctez2, from_event_id, head_level)
+        last_event_id = from_event_id - 1
+    else:
+        from_level = head_level + 1 if from_level is None else from_level
+        if from_level > head_level + 1:
+            raise ValueError(f'Level {from_level} is after the next confirmed level {head_level + 1}')
+        last_event_id = await asyncio.to_thread(get_last_event_id, ctez2, from_level - 1)
+
+    backfill_level = head_level if to_level is None else min(head_level, to_level)
+    history = check_continuity(backfill(client, ctez2.address, from_level, backfill_level, workers), last_event_id)
+    while (event := await asyncio.to_thread(next, history, None)) is not None:
+        last_event_id = event.event.id
+        yield event
+    if to_level is not None and to_level <= head_level:
+        return
+
+    async for block in follow_blocks(client, max(head_level, from_level - 1), poll_interval, confirmations):
+        for event in check_continuity(get_block_events(block, ctez2.address), last_event_id):
+            last_event_id = event.event.id
+            yield event
+        if block['header']['level'] == to_level:
+            return
+
+
+def to_json(event: LiquidityEvent) -> str:
+    return json.dumps({
+        'level': event.level,
+        'operation_hash': event.operation_hash,
+        'tag': event.tag,
+        **event.event._asdict(),
+    })
+
+
+@click.command()
+@click.option('--ctez-address', required=True)
+@click.option('--from-level', default=None, type=int, help='First level to read the events from.')
+@click.option('--from-event-id', default=None, type=int, help='First event to read, overrides --from-level.')
+@click.option('--to-level', default=None, type=int, help='Stop after this level instead of following new blocks.')
+@click.option('--workers', default=8, type=int, help='Parallel requests of the backfill.')
+@click.option('--confirmations', default=2, type=int, help='Blocks on top of a block before reading its events.')
+@click.option('--poll-interval', default=1.0, type=float, help='Seconds between two head requests.')
+@click.option('--rpc-url', default=None, help='Tezos RPC URL.')
+def liquidity_events(
+    ctez_address: str,
+    from_level: Optional[int],
+    from_event_id: Optional[int],
+    to_level: Optional[int],
+    workers: int,
+    confirmations: int,
+    poll_interval: float,
+    rpc_url: Optional[str],
+) -> None:
+    """Prints the remove_liquidity and collect_from_liquidity events of the ctez
+    contract as JSON lines"""
+    client = create_client(rpc_url)
+    ctez2 = Ctez2.from_address(client, ctez_address)
+
+    async def run() -> None:
+        async for event in stream_events(client, ctez2, from_level, from_event_id, to_level, workers, poll_interval, confirmations):
+            print(to_json(event), flush=True)
+
+    asyncio.run(run())
@@ -0,0 +1,59 @@
+from typing import Optional
+import click
+
+from tests.helpers.model.monte_carlo import FlowParameters, Market, run_monte_carlo, summarize
+
+
+@click.command()
+@click.option('--runs', default=1_000, type=int, help='Number of seeded runs.')
+@click.option('--seed', default=0, type=int, help='Seed of the first run, the runs use consecutive seeds.')
+@click.option('--days', default=30, type=int, help='Duration of a run.')
+@click.option('--sell-ctez-liquidity', default=10**12, type=int, help='Initial ctez liquidity of the sell ctez dex.')
+@click.option('--sell-tez-liquidity', default=10**12, type=int, help='Initial tez liquidity of the sell tez dex.')
+@click.option('--actor-ctez', default=10**11, type=int, help='Ctez minted by each actor at the start.')
+@click.option('--actors', default=10, type=int)
+@click.option('--mean-interval', default=60.0, type=float, help='Mean number of seconds between two actions.')
+@click.option('--size', default=10**9, type=int, help='Median size of an action.')
+@click.option('--size-sigma', default=1.0, type=float, help='Log-normal spread of the action sizes.')
+@click.option('--sell-tez-weight', default=0.4, type=float)
+@click.option('--sell-ctez-weight', default=0.4, type=float)
+@click.option('--liquidity-weight', default=0.1, type=float)
+@click.option('--mint-or-burn-weight', default=0.1, type=float)
+@click.option('--workers', default=None, type=int, help='Number of processes, all cores by default.')
+def monte_carlo(
+    runs: int,
+    seed: int,
+    days: int,
+    sell_ctez_liquidity: int,
+    sell_tez_liquidity: int,
+    actor_ctez: int,
+    actors: int,
+    mean_interval: float,
+    size: int,
+    size_sigma: float,
+    sell_tez_weight: float,
+    sell_ctez_weight: float,
+    liquidity_weight: float,
+    mint_or_burn_weight: float,
+    workers: Optional[int],
+) -> None:
+    """Runs random order flows against the Python model of the contracts and prints
+    the distributions of the drift, the target growth and the outcome of the
+    liquidity seeded in both dexes"""
+    market = Market(sell_ctez_liquidity, sell_tez_liquidity, actor_ctez)
+    p = FlowParameters(
+        duration=days * 24 * 60 * 60,
+        actors=actors,
+        mean_interval=mean_interval,
+        size=size,
+        size_sigma=size_sigma,
+        sell_tez_weight=sell_tez_weight,
+        sell_ctez_weight=sell_ctez_weight,
+        liquidity_weight=liquidity_weight,
+        mint_or_burn_weight=mint_or_burn_weight,
+    )
+    results = run_monte_carlo(market, p, range(seed, seed + runs), workers)
+
+    print(f'{"":>22} {"mean":>14} {"stdev":>14} {"p5":>14} {"p50":>14} {"p95":>14}')
+    for name, d in summarize(results).items():
+        print(f'{name:>22} {d.mean:>14.6g} {d.stdev:>14.6g} {d.p5:>14.6g} {d.p50:>14.6g} {d.p95:>14.6g}')
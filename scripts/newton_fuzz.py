@@ -0,0 +1,154 @@
+import heapq
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from random import Random
+from typing import Optional
+import click
+
+from tests.helpers.model.half_dex import Curve
+from tests.helpers.model.quote import paid
+from tests.helpers.model.stdctez import clamp_nat
+
+
+def guess(x: int, q: int, Q: int) -> int:
+    # the three newton steps of Curve.swap_using_incentivized_liquidity, before the safety margin
+    y = x
+    for _ in range(3):
+        y = clamp_nat(Curve.newton_step(x, y, q, Q))
+    return y
+
+def sample_range(rng: Random, n: int) -> int:
+    # sample between 0 and n inclusive
+    # with probability 0.025 first 10, with probability 0.025 last 10
+    # with probability 0.025 first 5%, with probability 0.025 last 5%
+    # otherwise uniform
+    u = rng.random()
+    if u < 0.025:
+        k = rng.randint(0, 10)
+    elif u < 0.05:
+        k = rng.randint(n-10, n)
+    elif u < 0.95:
+        k = rng.randint(0, n)
+    elif u < 0.975:
+        k = rng.randint(0, n//20)
+    else:
+        k = rng.randint(19*n//20, n)
+    return max(min(k, n), 0)
+
+def severity(sample: dict) -> tuple[int, int]:
+    # the largest newton errors first, then the largest amounts
+    return abs(sample['dq'] - sample['y']), sample['dq']
+
+def run_shard(seed: int, shard: int, samples: int, max_exponent: int, worst_count: int) -> dict:
+    # we decide to pay some amount x, we receive swap_using_incentivized_liquidity(x, q, Q),
+    # we need to ensure that paid(y), what we would have needed to pay to get it,
+    # is actually less than x but still close to x
+    rng = Random(f'{seed}:{shard}')
+    histogram = Counter()
+    worst = []
+    failures = []
+    for _ in range(samples):
+        Q = 10**rng.randint(0, max_exponent)
+        q = sample_range(rng, Q)
+        dq = sample_range(rng, q)
+
+        x = paid(dq, q, Q)
+        y = guess(x, q, Q)
+        y_ = Curve.swap_using_incentivized_liquidity(x, q, Q)
+        error = dq - y
+        histogram[error] += 1
+        sample = {'Q': Q, 'q': q, 'dq': dq, 'x': x, 'y': y, 'y_': y_}
+        if not y_ <= dq <= y + 1:
+            failures.append(sample)
+        if len(worst) < worst_count:
+            heapq.heappush(worst, (severity(sample), len(worst), sample))
+        elif severity(sample) > worst[0][0]:
+            heapq.heapreplace(worst, (severity(sample), worst[0][1], sample))
+    return {
+        'samples': samples,
+        'histogram': {str(k): v for k, v in histogram.items()},
+        'worst': [s for _, _, s in sorted(worst, key=lambda w: w[0], reverse=True)],
+        'failures': failures[:worst_count],
+        'failures_count': len(failures),
+    }
+
+def shard_sizes(samples: int, shards: int) -> list[int]:
+    return [samples // shards + (1 if i < samples % shards else 0) for i in range(shards)]
+
+def load_checkpoint(path: str, config: dict) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint['config'] != config:
+        raise click.ClickException(f'{path} was written with {checkpoint["config"]}, remove it to start over')
+    return checkpoint['shards']
+
+def save_checkpoint(path: str, config: dict, done: dict) -> None:
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'config': config, 'shards': done}, f)
+    os.replace(tmp_path, path)
+
+def merge_results(results: list[dict], worst_count: int) -> dict:
+    histogram = Counter()
+    for r in results:
+        histogram.update({int(k): v for k, v in r['histogram'].items()})
+    worst = heapq.nlargest(worst_count, (s for r in results for s in r['worst']), key=severity)
+    return {
+        'samples': sum(r['samples'] for r in results),
+        'histogram': dict(sorted(histogram.items())),
+        'worst': worst,
+        'failures': [s for r in results for s in r['failures']][:worst_count],
+        'failures_count': sum(r['failures_count'] for r in results),
+    }
+
+@click.command()
+@click.option('--samples', default=1_000_000, type=int, help='Total number of samples.')
+@click.option('--shards', default=1_000, type=int, help='Number of independently seeded shards, a shard is the checkpoint unit.')
+@click.option('--seed', default=0, type=int)
+@click.option('--max-exponent', default=5, type=int, help='Q is sampled as 10**k for k in [0, max-exponent].')
+@click.option('--workers', default=None, type=int, help='Number of processes, all cores by default.')
+@click.option('--checkpoint', default='newton_fuzz.json', help='File keeping the results of the completed shards.')
+@click.option('--worst', 'worst_count', default=10, type=int, help='Number of worst samples to report.')
+def newton_fuzz(
+    samples: int,
+    shards: int,
+    seed: int,
+    max_exponent: int,
+    workers: Optional[int],
+    checkpoint: str,
+    worst_count: int,
+) -> None:
+    """Checks the error of the Newton steps of the swap curve against the closed
+    form of the paid amount, and that the safety margin y - y // 10**9 - 1 keeps
+    every swap on the side of the dex"""
+    config = {'samples': samples, 'shards': shards, 'seed': seed, 'max_exponent': max_exponent, 'worst': worst_count}
+    done = load_checkpoint(checkpoint, config)
+    pending = [(i, n) for i, n in enumerate(shard_sizes(samples, shards)) if str(i) not in done]
+    print(f'{len(done)} of {shards} shards are already done, running {len(pending)}...')
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_shard, seed, i, n, max_exponent, worst_count): i for i, n in pending}
+        for future in as_completed(futures):
+            done[str(futures[future])] = future.result()
+            save_checkpoint(checkpoint, config, done)
+            print(f'{len(done)}/{shards} shards', end='\r')
+    print()
+
+    result = merge_results(list(done.values()), worst_count)
+    print(f'Samples: {result["samples"]}')
+    print('Histogram of dq - y:')
+    for error, count in result['histogram'].items():
+        print(f'{error:>6}: {count}')
+    print('Worst samples:')
+    for sample in result['worst']:
+        print(f'    {sample}')
+    if result['failures_count'] > 0:
+        print(f'{result["failures_count"]} samples break y - y // 10**9 - 1 <= dq <= y + 1:')
+        for sample in result['failures']:
+            print(f'    {sample}')
+        raise SystemExit(1)
+    print('The safety margin holds on every sample')
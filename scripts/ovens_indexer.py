@@ -0,0 +1,243 @@
+import asyncio
+import sqlite3
+from typing import Iterator, Optional
+import click
+from pytezos import PyTezosClient
+
+from scripts.helpers import create_client, follow_blocks
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.utility import iter_big_map_updates
+
+Handle = tuple[int, str]
+
+
+# levels whose updates are kept to roll a reorganization back
+HISTORY_LEVELS = 10
+
+
+class OvensStore:
+    """SQLite copy of the ovens big_map of a ctez2 contract together with the
+    block it was taken at. fee_index doesn't fit in an sqlite integer, so it is
+    kept as text. The previous values of the ovens updated in the last
+    HISTORY_LEVELS blocks are kept, so that these blocks can be rolled back."""
+
+    def __init__(self, path: str):
+        # OvensIndexer.run calls the store from worker threads, one call at a time
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS ovens (
+                id INTEGER NOT NULL,
+                owner TEXT NOT NULL,
+                tez_balance INTEGER NOT NULL,
+                ctez_outstanding INTEGER NOT NULL,
+                address TEXT NOT NULL,
+                fee_index TEXT NOT NULL,
+                PRIMARY KEY (id, owner)
+            );
+            CREATE TABLE IF NOT EXISTS state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blocks (
+                level INTEGER PRIMARY KEY,
+                hash TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS history (
+                level INTEGER NOT NULL,
+                id INTEGER NOT NULL,
+                owner TEXT NOT NULL,
+                tez_balance INTEGER,
+                ctez_outstanding INTEGER,
+                address TEXT,
+                fee_index TEXT
+            );
+        ''')
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self.db.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _set_block(self, level: int, block_hash: str) -> None:
+        self.db.executemany(
+            'INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)',
+            [('level', str(level)), ('block_hash', block_hash)],
+        )
+
+    def get_block(self) -> Optional[tuple[int, str]]:
+        """Level and hash of the last block applied, None if the store is empty"""
+        level = self._get_state('level')
+        return (int(level), self._get_state('block_hash')) if level is not None else None
+
+    def get_ctez_address(self) -> Optional[str]:
+        return self._get_state('ctez_address')
+
+    def _put(self, handle: Handle, oven: Ctez2.OvenInfo) -> None:
+        self.db.execute(
+            'INSERT OR REPLACE INTO ovens VALUES (?, ?, ?, ?, ?, ?)',
+            (handle[0], handle[1], oven.tez_balance, oven.ctez_outstanding, oven.address, str(oven.fee_index)),
+        )
+
+    def _delete(self, handle: Handle) -> None:
+        self.db.execute('DELETE FROM ovens WHERE id = ? AND owner = ?', handle)
+
+    def reset(self, ctez_address: str, ovens: dict[Handle, Ctez2.OvenInfo], level: int, block_hash: str) -> None:
+        with self.db:
+            self.db.execute('DELETE FROM ovens')
+            self.db.execute('DELETE FROM blocks')
+            self.db.execute('DELETE FROM history')
+            for handle, oven in ovens.items():
+                self._put(handle, oven)
+            self.db.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('ctez_address', ?)", (ctez_address,))
+            self.db.execute('INSERT INTO blocks VALUES (?, ?)', (level, block_hash))
+            self._set_block(level, block_hash)
+
+    def apply(self, updates: list[tuple[Handle, Optional[Ctez2.OvenInfo]]], level: int, block_hash: str) -> None:
+        """Applies the updates of a block in one transaction, None removes the oven"""
+        with self.db:
+            for handle, oven in updates:
+                previous = self.get_oven(handle[1], handle[0])
+                self.db.execute('INSERT INTO history VALUES (?, ?, ?, ?, ?, ?, ?)', (
+                    level, handle[0], handle[1],
+                    *((previous.tez_balance, previous.ctez_outstanding, previous.address, str(previous.fee_index)) if previous else (None,) * 4),
+                ))
+                if oven is None:
+                    self._delete(handle)
+                else:
+                    self._put(handle, oven)
+            self.db.execute('INSERT OR REPLACE INTO blocks VALUES (?, ?)', (level, block_hash))
+            self.db.execute('DELETE FROM blocks WHERE level <= ?', (level - HISTORY_LEVELS,))
+            self.db.execute('DELETE FROM history WHERE level <= ?', (level - HISTORY_LEVELS,))
+            self._set_block(level, block_hash)
+
+    def rollback(self) -> bool:
+        """Restores the ovens as they were before the last block applied, False when
+        the block before it is out of the kept history"""
+        level, _ = self.get_block()
+        previous_block = self.db.execute('SELECT hash FROM blocks WHERE level = ?', (level - 1,)).fetchone()
+        if previous_block is None:
+            return False
+        with self.db:
+            rows = self.db.execute(
+                'SELECT id, owner, tez_balance, ctez_outstanding, address, fee_index FROM history WHERE level = ? ORDER BY rowid DESC',
+                (level,),
+            ).fetchall()
+            for row in rows:
+                if row[2] is None:
+                    self._delete((row[0], row[1]))
+                else:
+                    self._put((row[0], row[1]), self._to_oven(row[2:]))
+            self.db.execute('DELETE FROM history WHERE level = ?', (level,))
+            self.db.execute('DELETE FROM blocks WHERE level = ?', (level,))
+            self._set_block(level - 1, previous_block[0])
+        return True
+
+    @staticmethod
+    def _to_oven(row: tuple) -> Ctez2.OvenInfo:
+        tez_balance, ctez_outstanding, address, fee_index = row
+        return Ctez2.OvenInfo(tez_balance, ctez_outstanding, address, int(fee_index))
+
+    def get_oven(self, owner: str, oven_id: int) -> Optional[Ctez2.OvenInfo]:
+        row = self.db.execute(
+            'SELECT tez_balance, ctez_outstanding, address, fee_index FROM ovens WHERE id = ? AND owner = ?',
+            (oven_id, owner),
+        ).fetchone()
+        return self._to_oven(row) if row is not None else None
+
+    def iter_ovens(self, owner: Optional[str] = None) -> Iterator[tuple[Handle, Ctez2.OvenInfo]]:
+        query = 'SELECT id, owner, tez_balance, ctez_outstanding, address, fee_index FROM ovens'
+        rows = self.db.execute(query + ' WHERE owner = ?', (owner,)) if owner is not None else self.db.execute(query)
+        for row in rows:
+            yield (row[0], row[1]), self._to_oven(row[2:])
+
+    def count(self) -> int:
+        return self.db.execute('SELECT COUNT(*) FROM ovens').fetchone()[0]
+
+
+class OvensIndexer:
+    def __init__(self, client: PyTezosClient, ctez2: Ctez2, store: OvensStore):
+        self.client = client
+        self.ctez2 = ctez2
+        self.store = store
+        self.ovens_big_map_id = ctez2.get_ovens_big_map_id()
+
+    def bootstrap(self) -> int:
+        head = self.client.shell.head.header()
+        print(f'Loading ovens at level {head["level"]}...')
+        ovens = self.ctez2.get_ovens(head['hash'])
+        self.store.reset(self.ctez2.address, ovens, head['level'], head['hash'])
+        print(f'{len(ovens)} ovens loaded')
+        return head['level']
+
+    def get_block_updates(self, block: dict) -> list[tuple[Handle, Optional[Ctez2.OvenInfo]]]:
+        return [
+            (self.ctez2.decode_oven_handle(update['key']), self.ctez2.decode_oven(update['value']) if 'value' in update else None)
+            for update in iter_big_map_updates(block, self.ovens_big_map_id)
+        ]
+
+    def apply_block(self, block: dict) -> None:
+        updates = self.get_block_updates(block)
+        self.store.apply(updates, block['header']['level'], block['hash'])
+        if updates:
+            print(f'Level {block["header"]["level"]}: {len(updates)} oven updates')
+
+    def switch_branch(self, block: dict) -> bool:
+        """Rolls the store back one level at a time down to the predecessors of the
+        new branch, then applies the branch up to the block. False when the branch
+        forks before the kept history"""
+        branch = [block]
+        while branch[-1]['header']['predecessor'] != self.store.get_block()[1]:
+            if not self.store.rollback():
+                return False
+            branch.append(self.client.shell.blocks[branch[-1]['header']['predecessor']]())
+        for branch_block in reversed(branch):
+            self.apply_block(branch_block)
+        return True
+
+    def start(self) -> int:
+        """Resumes from the last block in the store, or loads the whole big_map if
+        the store is empty or was taken for another contract. Returns the level the
+        store is at"""
+        last_block = self.store.get_block()
+        if last_block is None or self.store.get_ctez_address() != self.ctez2.address:
+            return self.bootstrap()
+        print(f'Resuming from level {last_block[0]} with {self.store.count()} ovens')
+        return last_block[0]
+
+    def process_block(self, block: dict) -> int:
+        """Applies the block on top of the store, switching to its branch on a
+        reorganization and reloading the whole big_map when the branch forks before
+        the kept history. Returns the level the store is at"""
+        if block['header']['predecessor'] == self.store.get_block()[1]:
+            self.apply_block(block)
+        elif self.switch_branch(block):
+            print(f'Reorganization at level {block["header"]["level"]}, switched branch')
+        else:
+            print(f'Reorganization at level {block["header"]["level"]} before the kept history, reloading ovens...')
+            return self.bootstrap()
+        return block['header']['level']
+
+    async def run(self, poll_interval: float, confirmations: int) -> None:
+        level = await asyncio.to_thread(self.start)
+        async for block in follow_blocks(self.client, level, poll_interval, confirmations):
+            if block['header']['level'] <= level:
+                continue
+            level = await asyncio.to_thread(self.process_block, block)
+
+
+@click.command()
+@click.option('--ctez-address', required=True)
+@click.option('--db', default='ovens.sqlite', help='SQLite file of the index.')
+@click.option('--poll-interval', default=1.0, type=float, help='Seconds between two head requests.')
+@click.option('--confirmations', default=2, type=int, help='Blocks on top of a block before it is indexed, a Tenderbake block is final with 2.')
+@click.option('--rpc-url', default=None, help='Tezos RPC URL.')
+def ovens_indexer(
+    ctez_address: str,
+    db: str,
+    poll_interval: float,
+    confirmations: int,
+    rpc_url: Optional[str],
+) -> None:
+    """Keeps a local SQLite copy of the ovens big_map up to date with the chain"""
+    client = create_client(rpc_url)
+    indexer = OvensIndexer(client, Ctez2.from_address(client, ctez_address), OvensStore(db))
+    asyncio.run(indexer.run(poll_interval, confirmations))
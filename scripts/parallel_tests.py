@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+import tempfile
+import xml.etree.ElementTree as ElementTree
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from os.path import join
+from queue import Queue
+from typing import NamedTuple
+import click
+
+from scripts.gas_baseline import RECORDED_FILE
+
+
+class ClassResult(NamedTuple):
+    test_class: str
+    returncode: int
+    tests: int
+    failures: int
+    errors: int
+    skipped: int
+    time: float
+    output: str
+
+
+def collect_test_classes(pytest_args: tuple[str, ...]) -> dict[str, int]:
+    """Test classes (as `path::Class` node ids) with their number of tests"""
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '--collect-only', '-q', *pytest_args],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise click.ClickException(f'Collection failed:\n{result.stdout}{result.stderr}')
+    classes: dict[str, int] = defaultdict(int)
+    for line in result.stdout.splitlines():
+        parts = line.split('::')
+        if len(parts) >= 3:
+            classes['::'.join(parts[:2])] += 1
+    return classes
+
+
+def run_test_class(test_class: str, port: int, report: str) -> ClassResult:
+    env = {**os.environ, 'SANDBOX_NODE_PORT': str(port)}
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '-q', f'--junitxml={report}', test_class],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    tests = failures = errors = skipped = 0
+    time = 0.0
+    if os.path.exists(report):
+        for suite in ElementTree.parse(report).getroot().iter('testsuite'):
+            tests += int(suite.get('tests', 0))
+            failures += int(suite.get('failures', 0))
+            errors += int(suite.get('errors', 0))
+            skipped += int(suite.get('skipped', 0))
+            time += float(suite.get('time', 0))
+    return ClassResult(test_class, result.returncode, tests, failures, errors, skipped, time, result.stdout + result.stderr)
+
+
+def merge_reports(reports: list[str], filename: str) -> None:
+    merged = ElementTree.Element('testsuites')
+    for report in reports:
+        if os.path.exists(report):
+            merged.extend(ElementTree.parse(report).getroot().iter('testsuite'))
+    ElementTree.ElementTree(merged).write(filename, encoding='utf-8', xml_declaration=True)
+
+
+@click.command(context_settings={'ignore_unknown_options': True})
+@click.option('--workers', default=os.cpu_count(), type=int, help='Number of test classes run at once, each with its own sandboxed node.')
+@click.option('--base-port', default=18732, type=int, help='RPC port of the node of the first worker, the next workers take the next ports.')
+@click.option('--junitxml', default=None, help='Write the merged JUnit report of all the classes to this file.')
+@click.argument('pytest_args', nargs=-1, type=click.UNPROCESSED)
+def parallel_tests(
+    workers: int,
+    base_port: int,
+    junitxml: str,
+    pytest_args: tuple[str, ...],
+) -> None:
+    """Runs the test classes in parallel pytest processes, each process owns the
+    sandboxed node on its own port. PYTEST_ARGS select the tests like for pytest."""
+    classes = collect_test_classes(pytest_args or ('tests',))
+    # the processes merge their records into the file, start from an empty one not to keep stale keys
+    if os.path.exists(RECORDED_FILE):
+        os.remove(RECORDED_FILE)
+    # the largest classes first, so that they don't end up last on a single worker
+    pending = sorted(classes, key=lambda c: -classes[c])
+    ports: Queue[int] = Queue()
+    for i in range(workers):
+        ports.put(base_port + i)
+    print(f'Running {sum(classes.values())} tests of {len(classes)} classes on {workers} workers')
+
+    def run(test_class: str, report: str) -> ClassResult:
+        port = ports.get()
+        try:
+            return run_test_class(test_class, port, report)
+        finally:
+            ports.put(port)
+
+    with tempfile.TemporaryDirectory() as reports_dir:
+        reports = {test_class: join(reports_dir, f'{i}.xml') for i, test_class in enumerate(pending)}
+        results = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run, test_class, reports[test_class]) for test_class in pending]
+            for future in as_completed(futures):
+                r = future.result()
+                results.append(r)
+                status = 'ok' if r.returncode == 0 else 'FAILED'
+                print(f'[{len(results)}/{len(pending)}] {r.test_class}: {r.tests} tests in {r.time:.1f}s {status}')
+        if junitxml is not None:
+            merge_reports([reports[test_class] for test_class in pending], junitxml)
+
+    failed = [r for r in results if r.returncode != 0]
+    for r in failed:
+        print(f'\n===== {r.test_class} =====\n{r.output}')
+    total = lambda field: sum(getattr(r, field) for r in results)
+    print(f'\n{total("tests")} tests, {total("failures")} failures, {total("errors")} errors, {total("skipped")} skipped')
+    if failed:
+        raise SystemExit(1)
@@ -1,27 +1,120 @@
+import atexit
+import os
 from pytezos.client import PyTezosClient
-from pytezos.sandbox.node import SandboxedNodeTestCase
-from typing import Optional
+from pytezos.sandbox import node as sandbox_node
+from pytezos.sandbox.node import SandboxedNodeContainer, SandboxedNodeTestCase
+from pytezos.sandbox.parameters import sandbox_addresses
+from testcontainers.core.docker_client import DockerClient
+from typing import Callable, NamedTuple, Optional, Sequence, Union
 from pytezos.rpc import RpcError
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from tests.helpers.addressable import Addressable, get_address
 from tests.helpers.contracts.contract import ContractHelper
 from tests.helpers.contracts.ctez2.ctez2 import Ctez2
 from tests.helpers.contracts.fa12.fa12 import Fa12
+from pytezos.contract.call import ContractCall
 from pytezos.contract.result import ContractCallResult
 from pytezos.operation.group import OperationGroup
 from pytezos.operation.result import OperationResult
+from pytezos.michelson.forge import optimize_timestamp
 from pytezos import Key
 
 from tests.helpers.contracts.fa12.fa12_tester import Fa12Tester
-from tests.helpers.utility import pkh
+from tests.helpers.utility import get_consumed_mutez, pkh, plan_rounds
+
+# set by scripts/parallel_tests.py, every worker process owns the node on its port
+SANDBOX_NODE_PORT = os.environ.get('SANDBOX_NODE_PORT')
+if SANDBOX_NODE_PORT is not None:
+    # pytezos stops every sandboxed node at exit, the ones of the other workers too
+    atexit.unregister(sandbox_node.kill_existing_containers)
+
+
+class NodeSnapshot(NamedTuple):
+    image_id: str
+    bakers: int
+    account_keys: list[str]
+    # contracts originated before the snapshot
+    addresses: tuple[str, ...] = ()
+
 
 class BaseTestCase(SandboxedNodeTestCase):
     accounts: list = []
+    # committed images of the sandboxed node, shared by all the test classes of a run
+    snapshots: dict[str, NodeSnapshot] = {}
+    # set to False to set the accounts up on a fresh node every time instead
+    USE_NODE_SNAPSHOTS = True
+    PORT = int(SANDBOX_NODE_PORT) if SANDBOX_NODE_PORT is not None else sandbox_node.TEZOS_NODE_PORT
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        if SANDBOX_NODE_PORT is None:
+            super().setUpClass()
+            return
+        # SandboxedNodeTestCase.setUpClass, without stopping the nodes of the other workers
+        cls.node_container = SandboxedNodeContainer(image=cls.IMAGE, port=cls.PORT)
+        cls.node_container.start()
+        if not cls.node_container.wait_for_connection():
+            raise RuntimeError(f'Failed to connect to {cls.node_container.url}')
+        cls.node_container.activate(cls.PROTOCOL)
     
     def setUp(self) -> None:
         self.accounts = []
         self.manager = self.bootstrap_baker()
 
+    @classmethod
+    def restart_node(cls, image: Optional[str] = None) -> None:
+        """Replaces the sandboxed node with a freshly activated one, or with one
+        started from a snapshot image"""
+        cls._get_node_container().stop(force=True, delete_volume=True)
+        if image is None:
+            cls.setUpClass()
+            return
+        cls.node_container = SandboxedNodeContainer(image=image, port=cls.PORT)
+        cls.node_container.start()
+        if not cls.node_container.wait_for_connection():
+            raise RuntimeError(f'Failed to connect to the node started from {image}')
+
+    def take_snapshot(self, name: str, accounts: list[PyTezosClient], addresses: Sequence[str] = ()) -> None:
+        """Stops the node and commits it to an image, then goes on with a node started
+        from that image"""
+        container = self._get_node_container().get_wrapped_container()
+        # a stopped node leaves a consistent store behind
+        container.stop()
+        image = container.commit()
+        account_keys = [account.key.secret_key() for account in accounts]
+        BaseTestCase.snapshots[name] = NodeSnapshot(image.id, len(self.accounts), account_keys, tuple(addresses))
+        self.restart_node(image.id)
+
+    def restore_snapshot(self, name: str) -> NodeSnapshot:
+        snapshot = BaseTestCase.snapshots[name]
+        self.restart_node(snapshot.image_id)
+        self.accounts = [self.client.using(key=f'bootstrap{i + 1}') for i in range(snapshot.bakers)]
+        self.manager = self.accounts[0]
+        return snapshot
+
+    def get_snapshot_accounts(self, snapshot: NodeSnapshot) -> list[PyTezosClient]:
+        return [self.client.using(key=Key.from_encoded_key(key)) for key in snapshot.account_keys]
+
+    def bootstrap_accounts_from_snapshot(
+        self,
+        name: str,
+        setup: Callable[[], list[PyTezosClient]],
+    ) -> list[PyTezosClient]:
+        """Runs setup on a fresh node and returns the accounts it bootstrapped.
+
+        The first time a name is used the node is snapshotted after setup, the next
+        tests restore the snapshot instead of restarting the node and running setup
+        again."""
+        if not self.USE_NODE_SNAPSHOTS:
+            self.restart_node()
+            return setup()
+        if name in BaseTestCase.snapshots:
+            return self.get_snapshot_accounts(self.restore_snapshot(name))
+        self.restart_node()
+        accounts = setup()
+        self.take_snapshot(name, accounts)
+        return accounts
+
     def get_current_level(self) -> int:
         return self.client.shell.head.header()['level']
 
@@ -43,6 +136,27 @@ class BaseTestCase(SandboxedNodeTestCase):
         
         return account
 
+    def bootstrap_accounts(self, count: int, balance: Optional[int] = None) -> list[PyTezosClient]:
+        """Same as calling bootstrap_account `count` times, in two blocks whatever the count.
+
+        With a balance, one baker funds all the accounts in a single operation group,
+        otherwise each account takes the balance of its own baker."""
+        accounts: list[PyTezosClient] = [self.client.using(key=Key.generate(export=False)) for _ in range(count)]
+        if balance is not None:
+            bootstrap = self.bootstrap_baker()
+            bootstrap.bulk(*[bootstrap.transaction(pkh(account), balance) for account in accounts]).autofill().sign().inject()
+        else:
+            for account in accounts:
+                bootstrap = self.bootstrap_baker()
+                initial_balance = self.get_balance_mutez(bootstrap) - 100_000_000_000
+                bootstrap.transaction(pkh(account), initial_balance).autofill().sign().inject()
+        self.bake_block()
+        for account in accounts:
+            account.reveal().autofill().sign().inject()
+        self.bake_block()
+
+        return accounts
+
     def deploy_ctez2(
         self,
         last_update: Optional[int] = None,
@@ -85,6 +199,25 @@ class BaseTestCase(SandboxedNodeTestCase):
     def extract_runtime_failwith(self, e: RpcError):
         return e.args[-1]['with']['string']
 
+    def send(self, call: Union[ContractCall, OperationGroup]) -> OperationGroup:
+        """Injects the call, the bodies shared with LocalTestCase send through here"""
+        return call.send()
+
+    def get_consumed_mutez(self, client: PyTezosClient, opg: OperationGroup) -> int:
+        return get_consumed_mutez(client, opg)
+
+    def dry_run(self, call: Union[ContractCall, OperationGroup]) -> list[ContractCallResult]:
+        """Simulates the call on top of the head without injecting it.
+
+        A failure raises the same RpcError as send(), so the tests that only check
+        the failure use it in raises_michelson_error, and a call that unexpectedly
+        succeeds leaves nothing in the mempool for the next block."""
+        opg = call.as_transaction() if isinstance(call, ContractCall) else call
+        result = opg.fill().run()
+        if not OperationResult.is_applied(result):
+            raise RpcError.from_errors(OperationResult.errors(result))
+        return ContractCallResult.from_run_operation(result, context=opg.context)
+
     def bake_block_and_get_operation_result(self, opg: OperationGroup) -> ContractCallResult:
         self.bake_block()
         opg = self.client.shell.blocks['head':].find_operation(opg.hash())
@@ -94,6 +227,39 @@ class BaseTestCase(SandboxedNodeTestCase):
         for _ in range(count):
             self.bake_block()
 
+    def get_head_round(self) -> int:
+        # the round is the last component of the fitness
+        return int(self.client.shell.head.header()['fitness'][-1], 16)
+
+    def bake_block_at_round(self, round: int, min_fee: int = 0) -> None:
+        """Bakes the next block at the given round, its timestamp is the start of the round"""
+        rights = self.client.shell.node.get(
+            '/chains/main/blocks/head/helpers/baking_rights',
+            params={'max_round': round, 'all': 'true'},
+        )
+        right = next(right for right in rights if right['round'] == round)
+        key = next(k for k, v in sandbox_addresses.items() if v == right['delegate'])
+        block = self.client.using(key=key).bake_block(min_fee)
+        block.protocol_data['payload_round'] = round
+        block.fill(optimize_timestamp(right['estimated_time'])).work().sign().inject()
+
+    def advance_time(self, seconds: int) -> None:
+        """Moves the head timestamp `seconds` later, like bake_blocks(seconds) but in a
+        handful of blocks: the late rounds of a level start long after its first round.
+        The last block is baked at round 0, so the next one comes 1 second later as usual.
+
+        The node refuses blocks from the future, the sandbox chain only starts far
+        enough in the past to skip some years."""
+        constants = self.client.shell.head.context.constants()
+        rounds = plan_rounds(
+            seconds,
+            self.get_head_round(),
+            int(constants['minimal_block_delay']),
+            int(constants['delay_increment_per_round']),
+        )
+        for round in rounds:
+            self.bake_block_at_round(round)
+
     def find_call_result(self, opg: OperationGroup, idx: int = 0) -> OperationResult:
         blocks = self.manager.shell.blocks['head':]
         operation = blocks.find_operation(opg.hash())
@@ -111,3 +277,13 @@ class BaseTestCase(SandboxedNodeTestCase):
     
     def get_contract_delegate(self, contract: Addressable) -> str | None:
         return self.client.shell.contracts[get_address(contract)]().get('delegate', None)
+
+
+@atexit.register
+def remove_node_snapshots() -> None:
+    if not BaseTestCase.snapshots:
+        return
+    docker = DockerClient()
+    for snapshot in BaseTestCase.snapshots.values():
+        with suppress(Exception):
+            docker.client.images.remove(snapshot.image_id, force=True)
@@ -1,6 +1,6 @@
-from math import ceil
 from typing import Callable, NamedTuple, Optional
 from tests.base import BaseTestCase
+from tests.ctez2.mixins import Ctez2SetupMixin
 from tests.helpers.addressable import Addressable, get_address
 from tests.helpers.contracts.ctez2.ctez2 import Ctez2
 from tests.helpers.contracts.fa12.fa12 import Fa12
@@ -12,7 +12,7 @@ class BalanceDiffs(NamedTuple):
     ctez_diff: int
     tez_diff: int
 
-class Ctez2BaseTestCase(BaseTestCase):
+class Ctez2BaseTestCase(Ctez2SetupMixin, BaseTestCase):
     def default_setup(
         self,
         tez_liquidity: int = 0,
@@ -20,45 +20,45 @@ class Ctez2BaseTestCase(BaseTestCase):
         get_ctez_token_balances: Optional[Callable[[PyTezosClient, PyTezosClient], dict[Addressable, int]]] = None,
         ctez_total_supply: Optional[int] = None,
         target_ctez_price: float = 1.0,
-        bootstrap_all_tez_balances = False # reloads node and transfer all bakers balances to bootstrapped accounts
+        bootstrap_all_tez_balances = False # starts from a fresh node (snapshot) and transfers all bakers balances to bootstrapped accounts
     ) -> tuple[Ctez2, Fa12, PyTezosClient, PyTezosClient, PyTezosClient]:
-        if bootstrap_all_tez_balances:
-            self.tearDownClass()
-            self.setUpClass()
         initial_tez_balance = None if bootstrap_all_tez_balances else 10_000_000_000
-        account1 = self.bootstrap_account(initial_tez_balance)
-        account2 = self.bootstrap_account(initial_tez_balance)
-        donor = self.bootstrap_account(initial_tez_balance)
-        ctez2 = self.deploy_ctez2(target_ctez_price=target_ctez_price)
-
-        ctez_token = self.deploy_fa12(ctez2)
-        ctez2.set_ctez_fa12_address(ctez_token).send()
-        self.bake_block()
-
+        bootstrap_accounts = lambda: self.bootstrap_accounts(3, initial_tez_balance)
+        if not self.USE_NODE_SNAPSHOTS or not bootstrap_all_tez_balances:
+            if bootstrap_all_tez_balances:
+                # the bakers balances are spent, so the accounts are set up on a fresh node
+                self.restart_node()
+            account1, account2, donor = bootstrap_accounts()
+            balances = get_ctez_token_balances(account1, account2) if get_ctez_token_balances is not None else {}
+            ctez2, ctez_token = self.deploy_default_setup(donor, tez_liquidity, ctez_liquidity, balances, ctez_total_supply, target_ctez_price)
+            return ctez2, ctez_token, account1, account2, donor
+
+        # these setups need a fresh node anyway, so every distinct one is built once on top
+        # of the accounts snapshot and restored instead of restarting the node
+        accounts_snapshot = 'all_tez_balances'
+        node_has_accounts_only = accounts_snapshot not in BaseTestCase.snapshots
+        if node_has_accounts_only:
+            accounts = self.bootstrap_accounts_from_snapshot(accounts_snapshot, bootstrap_accounts)
+        else:
+            accounts = self.get_snapshot_accounts(BaseTestCase.snapshots[accounts_snapshot])
+        account1, account2, donor = accounts
         balances = get_ctez_token_balances(account1, account2) if get_ctez_token_balances is not None else {}
-        rest_supply = ctez_total_supply if ctez_total_supply is not None else sum(balances.values()) + ctez_liquidity
-        tez_deposit = ceil(rest_supply * target_ctez_price * 16/15) # ctez_outstanding = tez*target_price*16/16 not to get under_collateralized
-
-        if (tez_deposit > 0) or (tez_liquidity > 0):
-            donor.bulk(
-                ctez2.create_oven(0, None, None).with_amount(tez_deposit),
-                ctez2.mint_or_burn(0, rest_supply),
-                *(
-                    ctez_token.approve(ctez2, ctez_liquidity),
-                    ctez2.add_ctez_liquidity(donor, ctez_liquidity, 0, self.get_future_timestamp()),
-                ) if ctez_liquidity > 0 else (),
-                *(
-                    ctez2.add_tez_liquidity(donor, 0, self.get_future_timestamp()).with_amount(tez_liquidity),
-                ) if tez_liquidity > 0 else (),
-            ).send()
-            self.bake_block()
-
-        if len(balances):
-            donor.bulk(
-                *[ctez_token.transfer(donor, receiver, amount) for receiver, amount in balances.items()]
-            ).send()
-            self.bake_block()
-
+        name = repr((
+            'ctez2_default_setup',
+            tez_liquidity,
+            ctez_liquidity,
+            sorted((get_address(receiver), amount) for receiver, amount in balances.items()),
+            ctez_total_supply,
+            target_ctez_price,
+        ))
+        if name in BaseTestCase.snapshots:
+            ctez2_address, ctez_token_address = self.restore_snapshot(name).addresses
+            return Ctez2.from_address(self.manager, ctez2_address), Fa12.from_address(self.manager, ctez_token_address), account1, account2, donor
+
+        if not node_has_accounts_only:
+            self.restore_snapshot(accounts_snapshot)
+        ctez2, ctez_token = self.deploy_default_setup(donor, tez_liquidity, ctez_liquidity, balances, ctez_total_supply, target_ctez_price)
+        self.take_snapshot(name, accounts, [ctez2.address, ctez_token.address])
         return ctez2, ctez_token, account1, account2, donor
 
     def prepare_ctez_dex_liquidity(self) -> tuple[Ctez2, Fa12, PyTezosClient, PyTezosClient, PyTezosClient]:
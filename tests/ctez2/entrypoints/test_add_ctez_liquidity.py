@@ -9,21 +9,21 @@ class Ctez2AddCtezLiquidityTestCase(Ctez2BaseTestCase):
 
         deposit_amount = 10
         with self.raises_michelson_error(Ctez2.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
-            ctez2.using(sender).add_ctez_liquidity(owner, deposit_amount, 10, 0).with_amount(1).send()
+            self.dry_run(ctez2.using(sender).add_ctez_liquidity(owner, deposit_amount, 10, 0).with_amount(1))
 
     def test_should_fail_if_deadline_has_passed(self) -> None:
         ctez2, _, sender, owner, *_ = self.default_setup()
 
         deposit_amount = 10
         with self.raises_michelson_error(Ctez2.Errors.DEADLINE_HAS_PASSED):
-            ctez2.using(sender).add_ctez_liquidity(owner, deposit_amount, 10, self.get_passed_timestamp()).send()
+            self.dry_run(ctez2.using(sender).add_ctez_liquidity(owner, deposit_amount, 10, self.get_passed_timestamp()))
 
     def test_should_fail_if_insufficient_liquidity_created(self) -> None:
         ctez2, _, sender, owner, *_ = self.default_setup()
 
         deposit_amount = 10
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_LIQUIDITY_CREATED):
-            ctez2.using(sender).add_ctez_liquidity(owner, deposit_amount, 100_000, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(sender).add_ctez_liquidity(owner, deposit_amount, 100_000, self.get_future_timestamp()))
 
     def test_should_transfer_ctez_token_correctly(self) -> None:
         deposit_amount = 123
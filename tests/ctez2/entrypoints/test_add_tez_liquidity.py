@@ -10,14 +10,14 @@ class Ctez2AddTezLiquidityTestCase(Ctez2BaseTestCase):
 
         deposit_amount = 10
         with self.raises_michelson_error(Ctez2.Errors.DEADLINE_HAS_PASSED):
-            ctez2.using(sender).add_tez_liquidity(owner, 10, self.get_passed_timestamp()).with_amount(deposit_amount).send()
+            self.dry_run(ctez2.using(sender).add_tez_liquidity(owner, 10, self.get_passed_timestamp()).with_amount(deposit_amount))
 
     def test_should_fail_if_insufficient_liquidity_created(self) -> None:
         ctez2, _, sender, owner, *_ = self.default_setup()
 
         deposit_amount = 10
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_LIQUIDITY_CREATED):
-            ctez2.using(sender).add_tez_liquidity(owner, 100_000, self.get_future_timestamp()).with_amount(deposit_amount).send()
+            self.dry_run(ctez2.using(sender).add_tez_liquidity(owner, 100_000, self.get_future_timestamp()).with_amount(deposit_amount))
 
     def test_transfer_tez_token_correctly(self) -> None:
         deposit_amount = 123
@@ -10,7 +10,7 @@ class Ctez2CollectFromTezLiquidityTestCase(Ctez2BaseTestCase):
         ctez2, _, sender, receiver, *_ = self.default_setup()
 
         with self.raises_michelson_error(Ctez2.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
-            ctez2.using(sender).collect_from_tez_liquidity(receiver).with_amount(1).send()
+            self.dry_run(ctez2.using(sender).collect_from_tez_liquidity(receiver).with_amount(1))
             
     def test_should_collect_from_empty_account_correctly(self) -> None:
         ctez2, ctez_token, receiver, *_ = self.prepare_tez_dex_liquidity()
@@ -13,7 +13,7 @@ class Ctez2CtezToTezTestCase(Ctez2BaseTestCase):
 
         sent_ctez = 10
         with self.raises_michelson_error(Ctez2.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
-            ctez2.using(sender).ctez_to_tez(receiver, sent_ctez, 10, 0).with_amount(1).send()
+            self.dry_run(ctez2.using(sender).ctez_to_tez(receiver, sent_ctez, 10, 0).with_amount(1))
 
     def test_should_fail_if_deadline_has_passed(self) -> None:
         ctez2, _, sender, receiver, *_ = self.default_setup(
@@ -22,7 +22,7 @@ class Ctez2CtezToTezTestCase(Ctez2BaseTestCase):
 
         sent_ctez = 10
         with self.raises_michelson_error(Ctez2.Errors.DEADLINE_HAS_PASSED):
-            ctez2.using(sender).ctez_to_tez(receiver, sent_ctez, 10, self.get_passed_timestamp()).send()
+            self.dry_run(ctez2.using(sender).ctez_to_tez(receiver, sent_ctez, 10, self.get_passed_timestamp()))
 
     def test_should_fail_if_insufficient_tokens_liquidity(self) -> None:
         ctez2, _, sender, receiver, *_ = self.default_setup(
@@ -31,7 +31,7 @@ class Ctez2CtezToTezTestCase(Ctez2BaseTestCase):
 
         sent_ctez = 10
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_TOKENS_LIQUIDITY):
-            ctez2.using(sender).ctez_to_tez(receiver, sent_ctez, 8, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(sender).ctez_to_tez(receiver, sent_ctez, 8, self.get_future_timestamp()))
 
     def test_should_fail_if_insufficient_tokens_bought(self) -> None:
         ctez2, _, sender, receiver, *_ = self.default_setup(
@@ -40,7 +40,7 @@ class Ctez2CtezToTezTestCase(Ctez2BaseTestCase):
 
         sent_ctez = 10
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_TOKENS_BOUGHT):
-            ctez2.using(sender).ctez_to_tez(receiver, sent_ctez, 1_000_000, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(sender).ctez_to_tez(receiver, sent_ctez, 1_000_000, self.get_future_timestamp()))
 
     def test_should_not_fail_if_all_liquidity_removed(self) -> None:
         all_liquidity = 8
@@ -69,7 +69,7 @@ class Ctez2CtezToTezTestCase(Ctez2BaseTestCase):
         )
 
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_TOKENS_BOUGHT):
-            ctez2.using(sender).ctez_to_tez(receiver, sell_amount, 0, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(sender).ctez_to_tez(receiver, sell_amount, 0, self.get_future_timestamp()))
 
     def test_should_not_fail_if_bought_token_amount_is_zero(self) -> None:
         sell_amount = 3
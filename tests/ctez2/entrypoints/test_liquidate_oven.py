@@ -9,14 +9,14 @@ class Ctez2LiquidateTestCase(Ctez2BaseTestCase):
 
         oven_id = 2
         with self.raises_michelson_error(Ctez2.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
-            ctez2.using(owner).liquidate_oven(owner, oven_id, 123, receiver).with_amount(1).send()
+            self.dry_run(ctez2.using(owner).liquidate_oven(owner, oven_id, 123, receiver).with_amount(1))
 
     def test_should_fail_if_oven_not_exist(self) -> None:
         ctez2, _, owner, receiver, *_ = self.default_setup()
 
         oven_id = 2
         with self.raises_michelson_error(Ctez2.Errors.OVEN_NOT_EXISTS):
-            ctez2.using(owner).liquidate_oven(owner, oven_id, 123, receiver).send()
+            self.dry_run(ctez2.using(owner).liquidate_oven(owner, oven_id, 123, receiver))
 
     def test_should_fail_if_not_undercollateralized(self) -> None:
         ctez2, _, owner, receiver, *_ = self.default_setup(
@@ -33,7 +33,7 @@ class Ctez2LiquidateTestCase(Ctez2BaseTestCase):
         self.bake_block()
 
         with self.raises_michelson_error(Ctez2.Errors.NOT_UNDERCOLLATERALIZED):
-            ctez2.using(owner).liquidate_oven(owner, oven_id, outstanding_balance, receiver).send()
+            self.dry_run(ctez2.using(owner).liquidate_oven(owner, oven_id, outstanding_balance, receiver))
 
     def test_should_fail_if_burning_more_than_outstanding_ctez(self) -> None:
         ctez2, _, owner, receiver, *_ = self.default_setup()
@@ -44,9 +44,9 @@ class Ctez2LiquidateTestCase(Ctez2BaseTestCase):
             ctez2.create_oven(oven_id, None, None).with_amount(ceil(outstanding_balance * 16/15)),
             ctez2.mint_or_burn(oven_id, outstanding_balance)
         ).send()
-        self.bake_blocks(100)
+        self.advance_time(100)
         with self.raises_michelson_error(Ctez2.Errors.EXCESSIVE_CTEZ_BURNING):
-            ctez2.using(owner).liquidate_oven(owner, oven_id, outstanding_balance + 100, receiver).send()
+            self.dry_run(ctez2.using(owner).liquidate_oven(owner, oven_id, outstanding_balance + 100, receiver))
 
     def test_should_liquidate_oven_correctly(self) -> None:
         target_price = 2
@@ -68,7 +68,7 @@ class Ctez2LiquidateTestCase(Ctez2BaseTestCase):
             ctez2.create_oven(oven_id, None, None).with_amount(balance),
             ctez2.mint_or_burn(oven_id, ctez_minted)
         ).send()
-        self.bake_blocks(100)
+        self.advance_time(100)
 
         prev_oven_info = ctez2.get_oven(owner, oven_id)
         oven = ctez2.get_oven_contract(owner, owner, oven_id)
@@ -126,7 +126,7 @@ class Ctez2LiquidateTestCase(Ctez2BaseTestCase):
             ctez2.create_oven(oven_id, None, None).with_amount(balance),
             ctez2.mint_or_burn(oven_id, ctez_minted)
         ).send()
-        self.bake_blocks(100)
+        self.advance_time(100)
 
         prev_oven_info = ctez2.get_oven(owner, oven_id)
         oven = ctez2.get_oven_contract(owner, owner, oven_id)
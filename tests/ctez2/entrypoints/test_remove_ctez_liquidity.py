@@ -12,13 +12,13 @@ class Ctez2RemoveCtezLiquidityTestCase(Ctez2BaseTestCase):
         ctez2, _, sender, receiver, *_ = self.default_setup()
 
         with self.raises_michelson_error(Ctez2.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
-            ctez2.using(sender).remove_ctez_liquidity(receiver, 0, 0, 0, 0, self.get_future_timestamp()).with_amount(1).send()
+            self.dry_run(ctez2.using(sender).remove_ctez_liquidity(receiver, 0, 0, 0, 0, self.get_future_timestamp()).with_amount(1))
 
     def test_should_fail_if_deadline_has_passed(self) -> None:
         ctez2, _, sender, receiver, *_ = self.default_setup()
 
         with self.raises_michelson_error(Ctez2.Errors.DEADLINE_HAS_PASSED):
-            ctez2.using(sender).remove_ctez_liquidity(receiver, 0, 0, 0, 0, self.get_passed_timestamp()).send()
+            self.dry_run(ctez2.using(sender).remove_ctez_liquidity(receiver, 0, 0, 0, 0, self.get_passed_timestamp()))
 
     def test_should_fail_if_insufficient_liquidity_in_account(self) -> None:
         deposit_amount = 100
@@ -27,10 +27,10 @@ class Ctez2RemoveCtezLiquidityTestCase(Ctez2BaseTestCase):
         )
 
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_LIQUIDITY):
-            ctez2.using(not_owner).remove_ctez_liquidity(receiver, 1, 0, 0, 0, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(not_owner).remove_ctez_liquidity(receiver, 1, 0, 0, 0, self.get_future_timestamp()))
 
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_LIQUIDITY):
-            ctez2.using(owner).remove_ctez_liquidity(receiver, deposit_amount + 1, 0, 0, 0, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(owner).remove_ctez_liquidity(receiver, deposit_amount + 1, 0, 0, 0, self.get_future_timestamp()))
 
     def test_should_transfer_tokens_correctly(self) -> None:
         deposit_amount = 100
@@ -247,11 +247,11 @@ class Ctez2RemoveCtezLiquidityTestCase(Ctez2BaseTestCase):
         account = ctez2.get_ctez_liquidity_owner(depositor_0)
 
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_SELF_RECEIVED):
-            ctez2.using(depositor_0).remove_ctez_liquidity(depositor_0, account.liquidity_shares, 10000001, 0, 0, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(depositor_0).remove_ctez_liquidity(depositor_0, account.liquidity_shares, 10000001, 0, 0, self.get_future_timestamp()))
 
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_PROCEEDS_RECEIVED):
-            ctez2.using(depositor_0).remove_ctez_liquidity(depositor_0, account.liquidity_shares, 0, 5248755, 0, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(depositor_0).remove_ctez_liquidity(depositor_0, account.liquidity_shares, 0, 5248755, 0, self.get_future_timestamp()))
 
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_SUBSIDY_RECEIVED):
-            ctez2.using(depositor_0).remove_ctez_liquidity(depositor_0, account.liquidity_shares, 0, 0, 341, self.get_future_timestamp()).send()
+            self.dry_run(ctez2.using(depositor_0).remove_ctez_liquidity(depositor_0, account.liquidity_shares, 0, 0, 341, self.get_future_timestamp()))
         
\ No newline at end of file
@@ -9,7 +9,7 @@ class Ctez2SetCtezFa12AddressTestCase(Ctez2BaseTestCase):
         ctez_token = self.deploy_fa12(ctez2)
 
         with self.raises_michelson_error(Ctez2.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
-            ctez2.set_ctez_fa12_address(ctez_token).with_amount(1).send()
+            self.dry_run(ctez2.set_ctez_fa12_address(ctez_token).with_amount(1))
 
     def test_should_fail_if_not_originator_call(self) -> None:
         ctez2 = self.deploy_ctez2()
@@ -17,7 +17,7 @@ class Ctez2SetCtezFa12AddressTestCase(Ctez2BaseTestCase):
         not_originator = self.bootstrap_account()
 
         with self.raises_michelson_error(Ctez2.Errors.ONLY_ORIGINATOR_CAN_CALL):
-            ctez2.using(not_originator).set_ctez_fa12_address(ctez_token).send()
+            self.dry_run(ctez2.using(not_originator).set_ctez_fa12_address(ctez_token))
 
     def test_should_set_ctez_fa12_address_correctly(self) -> None:
         ctez2 = self.deploy_ctez2()
@@ -30,4 +30,4 @@ class Ctez2SetCtezFa12AddressTestCase(Ctez2BaseTestCase):
 
         # then it should prevent any other attempts of changing ctez token address
         with self.raises_michelson_error(Ctez2.Errors.CTEZ_FA12_ADDRESS_ALREADY_SET):
-            ctez2.set_ctez_fa12_address(NULL_ADDRESS).send()
+            self.dry_run(ctez2.set_ctez_fa12_address(NULL_ADDRESS))
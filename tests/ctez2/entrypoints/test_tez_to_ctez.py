@@ -10,7 +10,7 @@ class Ctez2TezToCtezTestCase(Ctez2BaseTestCase):
 
         sent_tez = 10
         with self.raises_michelson_error(Ctez2.Errors.DEADLINE_HAS_PASSED):
-            ctez2.using(sender).tez_to_ctez(receiver, 10, self.get_passed_timestamp()).with_amount(sent_tez).send()
+            self.dry_run(ctez2.using(sender).tez_to_ctez(receiver, 10, self.get_passed_timestamp()).with_amount(sent_tez))
 
     def test_should_fail_if_insufficient_tokens_liquidity(self) -> None:
         ctez2, _, sender, receiver, *_ = self.default_setup(
@@ -19,7 +19,7 @@ class Ctez2TezToCtezTestCase(Ctez2BaseTestCase):
 
         sent_tez = 10
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_TOKENS_LIQUIDITY):
-            ctez2.using(sender).tez_to_ctez(receiver, 8, self.get_future_timestamp()).with_amount(sent_tez).send()
+            self.dry_run(ctez2.using(sender).tez_to_ctez(receiver, 8, self.get_future_timestamp()).with_amount(sent_tez))
 
     def test_should_fail_if_insufficient_tokens_bought(self) -> None:
         ctez2, _, sender, receiver, *_ = self.default_setup(
@@ -28,7 +28,7 @@ class Ctez2TezToCtezTestCase(Ctez2BaseTestCase):
 
         sent_tez = 10
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_TOKENS_BOUGHT):
-            ctez2.using(sender).tez_to_ctez(receiver, 1_000_000, self.get_future_timestamp()).with_amount(sent_tez).send()
+            self.dry_run(ctez2.using(sender).tez_to_ctez(receiver, 1_000_000, self.get_future_timestamp()).with_amount(sent_tez))
 
     @parameterized.expand(range(0, 2))
     def test_should_fail_if_sell_token_amount_too_small(self, sell_amount) -> None:
@@ -37,7 +37,7 @@ class Ctez2TezToCtezTestCase(Ctez2BaseTestCase):
         )
 
         with self.raises_michelson_error(Ctez2.Errors.INSUFFICIENT_TOKENS_BOUGHT):
-            ctez2.using(sender).tez_to_ctez(receiver, 0, self.get_future_timestamp()).with_amount(sell_amount).send()
+            self.dry_run(ctez2.using(sender).tez_to_ctez(receiver, 0, self.get_future_timestamp()).with_amount(sell_amount))
 
     def test_should_not_fail_if_bought_token_amount_is_zero(self) -> None:
         sell_amount = 3
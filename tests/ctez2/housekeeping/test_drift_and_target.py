@@ -35,7 +35,7 @@ class Ctez2DriftAndTargetTestCase(Ctez2BaseTestCase):
         context = ctez2.get_context()
         prev_drift = context.drift
 
-        self.bake_blocks(delta - 1) # 1 block is 1 second
+        self.advance_time(delta - 1)
         ctez2.using(sender).collect_from_ctez_liquidity(sender).send()
         self.bake_block()
 
@@ -47,7 +47,7 @@ class Ctez2DriftAndTargetTestCase(Ctez2BaseTestCase):
         assert round(100 * d_drift / (delta * 2**16)) == expected_drift_change_percent
 
         delta = 2
-        self.bake_blocks(delta - 1) # to make new delta is 2
+        self.advance_time(delta - 1) # to make new delta is 2
         ctez2.using(sender).collect_from_ctez_liquidity(sender).send() # force housekeeping again to apply new drift to target
         self.bake_block()
 
@@ -80,20 +80,3 @@ class Ctez2DriftAndTargetTestCase(Ctez2BaseTestCase):
         # check that housekeeping does not fail
         ctez2.collect_from_tez_liquidity(sender).send()
         self.bake_block()
-
-    # def test_drift_and_target_calc(self) -> None:
-    #     self.manager.context.now
-    #     seconds_in_day = 60*60*24
-    #     d_drift_per_day = (2**16 * seconds_in_day)
-    #     drift = 0
-    #     initial_target = Ctez2.FLOAT_DENOMINATOR
-    #     target = initial_target
-    #     days = 366 // 2
-
-    #     for i in range(days):
-    #         target += (drift * seconds_in_day * target) // Ctez2.FLOAT_DENOMINATOR 
-    #         drift += d_drift_per_day
-
-    #     print('target', target / Ctez2.FLOAT_DENOMINATOR)
-    #     print('grow_%', (target - initial_target) / initial_target * 100)
-    #     assert False
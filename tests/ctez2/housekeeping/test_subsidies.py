@@ -163,7 +163,7 @@ class Ctez2SubsidiesTestCase(Ctez2BaseTestCase):
         assert ctez_token.view_total_supply() == oven0_ctez_minted_by_owner
 
         delta = 10
-        self.bake_blocks(delta - 1)
+        self.advance_time(delta - 1)
         oven0 = ctez2.get_oven_contract(owner, owner, 0)
         owner.bulk(
             # place deposit in oven0 to calculate subsidies and update outstanding
@@ -199,7 +199,7 @@ class Ctez2SubsidiesTestCase(Ctez2BaseTestCase):
         oven1 = ctez2.get_oven_contract(owner, owner, 1)
         oven2 = ctez2.get_oven_contract(owner, owner, 2)
 
-        self.bake_blocks(delta - 1)
+        self.advance_time(delta - 1)
         owner.bulk(
             # place deposit in ovens to calculate subsidies and update outstanding
             oven0.deposit().with_amount(100),
@@ -229,7 +229,7 @@ class Ctez2SubsidiesTestCase(Ctez2BaseTestCase):
         assert oven1_subsidies == 0
         assert oven2_subsidies == 0 # subsidies have not been charged because ctez minted in the same block
 
-        self.bake_blocks(delta - 1)
+        self.advance_time(delta - 1)
         owner.bulk(
             # place deposit in ovens to calculate subsidies and update outstanding
             oven0.deposit().with_amount(100),
@@ -0,0 +1,299 @@
+from math import ceil
+from typing import Optional
+from parameterized import parameterized
+from pytezos.client import PyTezosClient
+
+from tests.helpers.addressable import Addressable, get_address
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.utility import TEST_ADDRESSES_SET
+
+
+class Ctez2SetupMixin:
+    """Setup of the ctez2 tests shared by the sandboxed node (Ctez2BaseTestCase) and
+    the in-process chain (LocalTestCase). The test case provides send, bake_block,
+    deploy_ctez2, deploy_fa12 and get_future_timestamp."""
+
+    def deploy_default_setup(
+        self,
+        donor: PyTezosClient,
+        tez_liquidity: int,
+        ctez_liquidity: int,
+        balances: dict[Addressable, int],
+        ctez_total_supply: Optional[int],
+        target_ctez_price: float,
+    ) -> tuple[Ctez2, Fa12]:
+        ctez2 = self.deploy_ctez2(target_ctez_price=target_ctez_price)
+
+        ctez_token = self.deploy_fa12(ctez2)
+        self.send(ctez2.set_ctez_fa12_address(ctez_token))
+        self.bake_block()
+
+        rest_supply = ctez_total_supply if ctez_total_supply is not None else sum(balances.values()) + ctez_liquidity
+        tez_deposit = ceil(rest_supply * target_ctez_price * 16/15) # ctez_outstanding = tez*target_price*16/16 not to get under_collateralized
+
+        if (tez_deposit > 0) or (tez_liquidity > 0):
+            self.send(donor.bulk(
+                ctez2.create_oven(0, None, None).with_amount(tez_deposit),
+                ctez2.mint_or_burn(0, rest_supply),
+                *(
+                    ctez_token.approve(ctez2, ctez_liquidity),
+                    ctez2.add_ctez_liquidity(donor, ctez_liquidity, 0, self.get_future_timestamp()),
+                ) if ctez_liquidity > 0 else (),
+                *(
+                    ctez2.add_tez_liquidity(donor, 0, self.get_future_timestamp()).with_amount(tez_liquidity),
+                ) if tez_liquidity > 0 else (),
+            ))
+            self.bake_block()
+
+        if len(balances):
+            self.send(donor.bulk(
+                *[ctez_token.transfer(donor, receiver, amount) for receiver, amount in balances.items()]
+            ))
+            self.bake_block()
+
+        return ctez2, ctez_token
+
+
+class Ctez2CreateOvenTests:
+    @parameterized.expand([
+        ('without_initial_balance',           0, False, None),
+        ('with_initial_balance',    100_000_000, False, None),
+        ('with_delegate',           100_000_000, True, None),
+        ('with_depositors',         100_000_000, True, [TEST_ADDRESSES_SET[0], TEST_ADDRESSES_SET[1]]),
+    ])
+    def test_should_create_oven_correctly(self, _name: str, initial_balance: int, with_delegate: bool, depositors: list | None) -> None:
+        ctez2, _, owner, *_ = self.default_setup()
+        delegate = get_address(self.bootstrap_baker()) if with_delegate else None
+
+        oven_id = 2
+        self.send(ctez2.using(owner).create_oven(oven_id, delegate, depositors).with_amount(initial_balance))
+        self.bake_block()
+
+        ctez_dex = ctez2.get_sell_ctez_dex()
+        tez_dex = ctez2.get_sell_tez_dex()
+        oven_info = ctez2.get_oven(owner, oven_id)
+        assert oven_info.tez_balance == initial_balance
+        assert oven_info.ctez_outstanding == 0
+        assert oven_info.fee_index == ctez_dex.fee_index * tez_dex.fee_index
+
+        oven = ctez2.get_oven_contract(owner, owner, oven_id)
+        assert self.get_balance_mutez(oven) == initial_balance
+        assert self.get_contract_delegate(oven) == delegate
+        assert oven.get_admin() == get_address(ctez2)
+        assert oven.get_depositors() == True if depositors == None else depositors
+
+    def test_should_fail_if_oven_with_the_same_id_already_created(self) -> None:
+        ctez2, _, owner, *_ = self.default_setup()
+
+        oven_id = 2
+        self.send(ctez2.using(owner).create_oven(oven_id, None, None))
+        self.bake_block()
+
+        with self.raises_michelson_error(Ctez2.Errors.OVEN_ALREADY_EXISTS):
+            self.dry_run(ctez2.using(owner).create_oven(oven_id, None, None))
+
+
+class Ctez2MintOrBurnTests:
+    def test_should_fail_if_tez_in_transaction(self) -> None:
+        ctez2, _, owner, *_ = self.default_setup()
+
+        oven_id = 2
+        with self.raises_michelson_error(Ctez2.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
+            self.dry_run(ctez2.using(owner).mint_or_burn(oven_id, 123).with_amount(1))
+
+    def test_should_fail_if_oven_not_exist(self) -> None:
+        ctez2, _, owner, *_ = self.default_setup()
+
+        oven_id = 2
+        with self.raises_michelson_error(Ctez2.Errors.OVEN_NOT_EXISTS):
+            self.dry_run(ctez2.using(owner).mint_or_burn(oven_id, 123))
+
+    def test_should_fail_if_burn_more_than_outstanding_ctez(self) -> None:
+        ctez2, _, owner, *_ = self.default_setup(
+            ctez_liquidity = 100_000_000,
+            tez_liquidity = 100_000_000
+        )
+
+        oven_id = 2
+        outstanding_balance = 123
+        self.send(owner.bulk(
+            ctez2.create_oven(oven_id, None, None).with_amount(ceil(outstanding_balance * 16/15)),
+            ctez2.mint_or_burn(oven_id, outstanding_balance)
+        ))
+        self.bake_block()
+
+        with self.raises_michelson_error(Ctez2.Errors.EXCESSIVE_CTEZ_BURNING):
+            self.dry_run(ctez2.using(owner).mint_or_burn(oven_id, -(outstanding_balance + 1)))
+
+    def test_should_fail_if_mint_led_to_liquidation(self) -> None:
+        ctez2, _, owner, *_ = self.default_setup(
+            ctez_liquidity = 100_000_000,
+            tez_liquidity = 100_000_000
+        )
+
+        oven_id = 2
+        outstanding_balance = 123
+        self.send(owner.bulk(
+            ctez2.create_oven(oven_id, None, None).with_amount(ceil(outstanding_balance * 16/15)),
+            ctez2.mint_or_burn(oven_id, outstanding_balance)
+        ))
+        self.bake_block()
+        with self.raises_michelson_error(Ctez2.Errors.EXCESSIVE_CTEZ_MINTING):
+            self.dry_run(ctez2.using(owner).mint_or_burn(oven_id, 1))
+
+    def test_should_mint_ctez_correctly(self) -> None:
+        ctez2, ctez_token, owner, *_ = self.default_setup(
+            ctez_liquidity = 100_000_000,
+            tez_liquidity = 100_000_000
+        )
+
+        oven_id = 12
+        balance = 100
+        ctez_minted = 50
+
+        self.send(ctez2.using(owner).create_oven(oven_id, None, None).with_amount(balance))
+        self.bake_block()
+
+        prev_oven_info = ctez2.get_oven(owner, oven_id)
+        oven = ctez2.get_oven_contract(owner, owner, oven_id)
+        prev_oven_tez_balance = self.get_balance_mutez(oven)
+        prev_owner_tez_balance = self.get_balance_mutez(owner)
+        prev_owner_ctez_balance = ctez_token.view_balance(owner)
+        prev_total_supply = ctez_token.view_total_supply()
+
+        opg = self.send(ctez2.using(owner).mint_or_burn(oven_id, ctez_minted))
+        self.bake_block()
+
+        assert self.get_balance_mutez(owner) == prev_owner_tez_balance - self.get_consumed_mutez(owner, opg)
+        assert ctez_token.view_balance(owner) == prev_owner_ctez_balance + ctez_minted
+        assert ctez_token.view_total_supply() == prev_total_supply + ctez_minted
+        assert ctez2.get_oven(owner, oven_id).ctez_outstanding == prev_oven_info.ctez_outstanding + ctez_minted
+        assert self.get_balance_mutez(oven) == prev_oven_tez_balance
+
+    def test_should_burn_ctez_correctly(self) -> None:
+        ctez2, ctez_token, owner, *_ = self.default_setup(
+            ctez_liquidity = 100_000_000,
+            tez_liquidity = 100_000_000
+        )
+
+        oven_id = 12
+        balance = 100
+        ctez_minted = 50
+        ctez_burned = 20
+
+        self.send(owner.bulk(
+            ctez2.create_oven(oven_id, None, None).with_amount(balance),
+            ctez2.mint_or_burn(oven_id, ctez_minted)
+        ))
+        self.bake_block()
+
+        prev_oven_info = ctez2.get_oven(owner, oven_id)
+        oven = ctez2.get_oven_contract(owner, owner, oven_id)
+        prev_oven_tez_balance = self.get_balance_mutez(oven)
+        prev_owner_tez_balance = self.get_balance_mutez(owner)
+        prev_owner_ctez_balance = ctez_token.view_balance(owner)
+        prev_total_supply = ctez_token.view_total_supply()
+
+        opg = self.send(ctez2.using(owner).mint_or_burn(oven_id, -ctez_burned))
+        self.bake_block()
+
+        assert self.get_balance_mutez(owner) == prev_owner_tez_balance - self.get_consumed_mutez(owner, opg)
+        assert ctez_token.view_balance(owner) == prev_owner_ctez_balance - ctez_burned
+        assert ctez_token.view_total_supply() == prev_total_supply - ctez_burned
+        assert ctez2.get_oven(owner, oven_id).ctez_outstanding == prev_oven_info.ctez_outstanding - ctez_burned
+        assert self.get_balance_mutez(oven) == prev_oven_tez_balance
+
+
+class Ctez2RegisterOvenDepositTests:
+    def test_should_fail_if_oven_not_exist(self) -> None:
+        ctez2, _, owner, *_ = self.default_setup()
+
+        oven_id = 2
+        with self.raises_michelson_error(Ctez2.Errors.OVEN_NOT_EXISTS):
+            self.dry_run(ctez2.using(owner).register_oven_deposit(oven_id, owner, 123))
+
+    def test_should_fail_if_called_not_by_oven(self) -> None:
+        ctez2, _, owner, *_ = self.default_setup()
+
+        oven_id = 2
+        self.send(ctez2.using(owner).create_oven(oven_id, None, None))
+        self.bake_block()
+
+        with self.raises_michelson_error(Ctez2.Errors.ONLY_OVEN_CAN_CALL):
+            self.dry_run(ctez2.using(owner).register_oven_deposit(oven_id, owner, 123))
+
+
+class Ctez2WithdrawTests:
+    def test_should_fail_if_tez_in_transaction(self) -> None:
+        ctez2, _, owner, receiver, *_ = self.default_setup()
+
+        oven_id = 2
+        with self.raises_michelson_error(Ctez2.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
+            self.dry_run(ctez2.using(owner).withdraw_from_oven(oven_id, 123, receiver).with_amount(1))
+
+    def test_should_fail_if_oven_not_exist(self) -> None:
+        ctez2, _, owner, receiver, *_ = self.default_setup()
+
+        oven_id = 2
+        with self.raises_michelson_error(Ctez2.Errors.OVEN_NOT_EXISTS):
+            self.dry_run(ctez2.using(owner).withdraw_from_oven(oven_id, 123, receiver))
+
+    def test_should_fail_if_withdraw_more_than_balance(self) -> None:
+        ctez2, _, owner, receiver, *_ = self.default_setup()
+
+        oven_id = 2
+        balance = 123
+        self.send(ctez2.using(owner).create_oven(oven_id, None, None).with_amount(balance))
+        self.bake_block()
+
+        with self.raises_michelson_error(Ctez2.Errors.EXCESSIVE_TEZ_WITHDRAWAL):
+            self.dry_run(ctez2.using(owner).withdraw_from_oven(oven_id, balance + 1, receiver))
+
+    def test_should_fail_if_withdraw_led_to_liquidation(self) -> None:
+        ctez2, _, owner, receiver, *_ = self.default_setup(
+            ctez_liquidity = 100_000_000,
+            tez_liquidity = 100_000_000
+        )
+
+        oven_id = 12
+        balance = 16
+        ctez_minted = 15
+        self.send(owner.bulk(
+            ctez2.create_oven(oven_id, None, None).with_amount(balance),
+            ctez2.mint_or_burn(oven_id, ctez_minted)
+        ))
+        self.bake_block()
+
+        with self.raises_michelson_error(Ctez2.Errors.EXCESSIVE_TEZ_WITHDRAWAL):
+            self.dry_run(ctez2.using(owner).withdraw_from_oven(oven_id, 1, receiver))
+
+    def test_should_withdraw_from_oven_correctly(self) -> None:
+        ctez2, _, owner, receiver, *_ = self.default_setup(
+            ctez_liquidity = 100_000_000,
+            tez_liquidity = 100_000_000
+        )
+
+        oven_id = 12
+        balance = 17
+        withdraw_amount = 1
+        ctez_minted = 15
+        self.send(owner.bulk(
+            ctez2.create_oven(oven_id, None, None).with_amount(balance),
+            ctez2.mint_or_burn(oven_id, ctez_minted)
+        ))
+        self.bake_block()
+
+        prev_oven_info = ctez2.get_oven(owner, oven_id)
+        oven = ctez2.get_oven_contract(owner, owner, oven_id)
+        prev_owner_tez_balance = self.get_balance_mutez(owner)
+        prev_receiver_tez_balance = self.get_balance_mutez(receiver)
+        prev_oven_tez_balance = self.get_balance_mutez(oven)
+
+        opg = self.send(ctez2.using(owner).withdraw_from_oven(oven_id, withdraw_amount, receiver))
+        self.bake_block()
+
+        assert self.get_balance_mutez(owner) == prev_owner_tez_balance - self.get_consumed_mutez(owner, opg)
+        assert self.get_balance_mutez(receiver) == prev_receiver_tez_balance + withdraw_amount
+        assert self.get_balance_mutez(oven) == prev_oven_tez_balance - withdraw_amount
+        assert ctez2.get_oven(owner, oven_id).tez_balance == prev_oven_info.tez_balance - withdraw_amount
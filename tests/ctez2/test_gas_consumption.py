@@ -28,7 +28,7 @@ class Ctez2GasConsumptionTestCase(Ctez2BaseTestCase):
         )
 
         ctez_token.using(sender).approve(ctez2, deposit_amount).send()
-        self.bake_blocks(100)
+        self.advance_time(100)
         opg = ctez2.using(sender).add_ctez_liquidity(owner, deposit_amount, 0, self.get_future_timestamp()).send()
         self.bake_block()
 
@@ -50,7 +50,7 @@ class Ctez2GasConsumptionTestCase(Ctez2BaseTestCase):
             },
         )
 
-        self.bake_blocks(100)
+        self.advance_time(100)
         opg = ctez2.using(sender).add_tez_liquidity(owner, 0, self.get_future_timestamp()).with_amount(deposit_amount).send()
         self.bake_block()
 
@@ -249,7 +249,7 @@ class Ctez2GasConsumptionTestCase(Ctez2BaseTestCase):
             ctez2.create_oven(oven_id, None, None).with_amount(balance),
             ctez2.mint_or_burn(oven_id, ctez_minted)
         ).send()
-        self.bake_blocks(100)
+        self.advance_time(100)
 
         oven = ctez2.get_oven_contract(owner, owner, oven_id)
         prev_oven_tez_balance = self.get_balance_mutez(oven)
@@ -364,3 +364,34 @@ class Ctez2GasConsumptionTestCase(Ctez2BaseTestCase):
         assert self.get_balance_mutez(receiver) == prev_receiver_tez_balance + withdraw_amount
         assert self.get_balance_mutez(oven) == prev_oven_tez_balance - withdraw_amount
         assert ctez2.get_oven(owner, oven_id).tez_balance == prev_oven_info.tez_balance - withdraw_amount
+
+    def test_oven_delegate_gas(self) -> None:
+        oven_id = 1
+        ctez2, _, owner, *_ = self.default_setup()
+        baker = self.bootstrap_baker()
+
+        ctez2.using(owner).create_oven(oven_id, None, None).send()
+        self.bake_block()
+        oven = ctez2.get_oven_contract(owner, owner, oven_id)
+
+        opg = oven.using(owner).oven_delegate(baker).send()
+        self.bake_block()
+
+        self.recorder.add_element(self.manager, 'oven_delegate', opg)
+
+        assert self.get_contract_delegate(oven) == get_address(baker)
+
+    def test_oven_edit_depositor_gas(self) -> None:
+        oven_id = 1
+        ctez2, _, owner, *_ = self.default_setup()
+
+        ctez2.using(owner).create_oven(oven_id, None, [TEST_ADDRESSES_SET[0]]).send()
+        self.bake_block()
+        oven = ctez2.get_oven_contract(owner, owner, oven_id)
+
+        opg = oven.using(owner).oven_edit_depositor((TEST_ADDRESSES_SET[1], True)).send()
+        self.bake_block()
+
+        self.recorder.add_element(self.manager, 'oven_edit_depositor', opg)
+
+        assert oven.get_depositors() == [TEST_ADDRESSES_SET[0], TEST_ADDRESSES_SET[1]]
@@ -0,0 +1,140 @@
+import os
+from os.path import join
+from time import perf_counter
+from typing import Iterable
+from unittest import skipUnless
+from pytezos import Key
+from pytezos.client import PyTezosClient
+from pytezos.contract.call import ContractCall
+from pytezos.operation.group import OperationGroup
+
+from tests.ctez2.base import Ctez2BaseTestCase
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.operation_result_recorder import OperationResultRecorder
+from tests.helpers.utility import get_tests_dir
+
+# comma separated sizes, either `N:M` for N ovens and M liquidity owners, or `N` for both
+SCALING_SIZES = os.environ.get('SCALING_SIZES')
+# operations of one group, a group per block keeps far below the block gas limit
+BATCH_SIZE = 200
+LIQUIDITY_DEPOSIT = 1_000
+# the measured ovens take ids far above the populated ones
+MEASURED_OVEN_ID = 10**9
+
+
+def parse_sizes(sizes: str) -> list[tuple[int, int]]:
+    result = []
+    for size in sizes.split(','):
+        ovens, _, owners = size.strip().partition(':')
+        result.append((int(ovens), int(owners or ovens)))
+    return sorted(result)
+
+
+@skipUnless(SCALING_SIZES, 'set SCALING_SIZES to run the scaling benchmark')
+class Ctez2ScalingTestCase(Ctez2BaseTestCase):
+    """Costs of the entrypoints as the ovens and liquidity_owners big_maps grow, the
+    sizes are reached one after the other on the same contract"""
+
+    recorder = OperationResultRecorder()
+
+    @classmethod
+    def tearDownClass(self) -> None:
+        if self.recorder.data:
+            self.recorder.write_table_to_file(join(get_tests_dir(), 'ctez2', 'scaling.csv'))
+        super().tearDownClass()
+
+    def send_in_batches(self, client: PyTezosClient, calls: Iterable[ContractCall]) -> None:
+        calls = list(calls)
+        for start in range(0, len(calls), BATCH_SIZE):
+            client.bulk(*calls[start:start + BATCH_SIZE]).send()
+            self.bake_block()
+
+    def populate_ovens(self, ctez2: Ctez2, owner: PyTezosClient, start: int, stop: int) -> None:
+        self.send_in_batches(owner, (ctez2.create_oven(oven_id, None, None) for oven_id in range(start, stop)))
+
+    def populate_liquidity_owners(self, ctez2: Ctez2, depositor: PyTezosClient, count: int) -> None:
+        deadline = self.get_future_timestamp() + count
+        self.send_in_batches(depositor, (
+            call
+            for _ in range(count)
+            for owner in [Key.generate(export=False).public_key_hash()]
+            for call in (
+                ctez2.add_ctez_liquidity(owner, LIQUIDITY_DEPOSIT, 0, deadline),
+                ctez2.add_tez_liquidity(owner, 0, deadline).with_amount(LIQUIDITY_DEPOSIT),
+            )
+        ))
+
+    def measure(
+        self,
+        entrypoint: str,
+        ovens: int,
+        liquidity_owners: int,
+        call: ContractCall,
+    ) -> OperationGroup:
+        """Sends the call and records its costs, the time covers the simulation, the
+        injection and the block"""
+        start = perf_counter()
+        opg = call.send()
+        self.bake_block()
+        seconds = perf_counter() - start
+        self.recorder.add_element(
+            self.manager,
+            f'{entrypoint}_{ovens}_ovens_{liquidity_owners}_liquidity_owners',
+            opg,
+            entrypoint=entrypoint,
+            ovens=ovens,
+            liquidity_owners=liquidity_owners,
+            seconds=round(seconds, 3),
+        )
+        return opg
+
+    def test_entrypoints_scaling(self) -> None:
+        sizes = parse_sizes(SCALING_SIZES)
+        # the populated owners, the measured ones and the position of depositor
+        ctez_deposits = (max(owners for _, owners in sizes) + 2 * len(sizes)) * LIQUIDITY_DEPOSIT
+        ctez2, ctez_token, owner, depositor, *_ = self.default_setup(
+            ctez_liquidity = 100_000_000_000,
+            tez_liquidity = 100_000_000_000,
+            get_ctez_token_balances = lambda owner, depositor: {
+                owner: 1_000_000,
+                depositor: ctez_deposits,
+            },
+            bootstrap_all_tez_balances = True,
+        )
+        ctez_token.using(depositor).approve(ctez2, ctez_deposits).send()
+        self.bake_block()
+        # the collect and remove measurements need an existing position, every size removes
+        # an equal part of it and leaves some, so that every size updates the same entry
+        ctez2.using(depositor).add_ctez_liquidity(depositor, len(sizes) * LIQUIDITY_DEPOSIT, 0, self.get_future_timestamp()).send()
+        self.bake_block()
+        removed_shares = ctez2.get_ctez_liquidity_owner(depositor).liquidity_shares // (len(sizes) + 1)
+
+        # the measured oven and liquidity owner come on top of the populated ones
+        ovens = liquidity_owners = 0
+        for i, (target_ovens, target_owners) in enumerate(sizes):
+            if target_ovens > ovens:
+                self.populate_ovens(ctez2, owner, ovens, target_ovens)
+                ovens = target_ovens
+            if target_owners > liquidity_owners:
+                self.populate_liquidity_owners(ctez2, depositor, target_owners - liquidity_owners)
+                liquidity_owners = target_owners
+
+            oven_id = MEASURED_OVEN_ID + i
+            ctez2 = ctez2.using(owner)
+            self.measure('create_oven', ovens, liquidity_owners, ctez2.create_oven(oven_id, None, None).with_amount(1_000_000))
+            self.measure('mint_or_burn', ovens, liquidity_owners, ctez2.mint_or_burn(oven_id, 100_000))
+            oven = ctez2.get_oven_contract(owner, owner, oven_id)
+            self.measure('oven_deposit', ovens, liquidity_owners, oven.using(owner).deposit().with_amount(1_000))
+            self.measure('withdraw_from_oven', ovens, liquidity_owners, ctez2.withdraw_from_oven(oven_id, 1_000, owner))
+
+            # a new owner at every size, so that each deposit inserts its liquidity_owners entry
+            lp = Key.generate(export=False).public_key_hash()
+            ctez2 = ctez2.using(depositor)
+            deadline = self.get_future_timestamp()
+            self.measure('add_ctez_liquidity', ovens, liquidity_owners, ctez2.add_ctez_liquidity(lp, LIQUIDITY_DEPOSIT, 0, deadline))
+            self.measure('add_tez_liquidity', ovens, liquidity_owners, ctez2.add_tez_liquidity(lp, 0, deadline).with_amount(LIQUIDITY_DEPOSIT))
+            self.measure('tez_to_ctez', ovens, liquidity_owners, ctez2.tez_to_ctez(depositor, 0, deadline).with_amount(10_000))
+            self.measure('collect_from_ctez_liquidity', ovens, liquidity_owners, ctez2.collect_from_ctez_liquidity(depositor))
+            self.measure('remove_ctez_liquidity', ovens, liquidity_owners, ctez2.remove_ctez_liquidity(depositor, removed_shares, 0, 0, 0, deadline))
+
+        assert len(self.recorder.data) == len(sizes) * 9
@@ -6,7 +6,7 @@ class Fa12ApproveTestCase(Fa12BaseTestCase):
         owner, spender, fa12, *_ = self.default_setup()
 
         with self.raises_michelson_error(Fa12.Errors.DONT_SEND_TEZ):
-            fa12.using(owner).approve(spender, 10).with_amount(1).send()
+            self.dry_run(fa12.using(owner).approve(spender, 10).with_amount(1))
 
     def test_should_fail_if_unsafe_allowance_change(self) -> None:
         owner, spender, fa12, *_ = self.default_setup()
@@ -15,7 +15,7 @@ class Fa12ApproveTestCase(Fa12BaseTestCase):
         self.bake_block()
 
         with self.raises_michelson_error(Fa12.Errors.UNSAFE_ALLOWANCE_CHANGE):
-            fa12.using(owner).approve(spender, 10).send()
+            self.dry_run(fa12.using(owner).approve(spender, 10))
 
     def test_should_update_allowance_correctly(self) -> None:
         owner, spender, fa12, *_ = self.default_setup()
@@ -7,7 +7,7 @@ class Fa12GetBalanceTestCase(Fa12BaseTestCase):
         fa12_tester = self.deploy_fa12_tester(fa12, send_tez=True)
 
         with self.raises_michelson_error(Fa12.Errors.DONT_SEND_TEZ):
-            fa12_tester.call_get_balance(owner).send()
+            self.dry_run(fa12_tester.call_get_balance(owner))
 
     def test_should_execute_callback_entrypoint_correctly(self) -> None:
         owner, spender, fa12, *_ = self.default_setup(
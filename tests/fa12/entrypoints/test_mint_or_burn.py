@@ -6,7 +6,7 @@ class Fa12MintOrBurnTestCase(Fa12BaseTestCase):
         admin, target, fa12, *_ = self.default_setup()
 
         with self.raises_michelson_error(Fa12.Errors.DONT_SEND_TEZ):
-            fa12.using(admin).mintOrBurn(10, target).with_amount(1).send()
+            self.dry_run(fa12.using(admin).mintOrBurn(10, target).with_amount(1))
 
     def test_should_fail_if_sender_not_admin(self) -> None:
         _, target, fa12, *_ = self.default_setup(
@@ -14,7 +14,7 @@ class Fa12MintOrBurnTestCase(Fa12BaseTestCase):
         )
 
         with self.raises_michelson_error(Fa12.Errors.ONLY_ADMIN):
-            fa12.using(target).mintOrBurn(10, target).send()
+            self.dry_run(fa12.using(target).mintOrBurn(10, target))
 
     def test_should_fail_if_burn_amount_less_then_target_balance(self) -> None:
         admin, target, fa12, *_ = self.default_setup(
@@ -25,7 +25,7 @@ class Fa12MintOrBurnTestCase(Fa12BaseTestCase):
         )
 
         with self.raises_michelson_error(Fa12.Errors.CANNOT_BURN_MORE_THAN_THE_TARGETS_BALANCE):
-            fa12.using(admin).mintOrBurn(-11, target).send()
+            self.dry_run(fa12.using(admin).mintOrBurn(-11, target))
 
     def test_should_mint_correctly(self) -> None:
         mintAmount = 20
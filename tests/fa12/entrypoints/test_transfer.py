@@ -9,7 +9,7 @@ class Fa12TransferTestCase(Fa12BaseTestCase):
             }
         )
         with self.raises_michelson_error(Fa12.Errors.DONT_SEND_TEZ):
-            fa12.using(owner).transfer(owner, recipient, 10).with_amount(1).send()
+            self.dry_run(fa12.using(owner).transfer(owner, recipient, 10).with_amount(1))
 
     def test_should_fail_if_not_enough_balance(self) -> None:
         owner, recipient, fa12, *_ = self.default_setup(
@@ -18,7 +18,7 @@ class Fa12TransferTestCase(Fa12BaseTestCase):
             }
         )
         with self.raises_michelson_error(Fa12.Errors.NOT_ENOUGH_BALANCE):
-            fa12.using(owner).transfer(owner, recipient, 101).send()
+            self.dry_run(fa12.using(owner).transfer(owner, recipient, 101))
 
     def test_should_fail_if_sender_is_not_allowed(self) -> None:
         owner, recipient, fa12, *_ = self.default_setup(
@@ -27,7 +27,7 @@ class Fa12TransferTestCase(Fa12BaseTestCase):
             }
         )
         with self.raises_michelson_error(Fa12.Errors.NOT_ENOUGH_ALLOWANCE):
-            fa12.using(recipient).transfer(owner, recipient, 10).send()
+            self.dry_run(fa12.using(recipient).transfer(owner, recipient, 10))
 
     def test_should_fail_if_sender_has_not_enough_allowance(self) -> None:
         owner, recipient, fa12, *_ = self.default_setup(
@@ -39,7 +39,7 @@ class Fa12TransferTestCase(Fa12BaseTestCase):
             ]
         )
         with self.raises_michelson_error(Fa12.Errors.NOT_ENOUGH_ALLOWANCE):
-            fa12.using(recipient).transfer(owner, recipient, 51).send()
+            self.dry_run(fa12.using(recipient).transfer(owner, recipient, 51))
 
     def test_should_transfer_correctly_if_sender_is_owner(self) -> None:
         owner, recipient, fa12, *_ = self.default_setup(
@@ -0,0 +1,175 @@
+import asyncio
+from typing import Any, Callable, ClassVar, Generic, Optional, TypeVar, Union
+from pytezos import pytezos
+from pytezos.client import PyTezosClient
+from pytezos.contract.call import ContractCall
+from pytezos.operation.group import OperationGroup
+from pytezos.rpc.shell import ShellQuery
+
+from tests.helpers.addressable import Addressable
+from tests.helpers.contracts.contract import ContractHelper
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.contracts.oven.oven import Oven
+from tests.helpers.utility import PooledRpcNode
+
+T = TypeVar('T', bound=ContractHelper)
+R = TypeVar('R')
+
+
+class AsyncClient:
+    """Runs the blocking calls of a PyTezosClient in threads, at most max_concurrency
+    of them at once, so that a single event loop can follow many contracts and
+    accounts. Operations are sent with `send`, LocalChain.send for a LocalClient."""
+
+    def __init__(
+        self,
+        client: PyTezosClient,
+        max_concurrency: int = 16,
+        send: Optional[Callable[[Union[ContractCall, OperationGroup]], Any]] = None,
+    ):
+        self.client = client
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._send = send or (lambda operation: operation.send())
+
+    @classmethod
+    def connect(cls, rpc_url: str, key: Optional[str] = None, max_concurrency: int = 16) -> 'AsyncClient':
+        """Client of the node whose connections are kept alive, one per concurrent call"""
+        shell = ShellQuery(PooledRpcNode(rpc_url, max_concurrency))
+        return cls(pytezos.using(shell=shell, key=key), max_concurrency)
+
+    def using(self, client: PyTezosClient) -> 'AsyncClient':
+        """Client of another account sharing the concurrency limit"""
+        other = AsyncClient(client, send=self._send)
+        other.semaphore = self.semaphore
+        return other
+
+    async def run(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        async with self.semaphore:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def send(self, operation: Union[ContractCall, OperationGroup]) -> Any:
+        return await self.run(self._send, operation)
+
+    async def wait(self, opg: OperationGroup) -> None:
+        await self.run(self.client.wait, opg)
+
+    async def now(self) -> int:
+        return await self.run(self.client.now)
+
+    async def get_balance_mutez(self, address: str) -> int:
+        return int((await self.run(self.client.account, address))['balance'])
+
+
+class AsyncContractHelper(Generic[T]):
+    """Async counterpart of a ContractHelper. The methods in CALLS build calls or
+    decode values without the node and are the ones of the helper, the calls are
+    sent with `send`. The methods in READS request the node and are coroutines
+    running the method of the helper on the client. Any other method of the helper
+    is not available, so that a new getter can't block the event loop."""
+
+    READS: ClassVar[frozenset[str]] = frozenset()
+    CALLS: ClassVar[frozenset[str]] = frozenset()
+    helper_type: ClassVar[type]
+
+    def __init__(self, helper: T, client: AsyncClient):
+        self.helper = helper
+        self.client = client
+
+    @classmethod
+    async def from_address(cls, client: AsyncClient, address: str) -> Any:
+        helper = await client.run(cls.helper_type.from_address, client.client, address)
+        return cls(helper, client)
+
+    @property
+    def address(self) -> str:
+        return self.helper.address
+
+    async def using(self, client: AsyncClient) -> Any:
+        return type(self)(await client.run(self.helper.using, client.client), client)
+
+    async def send(self, call: Union[ContractCall, OperationGroup]) -> Any:
+        return await self.client.send(call)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self.CALLS:
+            return getattr(self.helper, name)
+        if name not in self.READS:
+            raise AttributeError(f'{type(self).__name__} has no read or call {name}')
+        attribute = getattr(self.helper, name)
+
+        async def read(*args: Any, **kwargs: Any) -> Any:
+            return await self.client.run(attribute, *args, **kwargs)
+
+        return read
+
+
+class AsyncOven(AsyncContractHelper[Oven]):
+    helper_type = Oven
+    READS = frozenset({'get_depositors', 'get_admin', 'get_handle'})
+    CALLS = frozenset({'deposit', 'oven_withdraw', 'oven_delegate', 'oven_edit_depositor'})
+
+
+class AsyncFa12(AsyncContractHelper[Fa12]):
+    helper_type = Fa12
+    READS = frozenset({'view_allowance', 'view_balance', 'view_total_supply'})
+    CALLS = frozenset({'transfer', 'approve', 'mintOrBurn'})
+
+
+class AsyncCtez2(AsyncContractHelper[Ctez2]):
+    helper_type = Ctez2
+    READS = frozenset({
+        'get_snapshot',
+        'get_storage',
+        'get_current_state',
+        'get_model_storage',
+        'get_context',
+        'get_ctez_fa12_address',
+        'get_sell_ctez_dex',
+        'get_sell_tez_dex',
+        'get_ctez_liquidity_owner',
+        'get_tez_liquidity_owner',
+        'get_oven',
+        'get_big_map_items',
+        'get_ovens_by_handles',
+        'get_ctez_liquidity_owners',
+        'get_tez_liquidity_owners',
+        'get_liquidity_owners',
+        'get_ovens_big_map_id',
+        'get_oven_code',
+        'get_oven_storage_type',
+        'get_ovens',
+        'get_last_event_id',
+        'get_target',
+    })
+    CALLS = frozenset({
+        'get_contract_at_block',
+        'get_ovens_big_map_type',
+        'decode_oven_handle',
+        'decode_oven',
+        'decode_event',
+        'set_ctez_fa12_address',
+        'create_oven',
+        'register_oven_deposit',
+        'withdraw_from_oven',
+        'mint_or_burn',
+        'liquidate_oven',
+        'add_ctez_liquidity',
+        'add_tez_liquidity',
+        'remove_ctez_liquidity',
+        'remove_tez_liquidity',
+        'collect_from_tez_liquidity',
+        'collect_from_ctez_liquidity',
+        'tez_to_ctez',
+        'ctez_to_tez',
+    })
+
+    async def pin(self, block_id: Union[str, int] = 'head') -> 'AsyncCtez2':
+        return AsyncCtez2(await self.client.run(self.helper.pin, block_id), self.client)
+
+    async def get_oven_contract(self, owner: Addressable, oven_id: int) -> AsyncOven:
+        oven = await self.client.run(self.helper.get_oven_contract, self.client.client, owner, oven_id)
+        return AsyncOven(oven, self.client)
+
+    async def get_ctez_token(self) -> AsyncFa12:
+        return await AsyncFa12.from_address(self.client, await self.get_ctez_fa12_address())
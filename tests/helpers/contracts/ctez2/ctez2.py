@@ -1,22 +1,36 @@
+from dataclasses import dataclass, field, replace
 from pytezos.client import PyTezosClient
 from pytezos.contract.call import ContractCall
+from pytezos.contract.interface import ContractInterface
+from pytezos.michelson.forge import forge_script_expr
+from pytezos.michelson.types.base import MichelsonType
+from pytezos.michelson.types.big_map import BigMapType
 from tests.helpers.addressable import Addressable, get_address
 from tests.helpers.contracts.contract import ContractHelper
 from tests.helpers.contracts.oven.oven import Oven
 from tests.helpers.metadata import Metadata
+from tests.helpers.model import ctez2 as ctez2_model
+from tests.helpers.model.oven import Handle
 from tests.helpers.utility import (
     NULL_ADDRESS,
+    get_big_map_values,
+    get_rpc_values,
     get_build_dir,
     originate_from_file,
 )
 from pytezos.operation.group import OperationGroup
 from os.path import join
 from math import floor
-from typing import NamedTuple, Optional
+from typing import Any, Iterable, NamedTuple, Optional, Union
 
+@dataclass
 class Ctez2(ContractHelper):
     FLOAT_DENOMINATOR = 2**64
 
+    # block hash the getters read at, the head when None
+    pinned_block: Optional[str] = None
+    snapshot: Optional['Ctez2.StorageSnapshot'] = field(default=None, init=False, repr=False, compare=False)
+
     class Errors:
         TEZ_IN_TRANSACTION_DISALLOWED = 'TEZ_IN_TRANSACTION_DISALLOWED'
         DEADLINE_HAS_PASSED = 'DEADLINE_HAS_PASSED'
@@ -64,6 +78,25 @@ class Ctez2(ContractHelper):
         address: str
         fee_index: int
 
+    class StorageSnapshot(NamedTuple):
+        block_hash: str
+        storage: dict
+        # result of the get_current_state view, computed on first use
+        current_state: Optional[dict] = None
+
+    class RemoveLiquidityEvent(NamedTuple):
+        id: int
+        self_redeemed: int
+        proceeds_redeemed: int
+        subsidy_redeemed: int
+        is_sell_ctez_dex: bool
+
+    class CollectFromLiquidityEvent(NamedTuple):
+        id: int
+        proceeds_redeemed: int
+        subsidy_redeemed: int
+        is_sell_ctez_dex: bool
+
     @classmethod
     def originate(
         self,
@@ -106,37 +139,202 @@ class Ctez2(ContractHelper):
 
         return originate_from_file(filename, client, storage)
 
+    def pin(self, block_id: Union[str, int] = 'head') -> 'Ctez2':
+        """Copy of the helper whose getters all read the given block, so that several
+        fields are read from the same state while new blocks come"""
+        return replace(self, pinned_block=self.client.shell.blocks[block_id].hash())
+
+    def get_contract_at_block(self) -> ContractInterface:
+        return self.contract if self.pinned_block is None else self.contract.using(block_id=self.pinned_block)
+
+    def get_snapshot(self) -> Optional[StorageSnapshot]:
+        """Storage of the pinned block, or of the head, fetched and decoded once per
+        block hash and shared by the getters. None without a node behind the client
+        (LocalClient), as its storage changes without new blocks"""
+        if self.client.shell is None:
+            return None
+        block_hash = self.pinned_block or self.client.shell.head.hash()
+        if self.snapshot is None or self.snapshot.block_hash != block_hash:
+            storage = self.contract.using(block_id=block_hash).storage()
+            self.snapshot = Ctez2.StorageSnapshot(block_hash, storage)
+        return self.snapshot
+
+    def get_storage(self) -> dict:
+        snapshot = self.get_snapshot()
+        return self.contract.storage() if snapshot is None else snapshot.storage
+
+    def get_current_state(self) -> dict:
+        """Storage with the housekeeping of the next block applied, shared like the storage"""
+        snapshot = self.get_snapshot()
+        if snapshot is None:
+            return self.contract.get_current_state().run_view()
+        if snapshot.current_state is None:
+            current_state = self.contract.using(block_id=snapshot.block_hash).get_current_state().run_view()
+            self.snapshot = snapshot = snapshot._replace(current_state=current_state)
+        return snapshot.current_state
+
+    def get_model_storage(self, ovens: Iterable[tuple[int, Addressable]] = ()) -> ctez2_model.Storage:
+        """Storage shared like the storage, in the Python model. The views of the model
+        (ctez2_model.VIEWS) give the results of the contract views for a chosen time
+        and fa12 total supply without a node. Only the given ovens are read"""
+        found = self.get_ovens_by_handles(ovens) if ovens else {}
+        return ctez2_model.Storage.from_contract_storage(self.get_storage(), {
+            Handle(*handle): ctez2_model.OvenInfo(*oven) for handle, oven in found.items() if oven is not None
+        })
+
     def get_context(self) -> Context:
-        context = self.contract.storage()['context']
+        context = self.get_storage()['context']
         return Ctez2.Context(context['target'], context['drift'], context['_Q'], context['ctez_fa12_address'])
 
     def get_ctez_fa12_address(self) -> str:
         return self.get_context().ctez_fa12_address
     
     def get_sell_ctez_dex(self) -> HalfDex:
-        return Ctez2.HalfDex(**self.contract.storage()['sell_ctez']) 
+        return Ctez2.HalfDex(**self.get_storage()['sell_ctez']) 
     
     def get_sell_tez_dex(self) -> HalfDex:
-        return Ctez2.HalfDex(**self.contract.storage()['sell_tez']) 
+        return Ctez2.HalfDex(**self.get_storage()['sell_tez']) 
     
     def get_ctez_liquidity_owner(self, owner: Addressable) -> LiquidityOwner:
         owner_address = get_address(owner)
-        return Ctez2.LiquidityOwner(**self.contract.storage['sell_ctez']['liquidity_owners'][owner_address]())
+        return Ctez2.LiquidityOwner(**self.get_contract_at_block().storage['sell_ctez']['liquidity_owners'][owner_address]())
     
     def get_tez_liquidity_owner(self, owner: Addressable) -> LiquidityOwner:
         owner_address = get_address(owner)
-        return Ctez2.LiquidityOwner(**self.contract.storage['sell_tez']['liquidity_owners'][owner_address]())
+        return Ctez2.LiquidityOwner(**self.get_contract_at_block().storage['sell_tez']['liquidity_owners'][owner_address]())
     
     def get_oven(self, owner: Addressable, oven_id: int) -> OvenInfo:
-        return Ctez2.OvenInfo(**self.contract.storage['ovens'][(oven_id, get_address(owner))]())
+        return Ctez2.OvenInfo(**self.get_contract_at_block().storage['ovens'][(oven_id, get_address(owner))]())
     
+    def get_big_map_items(self, path: tuple[str, ...], keys: list[Any], workers: int) -> list[Optional[Any]]:
+        """Python values of the keys of the big_map at the path of the storage, in
+        order and None for the missing ones. From a node they are fetched concurrently."""
+        big_map = self.get_contract_at_block().storage
+        for name in path:
+            big_map = big_map[name]
+        key_type, value_type = type(big_map.data).args
+        michelson_keys = [key_type.from_python_object(key) for key in keys]
+        if self.client.shell is None:
+            values = [big_map.data.get(key, dup=False) for key in michelson_keys]
+            return [value.to_python_object() if value is not None else None for value in values]
+
+        key_hashes = [forge_script_expr(key.pack(legacy=True)) for key in michelson_keys]
+        block_hash = self.pinned_block or self.client.shell.head.hash()
+        values = get_big_map_values(self.client, big_map.data.ptr, key_hashes, block_hash, workers)
+        return [
+            value_type.from_micheline_value(values[key_hash]).to_python_object() if values[key_hash] is not None else None
+            for key_hash in key_hashes
+        ]
+
+    def get_ovens_by_handles(
+        self,
+        handles: Iterable[tuple[int, Addressable]],
+        workers: int = 16,
+    ) -> dict[tuple[int, str], Optional[OvenInfo]]:
+        """Same as get_oven for many ovens at once, None for the ovens that don't exist"""
+        handles = [(oven_id, get_address(owner)) for oven_id, owner in handles]
+        values = self.get_big_map_items(('ovens',), handles, workers)
+        return {handle: Ctez2.OvenInfo(**value) if value is not None else None for handle, value in zip(handles, values)}
+
+    def get_ctez_liquidity_owners(self, owners: Iterable[Addressable], workers: int = 16) -> dict[str, Optional[LiquidityOwner]]:
+        return self.get_liquidity_owners('sell_ctez', owners, workers)
+
+    def get_tez_liquidity_owners(self, owners: Iterable[Addressable], workers: int = 16) -> dict[str, Optional[LiquidityOwner]]:
+        return self.get_liquidity_owners('sell_tez', owners, workers)
+
+    def get_liquidity_owners(self, dex: str, owners: Iterable[Addressable], workers: int) -> dict[str, Optional[LiquidityOwner]]:
+        addresses = [get_address(owner) for owner in owners]
+        values = self.get_big_map_items((dex, 'liquidity_owners'), addresses, workers)
+        return {address: Ctez2.LiquidityOwner(**value) if value is not None else None for address, value in zip(addresses, values)}
+
+    def get_ovens_big_map_id(self) -> int:
+        return self.get_storage()['ovens']
+
+    def get_ovens_big_map_type(self) -> type[BigMapType]:
+        """Type of the ovens big_map, taken from the code so that decoding doesn't
+        read the storage"""
+        def find_ovens_type(ty: type) -> Optional[type]:
+            if getattr(ty, 'field_name', None) == 'ovens':
+                return ty
+            for arg in getattr(ty, 'args', []):
+                ovens_type = find_ovens_type(arg) if isinstance(arg, type) else None
+                if ovens_type is not None:
+                    return ovens_type
+            return None
+
+        return find_ovens_type(self.contract.program.storage)
+
+    def decode_oven_handle(self, key: dict) -> tuple[int, str]:
+        key_type, _ = self.get_ovens_big_map_type().args
+        handle = key_type.from_micheline_value(key).to_python_object()
+        return (handle['id'], handle['owner'])
+
+    def decode_oven(self, value: dict) -> OvenInfo:
+        _, value_type = self.get_ovens_big_map_type().args
+        return Ctez2.OvenInfo(**value_type.from_micheline_value(value).to_python_object())
+
+    def get_oven_code(self) -> list:
+        """Code of the contract originated by create_oven"""
+        def find_oven_code(expr: Any) -> Optional[list]:
+            if isinstance(expr, dict):
+                if expr.get('prim') == 'CREATE_CONTRACT':
+                    return expr['args'][0]
+                expr = expr.get('args', [])
+            if isinstance(expr, list):
+                for item in expr:
+                    code = find_oven_code(item)
+                    if code is not None:
+                        return code
+            return None
+
+        return find_oven_code(self.contract.context.get_code_expr())
+
+    def get_oven_storage_type(self) -> type[MichelsonType]:
+        """Storage type of the ovens, the one of the contract originated by create_oven"""
+        return MichelsonType.match(next(section['args'][0] for section in self.get_oven_code() if section['prim'] == 'storage'))
+
+    def get_ovens(self, block_id: str = 'head', page_size: int = 1000, workers: int = 16) -> dict[tuple[int, str], OvenInfo]:
+        """Reads the whole ovens big_map at the block. The RPC only lists the values,
+        so the handles are taken from the storages of the oven contracts, read
+        concurrently at the same block"""
+        block_hash = self.client.shell.blocks[block_id].hash()
+        big_map = self.client.shell.blocks[block_hash].context.big_maps[self.get_ovens_big_map_id()]
+        ovens = []
+        offset = 0
+        while True:
+            values = big_map(offset=offset, length=page_size)
+            ovens.extend(self.decode_oven(value) for value in values)
+            if len(values) < page_size:
+                break
+            offset += page_size
+
+        storage_type = self.get_oven_storage_type()
+        paths = [f'chains/main/blocks/{block_hash}/context/contracts/{oven.address}/storage' for oven in ovens]
+        handles = [storage_type.from_micheline_value(storage).to_python_object()['handle'] for storage in get_rpc_values(self.client, paths, workers)]
+        return {(handle['id'], handle['owner']): oven for handle, oven in zip(handles, ovens)}
+
+    def get_last_event_id(self, block_id: Union[str, int] = 'head') -> int:
+        return self.contract.using(block_id=block_id).storage['last_event_id']()
+
+    @staticmethod
+    def decode_event(event: dict) -> Optional[Union[RemoveLiquidityEvent, CollectFromLiquidityEvent]]:
+        """Decodes an event internal operation result, None for unknown tags"""
+        event_types = {
+            'remove_liquidity': Ctez2.RemoveLiquidityEvent,
+            'collect_from_liquidity': Ctez2.CollectFromLiquidityEvent,
+        }
+        event_type = event_types.get(event.get('tag'))
+        if event_type is None:
+            return None
+        payload = MichelsonType.match(event['type']).from_micheline_value(event['payload']).to_python_object()
+        return event_type(**payload)
+
     def get_oven_contract(self, client: PyTezosClient, owner: Addressable, oven_id: int) -> Oven:
         oven_record = self.get_oven(owner, oven_id)
         return Oven.from_address(client, oven_record.address)
     
     def get_target(self) -> int:
-        storage = self.contract.get_current_state().run_view()
-        return storage['context']['target']
+        return self.get_current_state()['context']['target']
 
     def set_ctez_fa12_address(self, address : Addressable) -> ContractCall:
         return self.contract.set_ctez_fa12_address(get_address(address))
@@ -22,6 +22,10 @@ class Oven(ContractHelper):
     def get_admin(self) -> str:
         return self.contract.storage()['admin']
 
+    def get_handle(self) -> tuple[int, str]:
+        handle = self.contract.storage()['handle']
+        return (handle['id'], handle['owner'])
+
     def deposit(self) -> ContractCall:
         return self.contract.default()
 
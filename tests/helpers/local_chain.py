@@ -0,0 +1,405 @@
+import json
+from typing import Any, NamedTuple, Optional, Union
+
+from pytezos.client import PyTezosClient
+from pytezos.context.abstract import AbstractContext, get_originated_address
+from pytezos.context.impl import ExecutionContext
+from pytezos.contract.call import ContractCall
+from pytezos.contract.data import ContractData
+from pytezos.contract.interface import ContractInterface
+from pytezos.contract.view import ContractView, ContractViewCall
+from pytezos.crypto.key import Key
+from pytezos.michelson.instructions.arithmetic import SubMutezInstruction
+from pytezos.michelson.instructions.base import format_stdout
+from pytezos.michelson.micheline import MichelsonRuntimeError
+from pytezos.michelson.program import MichelsonProgram
+from pytezos.michelson.stack import MichelsonStack
+from pytezos.michelson.types.base import MichelsonType
+from pytezos.michelson.types.big_map import BigMapType
+from pytezos.michelson.types.domain import MutezType
+from pytezos.michelson.types.option import OptionType
+from pytezos.operation.group import OperationGroup
+from pytezos.rpc import RpcError
+
+GENESIS_TIMESTAMP = 1_700_000_000
+CHAIN_ID = 'NetXdQprcVkpaWU'
+
+
+def _update_big_map(
+    self: BigMapType,
+    key: MichelsonType,
+    val: Optional[MichelsonType],
+) -> tuple[Optional[MichelsonType], BigMapType]:
+    """BigMapType.update of pytezos drops the new value of a key that is only in the
+    big_map storage and not yet in the diff, which is always the case on a chain"""
+    prev_val = self.get(key, dup=False)
+    items = [(k, v) for k, v in self.items if k != key]
+    removed_keys = [k for k in self.removed_keys if k != key]
+    if val is not None:
+        items = sorted(items + [(key, val)], key=lambda x: x[0])
+    elif prev_val is not None:
+        removed_keys.append(key)
+    res = type(self)(items=items, ptr=self.ptr, removed_keys=removed_keys)
+    res.context = self.context
+    return prev_val, res
+
+
+def _execute_sub_mutez(cls: type, stack: MichelsonStack, stdout: list[str], context: AbstractContext) -> SubMutezInstruction:
+    """SUB_MUTEZ of pytezos fails on a negative result instead of returning None"""
+    a, b = stack.pop2()
+    a.assert_type_equal(MutezType)
+    b.assert_type_equal(MutezType)
+    res = OptionType.from_some(MutezType.from_value(int(a) - int(b))) if int(a) >= int(b) else OptionType.none(MutezType)
+    stack.push(res)
+    stdout.append(format_stdout(cls.prim, [a, b], [res]))
+    return cls(stack_items_added=1)
+
+
+def _use_chain_semantics(ty: type) -> None:
+    """Sets _update_big_map on the big_map types and _execute_sub_mutez on the SUB_MUTEZ
+    instructions within the type. pytezos creates new types for every parsed program,
+    so the other programs keep the original methods"""
+    if issubclass(ty, BigMapType):
+        ty.update = _update_big_map  # type: ignore
+    if issubclass(ty, SubMutezInstruction):
+        ty.execute = classmethod(_execute_sub_mutez)  # type: ignore
+    for arg in getattr(ty, 'args', []):
+        if isinstance(arg, type):
+            _use_chain_semantics(arg)
+
+
+class LocalContract(NamedTuple):
+    program: type
+    code: list
+    # big_maps are kept by id in LocalChain.big_maps, like on a node
+    storage: Any
+    delegate: Optional[str] = None
+
+
+class LocalContext(ExecutionContext):
+    """Execution context of a call on a LocalChain, big_map values, views and
+    originated addresses come from the chain"""
+
+    def __init__(self, chain: 'LocalChain', **kwargs: Any):
+        super().__init__(chain_id=CHAIN_ID, now=chain.now, level=chain.level, **kwargs)
+        self.chain = chain
+        self.alloc_big_map_index = chain.next_big_map_id
+        self.originated_addresses: list[str] = []
+
+    def get_big_map_value(self, ptr: int, key_hash: str) -> Optional[dict]:
+        if ptr not in self.big_maps:
+            return None
+        src_ptr, _ = self.big_maps[ptr]
+        if src_ptr < 0:
+            return None
+        item = self.chain.big_maps[src_ptr].get(key_hash)
+        return item[1] if item is not None else None
+
+    def get_view_result(self, name: str, address: Optional[str] = None) -> Optional[Any]:
+        # pytezos doesn't pass the view input here, so only views taking unit are routed
+        if address is None or address not in self.chain.contracts:
+            return None
+        return self.chain.run_view(address, name)
+
+    def get_originated_address(self) -> str:
+        address = get_originated_address(self.chain.origination_index)
+        self.chain.origination_index += 1
+        self.originated_addresses.append(address)
+        return address
+
+
+class LocalViewCall(ContractViewCall):
+    def run_view(self, *args: Any, **kwargs: Any) -> Any:
+        return self.context.chain.run_view(self.address, self.name, self.param_expr)
+
+
+class LocalContractView(ContractView):
+    def __call__(self, *args: Any, **kwargs: Any) -> LocalViewCall:
+        call = super().__call__(*args, **kwargs)
+        return LocalViewCall(
+            context=self.context,
+            param_expr=call.param_expr,
+            param_ty_expr=call.param_ty_expr,
+            return_ty_expr=call.return_ty_expr,
+            code_expr=call.code_expr,
+            name=call.name,
+        )
+
+
+class LocalContractInterface(ContractInterface):
+    """ContractInterface of a contract of a LocalChain, the storage is read from the
+    chain at every access and the views are run by the chain"""
+
+    def __init__(self, context: LocalContext):
+        super().__init__(context)
+        for name, view in self.views.items():
+            setattr(self, name, LocalContractView(
+                context=context,
+                name=name,
+                parameter=view.args[1].as_micheline_expr(),
+                return_type=view.args[2].as_micheline_expr(),
+                code=view.args[3].as_micheline_expr(),
+            ))
+
+    @property
+    def storage(self) -> ContractData:
+        storage = self.program.storage.from_micheline_value(self.context.chain.contracts[self.address].storage)
+        storage.attach_context(self.context)
+        return ContractData(self.context, storage.item, title='storage')
+
+
+class LocalClient(PyTezosClient):
+    """Client of a LocalChain, it builds the same calls as a client of a node
+    and the contract helpers take it in place of one"""
+
+    def __init__(self, chain: 'LocalChain', key: Key):
+        super().__init__(context=ExecutionContext(key=key))
+        self.chain = chain
+
+    @property
+    def shell(self) -> None:
+        # there is no node behind, whatever would query one fails
+        return None
+
+    def using(self, key: Optional[Key] = None, **kwargs: Any) -> 'LocalClient':
+        return LocalClient(self.chain, key or self.key)
+
+    def contract(self, address: str) -> ContractInterface:
+        return self.chain.get_interface(address, self.key)
+
+    def account(self, account_id: Optional[str] = None) -> dict:
+        address = account_id or self.key.public_key_hash()
+        return {'balance': str(self.chain.balances.get(address, 0))}
+
+    def now(self) -> int:
+        return self.chain.now
+
+
+class LocalChain:
+    """Contracts, big_maps and balances kept in memory, the calls are run by the
+    pytezos interpreter instead of a node.
+
+    An operation group is applied as soon as it is sent, with its internal operations
+    in depth-first order, and is reverted as a whole when one of them fails. A failure
+    raises the RpcError a node would return, so raises_michelson_error works the same.
+    There are no fees, and baking a block only moves the clock."""
+
+    # parsed programs by code, shared by the chains as parsing ctez2 takes a while
+    programs: dict[str, type] = {}
+
+    def __init__(self, now: int = GENESIS_TIMESTAMP):
+        self.now = now
+        self.level = 1
+        self.balances: dict[str, int] = {}
+        self.contracts: dict[str, LocalContract] = {}
+        # key_hash -> (key, value) of every big_map id
+        self.big_maps: dict[int, dict[str, tuple[dict, dict]]] = {}
+        self.next_big_map_id = 0
+        self.origination_index = 1
+
+    def bake_block(self, seconds: int = 1) -> None:
+        self.now += seconds
+        self.level += 1
+
+    def client(self, key: Optional[Key] = None, balance: int = 0) -> LocalClient:
+        """Client of a new account, or of the given key, credited with balance"""
+        client = LocalClient(self, key or Key.generate(export=False))
+        address = client.key.public_key_hash()
+        self.balances[address] = self.balances.get(address, 0) + balance
+        return client
+
+    def get_interface(self, address: str, key: Optional[Key] = None) -> LocalContractInterface:
+        contract = self.contracts[address]
+        context = LocalContext(self, key=key, address=address, script={'code': contract.code})
+        cls = type(ContractInterface.__name__, (LocalContractInterface,), {'program': contract.program})
+        return cls(context)
+
+    def get_program(self, code: list) -> type:
+        key = json.dumps(code, sort_keys=True)
+        if key not in self.programs:
+            program = MichelsonProgram.match(code)
+            for section in [program.parameter, program.storage, program.code, *program.views]:
+                _use_chain_semantics(section)
+            self.programs[key] = program
+        return self.programs[key]
+
+    def send(self, operation: Union[ContractCall, OperationGroup]) -> list[dict]:
+        """Applies the operation group and returns its operations followed by their
+        internal operations in execution order. Originations get the address of the
+        new contract as originated_contract."""
+        state = self._save()
+        try:
+            return self._apply_group(operation)
+        except Exception:
+            self._restore(state)
+            raise
+
+    def run(self, operation: Union[ContractCall, OperationGroup]) -> list[dict]:
+        """Like send, but the chain is left as it was, even if the operation succeeds"""
+        state = self._save()
+        try:
+            return self._apply_group(operation)
+        finally:
+            self._restore(state)
+
+    def _save(self) -> tuple:
+        return (
+            dict(self.balances),
+            dict(self.contracts),
+            {ptr: dict(items) for ptr, items in self.big_maps.items()},
+            self.next_big_map_id,
+            self.origination_index,
+        )
+
+    def _restore(self, state: tuple) -> None:
+        self.balances, self.contracts, self.big_maps, self.next_big_map_id, self.origination_index = state
+
+    def _apply_group(self, operation: Union[ContractCall, OperationGroup]) -> list[dict]:
+        opg = operation.as_transaction() if isinstance(operation, ContractCall) else operation
+        source = opg.key.public_key_hash()
+        return self._apply([{**content, 'source': source} for content in opg.contents if content['kind'] != 'reveal'], source)
+
+    def _apply(self, operations: list[dict], source: str) -> list[dict]:
+        applied = []
+        pending = list(reversed(operations))
+        while pending:
+            op = pending.pop()
+            emitted = self._apply_operation(op, source)
+            applied.append(op)
+            pending.extend(reversed(emitted))
+        return applied
+
+    def _debit(self, address: str, amount: int) -> None:
+        balance = self.balances.get(address, 0)
+        if balance < amount:
+            raise RpcError.from_errors([{
+                'kind': 'temporary',
+                'id': 'proto.contract.balance_too_low',
+                'contract': address,
+                'balance': str(balance),
+                'amount': str(amount),
+            }])
+        self.balances[address] = balance - amount
+
+    def _apply_operation(self, op: dict, source: str) -> list[dict]:
+        kind = op['kind']
+        if kind == 'transaction':
+            amount = int(op['amount'])
+            self._debit(op['source'], amount)
+            self.balances[op['destination']] = self.balances.get(op['destination'], 0) + amount
+            if op['destination'] not in self.contracts:
+                return []
+            parameters = op.get('parameters', {'entrypoint': 'default', 'value': {'prim': 'Unit'}})
+            return self._execute(op['destination'], parameters, amount, op['source'], source)
+        if kind == 'origination':
+            address = op.get('originated_contract') or get_originated_address(self.origination_index)
+            if 'originated_contract' not in op:
+                self.origination_index += 1
+                op['originated_contract'] = address
+            balance = int(op['balance'])
+            self._debit(op['source'], balance)
+            program = self.get_program(op['script']['code'])
+            context = LocalContext(self, address=address)
+            storage = program.storage.from_micheline_value(op['script']['storage'])
+            storage.attach_context(context)
+            lazy_diff: list[dict] = []
+            storage_expr = storage.item.aggregate_lazy_diff(lazy_diff).to_micheline_value()
+            self._apply_lazy_diff(lazy_diff, context)
+            self.contracts[address] = LocalContract(program, op['script']['code'], storage_expr, op.get('delegate'))
+            self.balances[address] = self.balances.get(address, 0) + balance
+            return []
+        if kind == 'delegation':
+            if op['source'] in self.contracts:
+                self.contracts[op['source']] = self.contracts[op['source']]._replace(delegate=op['delegate'])
+            return []
+        if kind == 'event':
+            return []
+        raise ValueError(f'Unsupported operation kind: {kind}')
+
+    def _apply_lazy_diff(self, lazy_diff: list[dict], context: LocalContext) -> None:
+        """Writes the big_map updates made during a call to the chain"""
+        self.next_big_map_id = max(self.next_big_map_id, context.alloc_big_map_index)
+        for item in lazy_diff:
+            if item['kind'] != 'big_map':
+                continue
+            ptr, diff = int(item['id']), item['diff']
+            if diff['action'] == 'alloc':
+                self.big_maps[ptr] = {}
+            elif diff['action'] != 'update':
+                raise ValueError(f'Unsupported big_map action: {diff["action"]}')
+            for update in diff.get('updates', []):
+                if 'value' in update:
+                    self.big_maps[ptr][update['key_hash']] = (update['key'], update['value'])
+                else:
+                    self.big_maps[ptr].pop(update['key_hash'], None)
+
+    def _execute(self, address: str, parameters: dict, amount: int, sender: str, source: str) -> list[dict]:
+        contract = self.contracts[address]
+        context = LocalContext(
+            self,
+            amount=amount,
+            sender=sender,
+            source=source,
+            balance=self.balances[address],
+            address=address,
+            script={'code': contract.code},
+        )
+        stack: MichelsonStack = MichelsonStack()
+        stdout: list[str] = []
+        try:
+            program = contract.program.instantiate(
+                entrypoint=parameters['entrypoint'],
+                parameter=parameters['value'],
+                storage=contract.storage,
+            )
+            program.begin(stack, stdout, context)
+            program.execute(stack, stdout, context)
+            operations, storage, lazy_diff, _ = program.end(stack, stdout)
+        except MichelsonRuntimeError as e:
+            raise self._to_rpc_error(e, address) from e
+        self._apply_lazy_diff(lazy_diff, context)
+        self.contracts[address] = contract._replace(storage=storage)
+        originated = iter(context.originated_addresses)
+        for op in operations:
+            if op['kind'] == 'origination':
+                op['originated_contract'] = next(originated)
+        return operations
+
+    def run_view(self, address: str, name: str, parameter: Optional[dict] = None) -> Any:
+        """Runs an on-chain view of the contract on the current state and returns the
+        result as a Python object"""
+        contract = self.contracts[address]
+        context = LocalContext(self, address=address, balance=self.balances[address], script={'code': contract.code})
+        stack: MichelsonStack = MichelsonStack()
+        stdout: list[str] = []
+        try:
+            program = contract.program.instantiate_view(name, parameter or {'prim': 'Unit'}, contract.storage)
+            program.begin(stack, stdout, context)
+            program.execute_view(stack, stdout, context)
+            return program.ret(stack, stdout).to_python_object()
+        except MichelsonRuntimeError as e:
+            raise self._to_rpc_error(e, address) from e
+
+    @staticmethod
+    def _to_rpc_error(e: MichelsonRuntimeError, address: str) -> RpcError:
+        """The error of the node, the value of a FAILWITH is only kept as text by pytezos"""
+        if len(e.args) >= 2 and e.args[-2] == 'FAILWITH':
+            value = e.args[-1]
+            if value.startswith("'") and value.endswith("'"):
+                failed_with = {'string': value[1:-1]}
+            elif value.lstrip('-').isdigit():
+                failed_with = {'int': value}
+            else:
+                failed_with = {'string': value}
+            return RpcError.from_errors([{
+                'kind': 'temporary',
+                'id': 'proto.michelson_v1.script_rejected',
+                'contract_handle': address,
+                'with': failed_with,
+            }])
+        return RpcError.from_errors([{
+            'kind': 'temporary',
+            'id': 'proto.michelson_v1.runtime_error',
+            'contract_handle': address,
+            'message': e.format_stdout(),
+        }])
@@ -0,0 +1,24 @@
+from typing import NamedTuple
+
+from tests.helpers.model.tezos import Transaction
+
+
+class Context(NamedTuple):
+    target: int
+    drift: int
+    Q: int
+    ctez_fa12_address: str
+
+
+class Fa12Transfer(NamedTuple):
+    address_from: str
+    address_to: str
+    value: int
+
+
+def transfer_xtz(to_: str, amount: int) -> Transaction:
+    return Transaction(to_, 'default', None, amount)
+
+
+def transfer_ctez(ctxt: Context, from_: str, to_: str, value: int) -> Transaction:
+    return Transaction(ctxt.ctez_fa12_address, 'transfer', Fa12Transfer(from_, to_, value))
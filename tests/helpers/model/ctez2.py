@@ -0,0 +1,484 @@
+from typing import NamedTuple, Optional
+
+from tests.helpers.model import errors
+from tests.helpers.model import half_dex
+from tests.helpers.model import oven as oven_model
+from tests.helpers.model.context import Context, transfer_ctez, transfer_xtz
+from tests.helpers.model.fa12 import MintOrBurn
+from tests.helpers.model.half_dex import Environment, HalfDex
+from tests.helpers.model.oven import Handle, RegisterDeposit
+from tests.helpers.model.stdctez import (
+    Float64,
+    assert_no_tez_in_transaction,
+    assert_with_error,
+    ceil_div,
+    clamp_nat,
+    failwith,
+    subtract_nat,
+)
+from tests.helpers.model.tezos import (
+    NULL_ADDRESS,
+    Call,
+    Event,
+    Origination,
+    Transaction,
+)
+
+
+class OvenInfo(NamedTuple):
+    tez_balance: int
+    ctez_outstanding: int
+    address: str
+    fee_index: int
+
+
+class Storage(NamedTuple):
+    ovens: dict[Handle, OvenInfo]
+    last_update: int
+    sell_ctez: HalfDex
+    sell_tez: HalfDex
+    context: Context
+    last_event_id: int
+    originator: str
+
+    @classmethod
+    def initial(
+        cls,
+        last_update: int,
+        originator: str,
+        target: int = Float64.ONE,
+        ctez_fa12_address: str = NULL_ADDRESS,
+    ) -> 'Storage':
+        """Mirrors the storage originated by Ctez2.originate"""
+        return cls(
+            ovens={},
+            last_update=last_update,
+            sell_ctez=HalfDex.empty(),
+            sell_tez=HalfDex.empty(),
+            context=Context(target, 0, 1, ctez_fa12_address),
+            last_event_id=0,
+            originator=originator,
+        )
+
+    @classmethod
+    def from_contract_storage(cls, storage: dict, ovens: Optional[dict[Handle, OvenInfo]] = None) -> 'Storage':
+        """Converts the ctez2 storage read by pytezos, the ovens big_map only holds the
+        given ovens and the liquidity owners are left out"""
+        context = storage['context']
+        return cls(
+            ovens=dict(ovens or {}),
+            last_update=storage['last_update'],
+            sell_ctez=HalfDex(**{**storage['sell_ctez'], 'liquidity_owners': {}}),
+            sell_tez=HalfDex(**{**storage['sell_tez'], 'liquidity_owners': {}}),
+            context=Context(context['target'], context['drift'], context['_Q'], context['ctez_fa12_address']),
+            last_event_id=storage['last_event_id'],
+            originator=storage['originator'],
+        )
+
+
+class CreateOven(NamedTuple):
+    id: int
+    delegate: Optional[str]
+    depositors: oven_model.Depositors
+
+
+class Withdraw(NamedTuple):
+    id: int
+    amount: int
+    to_: str
+
+
+class Liquidate(NamedTuple):
+    handle: Handle
+    quantity: int
+    to_: str
+
+
+class MintOrBurnCtez(NamedTuple):
+    id: int
+    quantity: int
+
+
+class AddTezLiquidity(NamedTuple):
+    owner: str
+    min_liquidity: int
+    deadline: int
+
+
+class AddCtezLiquidity(NamedTuple):
+    owner: str
+    amount_deposited: int
+    min_liquidity: int
+    deadline: int
+
+
+class TezToCtez(NamedTuple):
+    to_: str
+    min_ctez_bought: int
+    deadline: int
+
+
+class CtezToTez(NamedTuple):
+    to_: str
+    ctez_sold: int
+    min_tez_bought: int
+    deadline: int
+
+
+class RemoveLiquidityEvent(NamedTuple):
+    id: int
+    self_redeemed: int
+    proceeds_redeemed: int
+    subsidy_redeemed: int
+    is_sell_ctez_dex: bool
+
+
+class CollectFromLiquidityEvent(NamedTuple):
+    id: int
+    proceeds_redeemed: int
+    subsidy_redeemed: int
+    is_sell_ctez_dex: bool
+
+
+class HalfDexState(NamedTuple):
+    total_liquidity_shares: int
+    self_reserves: int
+    proceeds_debts: int
+    proceeds_reserves: int
+    subsidy_debts: int
+    subsidy_reserves: int
+    fee_index: int
+
+
+class CurrentState(NamedTuple):
+    last_update: int
+    context: Context
+    sell_ctez: HalfDexState
+    sell_tez: HalfDexState
+
+
+class CalcTokensToSell(NamedTuple):
+    is_sell_ctez_dex: bool
+    proceeds_amount: int
+
+
+Result = tuple[list, Storage]
+
+
+# Functions
+
+def get_oven(handle: Handle, s: Storage) -> OvenInfo:
+    oven = s.ovens.get(handle)
+    if oven is None:
+        failwith(errors.OVEN_NOT_EXISTS)
+    return apply_fee_index(oven, s.sell_ctez.fee_index * s.sell_tez.fee_index)
+
+
+def apply_fee_index(oven: OvenInfo, fee_index: int) -> OvenInfo:
+    """The fee index adjustment of get_oven, fee_index is the product of the dex fee indexes"""
+    prev_ctez_outstanding = oven.ctez_outstanding
+    prev_fee_index = oven.fee_index
+    ctez_outstanding = (prev_ctez_outstanding * fee_index) // prev_fee_index
+    if prev_ctez_outstanding > 0:
+        fee_index = ceil_div(ctez_outstanding * prev_fee_index, prev_ctez_outstanding)
+    return oven._replace(fee_index=fee_index, ctez_outstanding=ctez_outstanding)
+
+
+def is_under_collateralized(oven: OvenInfo, target: int) -> bool:
+    return 15 * oven.tez_balance < 16 * Float64.mul(oven.ctez_outstanding, target)
+
+
+# Environments
+
+sell_tez_env = Environment(
+    transfer_self=lambda c, call, r, a: transfer_xtz(r, a),
+    transfer_proceeds=lambda c, call, r, a: transfer_ctez(c, call.self_address, r, a),
+    get_target_self_reserves=lambda c: max(Float64.mul(c.Q, c.target), 1),
+    div_by_target=lambda c, amt: Float64.mul(amt, c.target),
+)
+
+sell_ctez_env = Environment(
+    transfer_self=lambda c, call, r, a: transfer_ctez(c, call.self_address, r, a),
+    transfer_proceeds=lambda c, call, r, a: transfer_xtz(r, a),
+    get_target_self_reserves=lambda c: c.Q,
+    div_by_target=lambda c, amt: Float64.div(amt, c.target),
+)
+
+
+# housekeeping
+
+def drift_adjustment(delta: int, s: Storage) -> int:
+    ctxt = s.context
+    Qt = sell_tez_env.get_target_self_reserves(ctxt)
+    qc = min(s.sell_ctez.self_reserves, ctxt.Q)
+    qt = min(s.sell_tez.self_reserves, Qt)
+    tqc_m_qt = Float64.mul(qc, ctxt.target) - qt
+    return 65536 * delta * tqc_m_qt * tqc_m_qt * tqc_m_qt // (Qt * Qt * Qt)
+
+
+def fee_rate(q: int, Q: int) -> int:
+    max_rate = 5845483520
+    if 8 * q < Q:
+        return max_rate
+    if 8 * q > 7 * Q:
+        return 0
+    return abs(max_rate * (7 * Q - 8 * q)) // (6 * Q)
+
+
+def update_fee_index(delta: int, outstanding: int, Q: int, dex: HalfDex) -> tuple[HalfDex, int]:
+    rate = fee_rate(dex.self_reserves, Q)
+    fee_index = dex.fee_index
+    new_fee_index = fee_index + Float64.mul(delta * fee_index, rate)
+    minted = outstanding * (new_fee_index - fee_index) // fee_index
+    dex = dex._replace(fee_index=new_fee_index, subsidy_reserves=clamp_nat(dex.subsidy_reserves + minted))
+    return dex, clamp_nat(outstanding + minted)
+
+
+def get_actual_state(s: Storage, call: Call) -> tuple[int, Storage]:
+    """Returns the ctez minted as subsidies and the storage brought to `call.now`,
+    `call.ctez_total_supply` stands for the viewTotalSupply view of the fa12 contract"""
+    now = call.now
+    if s.last_update == now:
+        return 0, s
+    delta = abs(now - s.last_update)
+    d_drift = drift_adjustment(delta, s)
+    drift = s.context.drift
+    new_drift = drift + d_drift
+
+    target = s.context.target
+    d_target = Float64.mul(abs(drift) * delta, target)
+    new_target = subtract_nat(target, d_target, errors.INCORRECT_SUBTRACTION) if drift < 0 else target + d_target
+    outstanding = call.ctez_total_supply
+    Q = max(outstanding // 20, 1)
+    s = s._replace(context=s.context._replace(Q=Q))
+    sell_ctez, new_outstanding = update_fee_index(delta, outstanding, sell_ctez_env.get_target_self_reserves(s.context), s.sell_ctez)
+    sell_tez, new_outstanding = update_fee_index(delta, new_outstanding, sell_tez_env.get_target_self_reserves(s.context), s.sell_tez)
+    subsidies_minted = new_outstanding - outstanding
+    context = s.context._replace(drift=new_drift, target=new_target)
+    return subsidies_minted, s._replace(last_update=now, sell_ctez=sell_ctez, sell_tez=sell_tez, context=context)
+
+
+def do_housekeeping(s: Storage, call: Call) -> Result:
+    subsidies_minted, s = get_actual_state(s, call)
+    ops = []
+    if subsidies_minted > 0:
+        ops = [Transaction(s.context.ctez_fa12_address, 'mintOrBurn', MintOrBurn(subsidies_minted, call.self_address))]
+    return ops, s
+
+
+# Entrypoint functions
+
+def set_ctez_fa12_address(ctez_fa12_address: str, s: Storage, call: Call) -> Result:
+    assert_no_tez_in_transaction(call)
+    assert_with_error(call.sender == s.originator, errors.ONLY_ORIGINATOR_CAN_CALL)
+    assert_with_error(s.context.ctez_fa12_address == NULL_ADDRESS, errors.CTEZ_FA12_ADDRESS_ALREADY_SET)
+    return [], s._replace(context=s.context._replace(ctez_fa12_address=ctez_fa12_address))
+
+
+def create_oven(p: CreateOven, s: Storage, call: Call) -> Result:
+    """`call.originated_address` is the address the originated oven gets"""
+    house_ops, s = do_housekeeping(s, call)
+    handle = Handle(p.id, call.sender)
+    assert_with_error(handle not in s.ovens, errors.OVEN_ALREADY_EXISTS)
+    oven_storage = oven_model.Storage(call.self_address, handle, p.depositors)
+    origination_op = Origination(call.originated_address, p.delegate, call.amount, oven_storage)
+    oven = OvenInfo(
+        tez_balance=call.amount,
+        ctez_outstanding=0,
+        address=call.originated_address,
+        fee_index=s.sell_ctez.fee_index * s.sell_tez.fee_index,
+    )
+    return house_ops + [origination_op], s._replace(ovens={**s.ovens, handle: oven})
+
+
+def withdraw_from_oven(p: Withdraw, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    handle = Handle(p.id, call.sender)
+    oven = get_oven(handle, s)
+    new_balance = subtract_nat(oven.tez_balance, p.amount, errors.EXCESSIVE_TEZ_WITHDRAWAL)
+    oven = oven._replace(tez_balance=new_balance)
+    s = s._replace(ovens={**s.ovens, handle: oven})
+    assert_with_error(not is_under_collateralized(oven, s.context.target), errors.EXCESSIVE_TEZ_WITHDRAWAL)
+    withdraw_op = Transaction(oven.address, 'withdraw', (p.amount, p.to_))
+    return house_ops + [withdraw_op], s
+
+
+def register_oven_deposit(p: RegisterDeposit, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    oven = get_oven(p.handle, s)
+    assert_with_error(call.sender == oven.address, errors.ONLY_OVEN_CAN_CALL)
+    oven = oven._replace(tez_balance=oven.tez_balance + p.amount)
+    return house_ops, s._replace(ovens={**s.ovens, p.handle: oven})
+
+
+def liquidate_oven(p: Liquidate, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    oven = get_oven(p.handle, s)
+    target = s.context.target
+    assert_with_error(is_under_collateralized(oven, target), errors.NOT_UNDERCOLLATERALIZED)
+    remaining_ctez = subtract_nat(oven.ctez_outstanding, p.quantity, errors.EXCESSIVE_CTEZ_BURNING)
+    extracted_balance = Float64.mul(32 * p.quantity, target) // 31
+    new_balance = subtract_nat(oven.tez_balance, extracted_balance, errors.INSUFFICIENT_TEZ_IN_OVEN)
+    oven = oven._replace(ctez_outstanding=remaining_ctez, tez_balance=new_balance)
+    s = s._replace(ovens={**s.ovens, p.handle: oven})
+    op_take_collateral = Transaction(oven.address, 'withdraw', (extracted_balance, p.to_))
+    op_burn_ctez = Transaction(s.context.ctez_fa12_address, 'mintOrBurn', MintOrBurn(-p.quantity, call.sender))
+    return house_ops + [op_burn_ctez, op_take_collateral], s
+
+
+def mint_or_burn(p: MintOrBurnCtez, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    handle = Handle(p.id, call.sender)
+    oven = get_oven(handle, s)
+    ctez_outstanding = oven.ctez_outstanding + p.quantity
+    assert_with_error(ctez_outstanding >= 0, errors.EXCESSIVE_CTEZ_BURNING)
+    oven = oven._replace(ctez_outstanding=ctez_outstanding)
+    s = s._replace(ovens={**s.ovens, handle: oven})
+    assert_with_error(not is_under_collateralized(oven, s.context.target), errors.EXCESSIVE_CTEZ_MINTING)
+    mint_or_burn_op = Transaction(s.context.ctez_fa12_address, 'mintOrBurn', MintOrBurn(p.quantity, call.sender))
+    return house_ops + [mint_or_burn_op], s
+
+
+# dex
+
+def add_tez_liquidity(p: AddTezLiquidity, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    add = half_dex.AddLiquidity(p.owner, call.amount, p.min_liquidity, p.deadline)
+    return house_ops, s._replace(sell_tez=half_dex.add_liquidity(s.sell_tez, add, call))
+
+
+def add_ctez_liquidity(p: AddCtezLiquidity, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    add = half_dex.AddLiquidity(p.owner, p.amount_deposited, p.min_liquidity, p.deadline)
+    sell_ctez = half_dex.add_liquidity(s.sell_ctez, add, call)
+    transfer_ctez_op = transfer_ctez(s.context, call.sender, call.self_address, p.amount_deposited)
+    return house_ops + [transfer_ctez_op], s._replace(sell_ctez=sell_ctez)
+
+
+def append_remove_liquidity_event(
+    amounts: half_dex.RemoveLiquidityAmounts,
+    is_sell_ctez_dex: bool,
+    s: Storage,
+    ops: list,
+) -> Result:
+    id = s.last_event_id + 1
+    event = RemoveLiquidityEvent(id, amounts.self_redeemed, amounts.proceeds_redeemed, amounts.subsidy_redeemed, is_sell_ctez_dex)
+    return [Event('remove_liquidity', event)] + ops, s._replace(last_event_id=id)
+
+
+def remove_tez_liquidity(p: half_dex.RemoveLiquidity, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    sell_tez, ops, amounts = half_dex.remove_liquidity(s.sell_tez, s.context, sell_tez_env, True, p, call)
+    ops, s = append_remove_liquidity_event(amounts, False, s, ops)
+    return house_ops + ops, s._replace(sell_tez=sell_tez)
+
+
+def remove_ctez_liquidity(p: half_dex.RemoveLiquidity, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    sell_ctez, ops, amounts = half_dex.remove_liquidity(s.sell_ctez, s.context, sell_ctez_env, False, p, call)
+    ops, s = append_remove_liquidity_event(amounts, True, s, ops)
+    return house_ops + ops, s._replace(sell_ctez=sell_ctez)
+
+
+def append_collect_from_liquidity_event(
+    amounts: half_dex.CollectProceedsAndSubsidyAmounts,
+    is_sell_ctez_dex: bool,
+    s: Storage,
+    ops: list,
+) -> Result:
+    id = s.last_event_id + 1
+    event = CollectFromLiquidityEvent(id, amounts.proceeds_redeemed, amounts.subsidy_redeemed, is_sell_ctez_dex)
+    return [Event('collect_from_liquidity', event)] + ops, s._replace(last_event_id=id)
+
+
+def collect_from_tez_liquidity(to_: str, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    sell_tez, ops, amounts = half_dex.collect_proceeds_and_subsidy(s.sell_tez, s.context, sell_tez_env, to_, call)
+    ops, s = append_collect_from_liquidity_event(amounts, False, s, ops)
+    return house_ops + ops, s._replace(sell_tez=sell_tez)
+
+
+def collect_from_ctez_liquidity(to_: str, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    sell_ctez, ops, amounts = half_dex.collect_proceeds_and_subsidy(s.sell_ctez, s.context, sell_ctez_env, to_, call)
+    ops, s = append_collect_from_liquidity_event(amounts, True, s, ops)
+    return house_ops + ops, s._replace(sell_ctez=sell_ctez)
+
+
+def tez_to_ctez(p: TezToCtez, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    swap = half_dex.Swap(p.to_, call.amount, p.min_ctez_bought, p.deadline)
+    ops, sell_ctez = half_dex.swap(s.sell_ctez, s.context, sell_ctez_env, swap, call)
+    return house_ops + ops, s._replace(sell_ctez=sell_ctez)
+
+
+def ctez_to_tez(p: CtezToTez, s: Storage, call: Call) -> Result:
+    house_ops, s = do_housekeeping(s, call)
+    assert_no_tez_in_transaction(call)
+    swap = half_dex.Swap(p.to_, p.ctez_sold, p.min_tez_bought, p.deadline)
+    ops, sell_tez = half_dex.swap(s.sell_tez, s.context, sell_tez_env, swap, call)
+    transfer_ctez_op = transfer_ctez(s.context, call.sender, call.self_address, p.ctez_sold)
+    return house_ops + [transfer_ctez_op] + ops, s._replace(sell_tez=sell_tez)
+
+
+# Views, `call.now` and `call.ctez_total_supply` are the time and the fa12 total supply they are run with
+
+def get_half_dex_state(dex: HalfDex) -> HalfDexState:
+    return HalfDexState(
+        total_liquidity_shares=dex.total_liquidity_shares,
+        self_reserves=dex.self_reserves,
+        proceeds_debts=dex.proceeds_debts,
+        proceeds_reserves=dex.proceeds_reserves,
+        subsidy_debts=dex.subsidy_debts,
+        subsidy_reserves=dex.subsidy_reserves,
+        fee_index=dex.fee_index,
+    )
+
+
+def get_current_state(_: None, s: Storage, call: Call) -> CurrentState:
+    _, s = get_actual_state(s, call)
+    return CurrentState(s.last_update, s.context, get_half_dex_state(s.sell_ctez), get_half_dex_state(s.sell_tez))
+
+
+def get_oven_state(handle: Handle, s: Storage, call: Call) -> OvenInfo:
+    _, s = get_actual_state(s, call)
+    return get_oven(handle, s)
+
+
+def calc_tokens_to_sell(p: CalcTokensToSell, s: Storage, call: Call) -> int:
+    _, s = get_actual_state(s, call)
+    dex, env = (s.sell_ctez, sell_ctez_env) if p.is_sell_ctez_dex else (s.sell_tez, sell_tez_env)
+    return half_dex.Curve.swap_amount(dex, s.context, env, p.proceeds_amount)
+
+
+ENTRYPOINTS = {
+    'set_ctez_fa12_address': set_ctez_fa12_address,
+    'create_oven': create_oven,
+    'withdraw_from_oven': withdraw_from_oven,
+    'register_oven_deposit': register_oven_deposit,
+    'liquidate_oven': liquidate_oven,
+    'mint_or_burn': mint_or_burn,
+    'add_tez_liquidity': add_tez_liquidity,
+    'add_ctez_liquidity': add_ctez_liquidity,
+    'remove_tez_liquidity': remove_tez_liquidity,
+    'remove_ctez_liquidity': remove_ctez_liquidity,
+    'collect_from_tez_liquidity': collect_from_tez_liquidity,
+    'collect_from_ctez_liquidity': collect_from_ctez_liquidity,
+    'tez_to_ctez': tez_to_ctez,
+    'ctez_to_tez': ctez_to_tez,
+}
+
+
+VIEWS = {
+    'get_current_state': get_current_state,
+    'get_oven_state': get_oven_state,
+    'calc_tokens_to_sell': calc_tokens_to_sell,
+}
@@ -0,0 +1,42 @@
+# common
+TEZ_IN_TRANSACTION_DISALLOWED = 'TEZ_IN_TRANSACTION_DISALLOWED'
+INCORRECT_SUBTRACTION = 'INCORRECT_SUBTRACTION'
+
+# ctez2
+DEADLINE_HAS_PASSED = 'DEADLINE_HAS_PASSED'
+INSUFFICIENT_LIQUIDITY_CREATED = 'INSUFFICIENT_LIQUIDITY_CREATED'
+CTEZ_FA12_ADDRESS_ALREADY_SET = 'CTEZ_FA12_ADDRESS_ALREADY_SET'
+INSUFFICIENT_TOKENS_BOUGHT = 'INSUFFICIENT_TOKENS_BOUGHT'
+INSUFFICIENT_TOKENS_LIQUIDITY = 'INSUFFICIENT_TOKENS_LIQUIDITY'
+INSUFFICIENT_LIQUIDITY = 'INSUFFICIENT_LIQUIDITY'
+INSUFFICIENT_SELF_RECEIVED = 'INSUFFICIENT_SELF_RECEIVED'
+INSUFFICIENT_PROCEEDS_RECEIVED = 'INSUFFICIENT_PROCEEDS_RECEIVED'
+INSUFFICIENT_SUBSIDY_RECEIVED = 'INSUFFICIENT_SUBSIDY_RECEIVED'
+OVEN_ALREADY_EXISTS = 'OVEN_ALREADY_EXISTS'
+OVEN_NOT_EXISTS = 'OVEN_NOT_EXISTS'
+ONLY_OVEN_CAN_CALL = 'ONLY_OVEN_CAN_CALL'
+EXCESSIVE_TEZ_WITHDRAWAL = 'EXCESSIVE_TEZ_WITHDRAWAL'
+EXCESSIVE_CTEZ_BURNING = 'EXCESSIVE_CTEZ_BURNING'
+EXCESSIVE_CTEZ_MINTING = 'EXCESSIVE_CTEZ_MINTING'
+NOT_UNDERCOLLATERALIZED = 'NOT_UNDERCOLLATERALIZED'
+INSUFFICIENT_TEZ_IN_OVEN = 'INSUFFICIENT_TEZ_IN_OVEN'
+ONLY_ORIGINATOR_CAN_CALL = 'ONLY_ORIGINATOR_CAN_CALL'
+MISSING_WITHDRAW_ENTRYPOINT = 'MISSING_WITHDRAW_ENTRYPOINT'
+MISSING_MINT_OR_BURN_ENTRYPOINT = 'MISSING_MINT_OR_BURN_ENTRYPOINT'
+MISSING_TOTAL_SUPPLY_VIEW = 'MISSING_TOTAL_SUPPLY_VIEW'
+
+# oven
+ONLY_MAIN_CONTRACT_CAN_CALL = 'ONLY_MAIN_CONTRACT_CAN_CALL'
+ONLY_OWNER_CAN_CALL = 'ONLY_OWNER_CAN_CALL'
+UNAUTHORIZED_DEPOSITOR = 'UNAUTHORIZED_DEPOSITOR'
+SET_ANY_OFF_FIRST = 'SET_ANY_OFF_FIRST'
+MISSING_DEPOSIT_ENTRYPOINT = 'MISSING_DEPOSIT_ENTRYPOINT'
+
+# fa12
+DONT_SEND_TEZ = 'DontSendTez'
+NOT_ENOUGH_BALANCE = 'NotEnoughBalance'
+NOT_ENOUGH_ALLOWANCE = 'NotEnoughAllowance'
+UNSAFE_ALLOWANCE_CHANGE = 'UnsafeAllowanceChange'
+ONLY_ADMIN = 'OnlyAdmin'
+CANNOT_BURN_MORE_THAN_THE_TARGETS_BALANCE = 'CannotBurnMoreThanTheTargetsBalance'
+CANNOT_BURN_MORE_THAN_THE_TOTAL_SUPPLY = 'CannotBurnMoreThanTheTotalSupply'
@@ -0,0 +1,92 @@
+from typing import NamedTuple
+
+from tests.helpers.model import errors
+from tests.helpers.model.context import Fa12Transfer
+from tests.helpers.model.stdctez import add_int_to_nat, assert_with_error, subtract_nat
+from tests.helpers.model.tezos import Call
+
+
+class AccountInfo(NamedTuple):
+    amount: int = 0
+    allowances: dict[str, int] = {}
+
+
+class Storage(NamedTuple):
+    ledger: dict[str, AccountInfo]
+    admin: str
+    total_supply: int
+
+
+class Approve(NamedTuple):
+    spender: str
+    value: int
+
+
+class MintOrBurn(NamedTuple):
+    quantity: int
+    target: str
+
+
+def find_account(address: str, ledger: dict[str, AccountInfo]) -> AccountInfo:
+    return ledger.get(address, AccountInfo())
+
+
+def update_allowance(allowances: dict[str, int], spender: str, value: int) -> dict[str, int]:
+    allowances = {k: v for k, v in allowances.items() if k != spender}
+    if value != 0:
+        allowances[spender] = value
+    return allowances
+
+
+def assert_no_tez(call: Call) -> None:
+    assert_with_error(call.amount == 0, errors.DONT_SEND_TEZ)
+
+
+def transfer(p: Fa12Transfer, s: Storage, call: Call) -> tuple[list, Storage]:
+    assert_no_tez(call)
+    owner_account = find_account(p.address_from, s.ledger)
+    receiver_account = find_account(p.address_to, s.ledger)
+    if call.sender != p.address_from:
+        authorized_value = owner_account.allowances.get(call.sender, 0)
+        authorized_value = subtract_nat(authorized_value, p.value, errors.NOT_ENOUGH_ALLOWANCE)
+        owner_account = owner_account._replace(
+            allowances=update_allowance(owner_account.allowances, call.sender, authorized_value))
+    owner_account = owner_account._replace(
+        amount=subtract_nat(owner_account.amount, p.value, errors.NOT_ENOUGH_BALANCE))
+    receiver_account = receiver_account._replace(amount=receiver_account.amount + p.value)
+    ledger = {**s.ledger, p.address_from: owner_account}
+    # the receiver record is read before the owner is updated, as in the contract
+    ledger = {**ledger, p.address_to: receiver_account}
+    return [], s._replace(ledger=ledger)
+
+
+def approve(p: Approve, s: Storage, call: Call) -> tuple[list, Storage]:
+    assert_no_tez(call)
+    owner_account = find_account(call.sender, s.ledger)
+    previous_value = owner_account.allowances.get(p.spender, 0)
+    assert_with_error(previous_value == 0 or p.value == 0, errors.UNSAFE_ALLOWANCE_CHANGE)
+    owner_account = owner_account._replace(
+        allowances=update_allowance(owner_account.allowances, p.spender, p.value))
+    return [], s._replace(ledger={**s.ledger, call.sender: owner_account})
+
+
+def mint_or_burn(p: MintOrBurn, s: Storage, call: Call) -> tuple[list, Storage]:
+    assert_no_tez(call)
+    assert_with_error(call.sender == s.admin, errors.ONLY_ADMIN)
+    target_account = find_account(p.target, s.ledger)
+    target_account = target_account._replace(
+        amount=add_int_to_nat(target_account.amount, p.quantity, errors.CANNOT_BURN_MORE_THAN_THE_TARGETS_BALANCE))
+    total_supply = add_int_to_nat(s.total_supply, p.quantity, errors.CANNOT_BURN_MORE_THAN_THE_TOTAL_SUPPLY)
+    return [], s._replace(ledger={**s.ledger, p.target: target_account}, total_supply=total_supply)
+
+
+def view_balance(owner: str, s: Storage) -> int:
+    return find_account(owner, s.ledger).amount
+
+
+def view_allowance(owner: str, spender: str, s: Storage) -> int:
+    return find_account(owner, s.ledger).allowances.get(spender, 0)
+
+
+def view_total_supply(s: Storage) -> int:
+    return s.total_supply
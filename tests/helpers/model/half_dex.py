@@ -0,0 +1,296 @@
+from typing import Callable, NamedTuple
+
+from tests.helpers.model import errors
+from tests.helpers.model.context import Context, transfer_ctez
+from tests.helpers.model.stdctez import (
+    assert_with_error,
+    ceil_div,
+    clamp_nat,
+    subtract_nat,
+)
+from tests.helpers.model.tezos import Call, Transaction
+
+
+class Environment(NamedTuple):
+    transfer_self: Callable[[Context, Call, str, int], Transaction]
+    transfer_proceeds: Callable[[Context, Call, str, int], Transaction]
+    get_target_self_reserves: Callable[[Context], int]
+    div_by_target: Callable[[Context, int], int]
+
+
+class LiquidityOwner(NamedTuple):
+    liquidity_shares: int = 0
+    proceeds_owed: int = 0
+    subsidy_owed: int = 0
+
+
+class HalfDex(NamedTuple):
+    liquidity_owners: dict[str, LiquidityOwner]
+    total_liquidity_shares: int
+    self_reserves: int
+    proceeds_debts: int
+    proceeds_reserves: int
+    subsidy_debts: int
+    subsidy_reserves: int
+    fee_index: int
+
+    @classmethod
+    def empty(cls, fee_index: int = 2**64) -> 'HalfDex':
+        return cls({}, 0, 0, 0, 0, 0, 0, fee_index)
+
+
+def find_liquidity_owner(t: HalfDex, owner: str) -> LiquidityOwner:
+    return t.liquidity_owners.get(owner, LiquidityOwner())
+
+
+def set_liquidity_owner(t: HalfDex, owner: str, liquidity_owner: LiquidityOwner) -> HalfDex:
+    return t._replace(liquidity_owners={**t.liquidity_owners, owner: liquidity_owner})
+
+
+class AddLiquidity(NamedTuple):
+    owner: str
+    amount_deposited: int
+    min_liquidity: int
+    deadline: int
+
+
+def get_redeemed_tokens(lqt: int, token_reserves: int, total_lqt: int) -> int:
+    return (lqt * token_reserves) // max(total_lqt, 1)
+
+
+def get_deposited_lqt(token_amount: int, token_reserves: int, total_lqt: int) -> int:
+    return (token_amount * max(total_lqt, 1)) // max(token_reserves, 1)
+
+
+def get_deposited_tokens(new_total_lqt: int, prev_total_lqt: int, token_reserves: int) -> tuple[int, int]:
+    new_token_reserves = ceil_div(new_total_lqt * token_reserves, max(prev_total_lqt, 1))
+    deposited_tokens = subtract_nat(new_token_reserves, token_reserves, errors.INCORRECT_SUBTRACTION)
+    return deposited_tokens, new_token_reserves
+
+
+def add_liquidity(t: HalfDex, p: AddLiquidity, call: Call) -> HalfDex:
+    prev_total_liquidity_shares = t.total_liquidity_shares
+    d_liquidity = get_deposited_lqt(p.amount_deposited, t.self_reserves, prev_total_liquidity_shares)
+    total_liquidity_shares = prev_total_liquidity_shares + d_liquidity
+    assert_with_error(d_liquidity >= p.min_liquidity, errors.INSUFFICIENT_LIQUIDITY_CREATED)
+    assert_with_error(call.now <= p.deadline, errors.DEADLINE_HAS_PASSED)
+    d_proceeds, proceeds_reserves = get_deposited_tokens(total_liquidity_shares, prev_total_liquidity_shares, t.proceeds_reserves)
+    d_subsidy, subsidy_reserves = get_deposited_tokens(total_liquidity_shares, prev_total_liquidity_shares, t.subsidy_reserves)
+    owner = find_liquidity_owner(t, p.owner)
+    t = set_liquidity_owner(t, p.owner, owner._replace(
+        liquidity_shares=owner.liquidity_shares + d_liquidity,
+        proceeds_owed=owner.proceeds_owed + d_proceeds,
+        subsidy_owed=owner.subsidy_owed + d_subsidy,
+    ))
+    return t._replace(
+        total_liquidity_shares=total_liquidity_shares,
+        self_reserves=t.self_reserves + p.amount_deposited,
+        proceeds_debts=t.proceeds_debts + d_proceeds,
+        proceeds_reserves=proceeds_reserves,
+        subsidy_debts=t.subsidy_debts + d_subsidy,
+        subsidy_reserves=subsidy_reserves,
+    )
+
+
+def subtract_debt(owner_amount: int, owner_debt: int, dex_total_reserves: int, dex_total_debts: int) -> tuple[int, int]:
+    if owner_amount < owner_debt:
+        return owner_debt - owner_amount, 0
+    dex_balance = clamp_nat(dex_total_reserves - dex_total_debts)
+    return 0, min(owner_amount - owner_debt, dex_balance)
+
+
+def remove_tokens(
+    liquidity_redeemed: int,
+    total_liquidity_shares: int,
+    owner_debt: int,
+    dex_total_reserves: int,
+    dex_total_debts: int,
+    min_tokens_received: int,
+    insufficient_redeemed_amount_error: str,
+) -> tuple[int, int, int, int]:
+    tokens_amount = get_redeemed_tokens(liquidity_redeemed, dex_total_reserves, total_liquidity_shares)
+    new_owner_debt, tokens_redeemed = subtract_debt(tokens_amount, owner_debt, dex_total_reserves, dex_total_debts)
+    assert_with_error(tokens_redeemed >= min_tokens_received, insufficient_redeemed_amount_error)
+    new_dex_total_reserves = subtract_nat(dex_total_reserves, tokens_amount, errors.INCORRECT_SUBTRACTION)
+    new_dex_total_debts = subtract_nat(dex_total_debts + new_owner_debt, owner_debt, errors.INCORRECT_SUBTRACTION)
+    return new_dex_total_reserves, new_dex_total_debts, new_owner_debt, tokens_redeemed
+
+
+class RemoveLiquidity(NamedTuple):
+    to_: str
+    liquidity_redeemed: int
+    min_self_received: int
+    min_proceeds_received: int
+    min_subsidy_received: int
+    deadline: int
+
+
+class RemoveLiquidityAmounts(NamedTuple):
+    self_redeemed: int
+    proceeds_redeemed: int
+    subsidy_redeemed: int
+
+
+class RemoveLiquidityResult(NamedTuple):
+    dex: HalfDex
+    ops: list
+    amounts: RemoveLiquidityAmounts
+
+
+def remove_liquidity(
+    t: HalfDex,
+    ctxt: Context,
+    env: Environment,
+    is_self_token_tez: bool,
+    p: RemoveLiquidity,
+    call: Call,
+) -> RemoveLiquidityResult:
+    assert_with_error(call.now <= p.deadline, errors.DEADLINE_HAS_PASSED)
+    owner = call.sender
+    liquidity_owner = find_liquidity_owner(t, owner)
+    prev_total_liquidity_shares = t.total_liquidity_shares
+    assert_with_error(liquidity_owner.liquidity_shares >= p.liquidity_redeemed, errors.INSUFFICIENT_LIQUIDITY)
+    liquidity_shares = subtract_nat(liquidity_owner.liquidity_shares, p.liquidity_redeemed, errors.INCORRECT_SUBTRACTION)
+    total_liquidity_shares = subtract_nat(prev_total_liquidity_shares, p.liquidity_redeemed, errors.INCORRECT_SUBTRACTION)
+
+    self_redeemed = get_redeemed_tokens(p.liquidity_redeemed, t.self_reserves, prev_total_liquidity_shares)
+    assert_with_error(self_redeemed >= p.min_self_received, errors.INSUFFICIENT_SELF_RECEIVED)
+    self_reserves = subtract_nat(t.self_reserves, self_redeemed, errors.INCORRECT_SUBTRACTION)
+
+    proceeds_reserves, proceeds_debts, proceeds_owed, proceeds_redeemed = remove_tokens(
+        p.liquidity_redeemed, prev_total_liquidity_shares, liquidity_owner.proceeds_owed,
+        t.proceeds_reserves, t.proceeds_debts, p.min_proceeds_received, errors.INSUFFICIENT_PROCEEDS_RECEIVED)
+
+    subsidy_reserves, subsidy_debts, subsidy_owed, subsidy_redeemed = remove_tokens(
+        p.liquidity_redeemed, prev_total_liquidity_shares, liquidity_owner.subsidy_owed,
+        t.subsidy_reserves, t.subsidy_debts, p.min_subsidy_received, errors.INSUFFICIENT_SUBSIDY_RECEIVED)
+
+    t = t._replace(
+        total_liquidity_shares=total_liquidity_shares,
+        self_reserves=self_reserves,
+        proceeds_debts=proceeds_debts,
+        proceeds_reserves=proceeds_reserves,
+        subsidy_debts=subsidy_debts,
+        subsidy_reserves=subsidy_reserves,
+    )
+    t = set_liquidity_owner(t, owner, find_liquidity_owner(t, owner)._replace(
+        liquidity_shares=liquidity_shares,
+        proceeds_owed=proceeds_owed,
+        subsidy_owed=subsidy_owed,
+    ))
+
+    self_ops = [env.transfer_self(ctxt, call, p.to_, self_redeemed)] if self_redeemed > 0 else []
+    proceeds_ops = [env.transfer_proceeds(ctxt, call, p.to_, proceeds_redeemed)] if proceeds_redeemed > 0 else []
+    ops = proceeds_ops + self_ops if is_self_token_tez else self_ops + proceeds_ops
+    if subsidy_redeemed > 0:
+        ops = [transfer_ctez(ctxt, call.self_address, p.to_, subsidy_redeemed)] + ops
+    return RemoveLiquidityResult(t, ops, RemoveLiquidityAmounts(self_redeemed, proceeds_redeemed, subsidy_redeemed))
+
+
+def collect_tokens(
+    liquidity_shares: int,
+    total_liquidity_shares: int,
+    owner_debts: int,
+    dex_reserves: int,
+    dex_total_debts: int,
+) -> tuple[int, int, int]:
+    owner_tokens = get_redeemed_tokens(liquidity_shares, dex_reserves, total_liquidity_shares)
+    _, amount_to_withdrawn = subtract_debt(owner_tokens, owner_debts, dex_reserves, dex_total_debts)
+    return owner_tokens, amount_to_withdrawn, dex_total_debts + amount_to_withdrawn
+
+
+class CollectProceedsAndSubsidyAmounts(NamedTuple):
+    proceeds_redeemed: int
+    subsidy_redeemed: int
+
+
+class CollectProceedsAndSubsidyResult(NamedTuple):
+    dex: HalfDex
+    ops: list
+    amounts: CollectProceedsAndSubsidyAmounts
+
+
+def collect_proceeds_and_subsidy(
+    t: HalfDex,
+    ctxt: Context,
+    env: Environment,
+    to_: str,
+    call: Call,
+) -> CollectProceedsAndSubsidyResult:
+    owner = call.sender
+    liquidity_owner = find_liquidity_owner(t, owner)
+    proceeds_owed, proceeds_redeemed, proceeds_debts = collect_tokens(
+        liquidity_owner.liquidity_shares, t.total_liquidity_shares, liquidity_owner.proceeds_owed,
+        t.proceeds_reserves, t.proceeds_debts)
+    subsidy_owed, subsidy_redeemed, subsidy_debts = collect_tokens(
+        liquidity_owner.liquidity_shares, t.total_liquidity_shares, liquidity_owner.subsidy_owed,
+        t.subsidy_reserves, t.subsidy_debts)
+
+    t = t._replace(proceeds_debts=proceeds_debts, subsidy_debts=subsidy_debts)
+    t = set_liquidity_owner(t, owner, liquidity_owner._replace(proceeds_owed=proceeds_owed, subsidy_owed=subsidy_owed))
+
+    ops = [env.transfer_proceeds(ctxt, call, to_, proceeds_redeemed)] if proceeds_redeemed > 0 else []
+    if subsidy_redeemed > 0:
+        ops = [transfer_ctez(ctxt, call.self_address, to_, subsidy_redeemed)] + ops
+    return CollectProceedsAndSubsidyResult(t, ops, CollectProceedsAndSubsidyAmounts(proceeds_redeemed, subsidy_redeemed))
+
+
+class Curve:
+    """Swap curve of half_dex.mligo, see the Curve module there for the derivation"""
+
+    @staticmethod
+    def newton_step(x: int, y: int, q: int, Q: int) -> int:
+        dq = min(y, q)
+        q_m_Q = q - Q
+        dq_m_q = dq - q
+        dq_m_q_sq = dq_m_q * dq_m_q
+        dq_m_q_cu = dq_m_q_sq * dq_m_q
+        Q_sq = Q * Q
+        Q_cu = Q_sq * Q
+        num = 3 * dq * dq * dq * dq + 6 * dq * dq * q_m_Q * q_m_Q + 8 * dq * dq * dq * (-q_m_Q) + 80 * Q_cu * x
+        denom = 4 * (dq_m_q_cu + 3 * dq_m_q_sq * Q + 3 * dq_m_q * Q_sq + 21 * Q_cu)
+        return num // denom
+
+    @staticmethod
+    def swap_using_exceed_liquidity(x: int, q: int, Q: int) -> tuple[int, int]:
+        non_targeted_q = clamp_nat(q - Q)
+        rest_x = clamp_nat(x - non_targeted_q)
+        untaxed_y = min(x, non_targeted_q)
+        return rest_x, untaxed_y
+
+    @staticmethod
+    def swap_using_incentivized_liquidity(x: int, q: int, Q: int) -> int:
+        q = min(q, Q)
+        y = x
+        y = clamp_nat(Curve.newton_step(x, y, q, Q))
+        y = clamp_nat(Curve.newton_step(x, y, q, Q))
+        y = clamp_nat(Curve.newton_step(x, y, q, Q))
+        return clamp_nat(y - y // 1_000_000_000 - 1)
+
+    @staticmethod
+    def swap_amount(t: HalfDex, ctxt: Context, env: Environment, proceeds_amount: int) -> int:
+        x = env.div_by_target(ctxt, proceeds_amount)
+        q = t.self_reserves
+        Q = env.get_target_self_reserves(ctxt)
+        x, y = Curve.swap_using_exceed_liquidity(x, q, Q)
+        if x == 0:
+            return y
+        return y + Curve.swap_using_incentivized_liquidity(x, q, Q)
+
+
+class Swap(NamedTuple):
+    to_: str
+    proceeds_amount: int
+    min_self: int
+    deadline: int
+
+
+def swap(t: HalfDex, ctxt: Context, env: Environment, p: Swap, call: Call) -> tuple[list, HalfDex]:
+    assert_with_error(call.now <= p.deadline, errors.DEADLINE_HAS_PASSED)
+    self_to_sell = Curve.swap_amount(t, ctxt, env, p.proceeds_amount)
+    assert_with_error(self_to_sell >= p.min_self and self_to_sell > 0, errors.INSUFFICIENT_TOKENS_BOUGHT)
+    t = t._replace(
+        self_reserves=subtract_nat(t.self_reserves, self_to_sell, errors.INSUFFICIENT_TOKENS_LIQUIDITY),
+        proceeds_reserves=t.proceeds_reserves + p.proceeds_amount,
+    )
+    return [env.transfer_self(ctxt, call, p.to_, self_to_sell)], t
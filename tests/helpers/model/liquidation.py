@@ -0,0 +1,122 @@
+from bisect import bisect_left, insort
+from fractions import Fraction
+from typing import Container, Iterator, NamedTuple, Optional
+
+from tests.helpers.model import ctez2
+from tests.helpers.model.oven import Handle
+from tests.helpers.model.quote import quote_proceeds
+from tests.helpers.model.stdctez import Float64, ceil_div, clamp_nat
+
+
+def collateral_key(oven: ctez2.OvenInfo) -> Fraction:
+    """tez_balance / ctez_outstanding with the debt taken back to a common fee index.
+
+    All ovens are brought to the same global fee index by get_oven, so the order
+    of the keys is the order of the collateral ratios at any fee index and target."""
+    return Fraction(oven.tez_balance * oven.fee_index, oven.ctez_outstanding)
+
+
+class LiquidationIndex:
+    """Ovens with ctez outstanding, sorted from the least collateralized one.
+
+    The index is kept up to date by passing it every oven record that changes
+    (create_oven, withdraw_from_oven, register_oven_deposit, mint_or_burn,
+    liquidate_oven), the ordering itself doesn't depend on the housekeeping."""
+
+    def __init__(self, ovens: Optional[dict[Handle, ctez2.OvenInfo]] = None):
+        self._keys: dict[Handle, Fraction] = {}
+        self._sorted: list[tuple[Fraction, Handle]] = []
+        self.ovens: dict[Handle, ctez2.OvenInfo] = {}
+        for handle, oven in (ovens or {}).items():
+            self.update(handle, oven)
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def __contains__(self, handle: Handle) -> bool:
+        return handle in self._keys
+
+    def update(self, handle: Handle, oven: Optional[ctez2.OvenInfo]) -> None:
+        """Sets the stored record of the oven, None removes it"""
+        key = self._keys.pop(handle, None)
+        if key is not None:
+            del self._sorted[bisect_left(self._sorted, (key, handle))]
+        self.ovens.pop(handle, None)
+        if oven is None:
+            return
+        self.ovens[handle] = oven
+        if oven.ctez_outstanding > 0:
+            key = collateral_key(oven)
+            self._keys[handle] = key
+            insort(self._sorted, (key, handle))
+
+    def update_from_storage(self, s: ctez2.Storage, handles: list[Handle]) -> None:
+        for handle in handles:
+            self.update(handle, s.ovens.get(handle))
+
+    def frontier(self, fee_index: int, target: int) -> Iterator[tuple[Handle, ctez2.OvenInfo]]:
+        """Yields the under-collateralized ovens, least collateralized first, as
+        get_oven would return them at the given global fee index and target"""
+        # is_under_collateralized rounds the debt down, so none of the ovens
+        # past this bound can be under-collateralized
+        bound = Fraction(16 * fee_index * target, 15 * Float64.ONE)
+        end = bisect_left(self._sorted, (bound,))
+        for _, handle in self._sorted[:end]:
+            oven = ctez2.apply_fee_index(self.ovens[handle], fee_index)
+            if ctez2.is_under_collateralized(oven, target):
+                yield handle, oven
+
+    def at_risk(self, s: ctez2.Storage) -> list[tuple[Handle, ctez2.OvenInfo]]:
+        """The under-collateralized ovens of the storage, it should be brought to
+        the current time with get_actual_state first"""
+        return list(self.frontier(s.sell_ctez.fee_index * s.sell_tez.fee_index, s.context.target))
+
+
+class Liquidation(NamedTuple):
+    handle: Handle
+    quantity: int
+    extracted_balance: int
+
+
+class LiquidationPlan(NamedTuple):
+    liquidations: list[Liquidation]
+    ctez_to_buy: int
+    tez_to_sell: int
+
+
+def liquidation_quantity(oven: ctez2.OvenInfo, target: int) -> int:
+    """The largest quantity liquidate_oven accepts for the oven, as returned by
+    get_oven, the extracted balance Float64.mul(32 * quantity, target) / 31 must
+    stay within the tez balance"""
+    max_quantity = ceil_div((31 * oven.tez_balance + 31) * Float64.ONE, 32 * target) - 1
+    return min(oven.ctez_outstanding, max_quantity)
+
+
+def plan_liquidations(
+    index: LiquidationIndex,
+    s: ctez2.Storage,
+    ctez_balance: int,
+    max_count: int,
+    skip: Container[Handle] = (),
+) -> LiquidationPlan:
+    """Picks up to max_count of the least collateralized ovens of the actual storage,
+    but the skipped ones, and the ctez to buy on the sell ctez dex to burn for them.
+    The best collateralized ones are left out until the tez extracted pay for the
+    ctez bought."""
+    target = s.context.target
+    liquidations = []
+    for handle, oven in index.frontier(s.sell_ctez.fee_index * s.sell_tez.fee_index, target):
+        if len(liquidations) == max_count:
+            break
+        quantity = liquidation_quantity(oven, target)
+        if handle not in skip and quantity > 0:
+            liquidations.append(Liquidation(handle, quantity, Float64.mul(32 * quantity, target) // 31))
+    while liquidations:
+        ctez_to_buy = clamp_nat(sum(l.quantity for l in liquidations) - ctez_balance)
+        tez_to_sell = 0
+        if ctez_to_buy > 0:
+            [tez_to_sell] = quote_proceeds(ctez2.sell_ctez_env, ctez_to_buy, s.sell_ctez.self_reserves, s.context.Q, target)
+        if tez_to_sell is not None and tez_to_sell < sum(l.extracted_balance for l in liquidations):
+            return LiquidationPlan(liquidations, ctez_to_buy, tez_to_sell)
+        liquidations.pop()
+    return LiquidationPlan([], 0, 0)
@@ -0,0 +1,301 @@
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from statistics import fmean, pstdev, quantiles
+from typing import NamedTuple, Optional, Sequence, Union
+
+from tests.helpers.model import ctez2, fa12, half_dex
+from tests.helpers.model.simulator import BalanceTooLow, Simulator
+from tests.helpers.model.stdctez import Float64, ceil_div
+from tests.helpers.model.tezos import FailwithError
+
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+ORIGINATOR = 'tz1MonteCarloOriginator'
+# the liquidity provider seeding both dexes, it only removes its liquidity at the end
+LIQUIDITY_PROVIDER = 'tz1MonteCarloProvider'
+UNLIMITED_ALLOWANCE = 2**128
+
+
+# order flow
+
+class Wait(NamedTuple):
+    seconds: int
+
+
+class SellTez(NamedTuple):
+    actor: str
+    amount: int
+
+
+class SellCtez(NamedTuple):
+    actor: str
+    amount: int
+
+
+class AddLiquidity(NamedTuple):
+    actor: str
+    is_sell_ctez_dex: bool
+    amount: int
+
+
+class RemoveLiquidity(NamedTuple):
+    """Redeems `fraction` of the liquidity shares of the actor"""
+    actor: str
+    is_sell_ctez_dex: bool
+    fraction: float
+
+
+class MintOrBurn(NamedTuple):
+    """Mints (or burns when negative) ctez against the oven 0 of the actor"""
+    actor: str
+    quantity: int
+
+
+Action = Union[Wait, SellTez, SellCtez, AddLiquidity, RemoveLiquidity, MintOrBurn]
+
+
+class Market(NamedTuple):
+    """Initial state: the liquidity of both dexes, and the ctez each actor mints
+    against an oven holding twice the minimal collateral"""
+    sell_ctez_liquidity: int
+    sell_tez_liquidity: int
+    actor_ctez: int
+    target: int = Float64.ONE
+
+
+class FlowParameters(NamedTuple):
+    """Random order flow: actions arrive as a Poisson process, their sizes are
+    log-normal around `size`, and kinds are drawn with the given weights"""
+    duration: int
+    actors: int = 10
+    mean_interval: float = 60
+    size: int = 10**9
+    size_sigma: float = 1.0
+    sell_tez_weight: float = 0.4
+    sell_ctez_weight: float = 0.4
+    liquidity_weight: float = 0.1
+    mint_or_burn_weight: float = 0.1
+
+
+def actor_address(i: int) -> str:
+    return f'tz1MonteCarloActor{i}'
+
+
+def random_order_flow(rng: Random, p: FlowParameters) -> list[Action]:
+    kinds = ('sell_tez', 'sell_ctez', 'liquidity', 'mint_or_burn')
+    weights = (p.sell_tez_weight, p.sell_ctez_weight, p.liquidity_weight, p.mint_or_burn_weight)
+    flow: list[Action] = []
+    elapsed = 0
+    while True:
+        wait = max(1, round(rng.expovariate(1 / p.mean_interval)))
+        if elapsed + wait > p.duration:
+            break
+        elapsed += wait
+        flow.append(Wait(wait))
+        actor = actor_address(rng.randrange(p.actors))
+        size = max(1, round(p.size * rng.lognormvariate(0, p.size_sigma)))
+        [kind] = rng.choices(kinds, weights)
+        if kind == 'sell_tez':
+            flow.append(SellTez(actor, size))
+        elif kind == 'sell_ctez':
+            flow.append(SellCtez(actor, size))
+        elif kind == 'liquidity' and rng.random() < 0.5:
+            flow.append(AddLiquidity(actor, rng.random() < 0.5, size))
+        elif kind == 'liquidity':
+            flow.append(RemoveLiquidity(actor, rng.random() < 0.5, rng.random()))
+        else:
+            flow.append(MintOrBurn(actor, size if rng.random() < 0.5 else -size))
+    if elapsed < p.duration:
+        flow.append(Wait(p.duration - elapsed))
+    return flow
+
+
+def flow_actors(flow: Sequence[Action]) -> list[str]:
+    return sorted({action.actor for action in flow if not isinstance(action, Wait)})
+
+
+def setup_market(market: Market, actors: Sequence[str], now: int) -> Simulator:
+    sim = Simulator(now, ORIGINATOR, market.target)
+    deadline = now + SECONDS_PER_YEAR
+    minted = [(LIQUIDITY_PROVIDER, market.sell_ctez_liquidity)] + [(actor, market.actor_ctez) for actor in actors]
+    for actor, ctez in minted:
+        collateral = 2 * ceil_div(16 * ctez * market.target, 15 * Float64.ONE)
+        sim.call_ctez2(actor, 'create_oven', ctez2.CreateOven(0, None, None), collateral)
+        sim.call_ctez2(actor, 'mint_or_burn', ctez2.MintOrBurnCtez(0, ctez))
+        sim.call_fa12(actor, 'approve', fa12.Approve(sim.ctez2_address, UNLIMITED_ALLOWANCE))
+    if market.sell_ctez_liquidity > 0:
+        add = ctez2.AddCtezLiquidity(LIQUIDITY_PROVIDER, market.sell_ctez_liquidity, 0, deadline)
+        sim.call_ctez2(LIQUIDITY_PROVIDER, 'add_ctez_liquidity', add)
+    if market.sell_tez_liquidity > 0:
+        add = ctez2.AddTezLiquidity(LIQUIDITY_PROVIDER, 0, deadline)
+        sim.call_ctez2(LIQUIDITY_PROVIDER, 'add_tez_liquidity', add, market.sell_tez_liquidity)
+    return sim
+
+
+def liquidity_shares(sim: Simulator, owner: str, is_sell_ctez_dex: bool) -> int:
+    dex = sim.ctez2.sell_ctez if is_sell_ctez_dex else sim.ctez2.sell_tez
+    return dex.liquidity_owners.get(owner, half_dex.LiquidityOwner()).liquidity_shares
+
+
+def remove_liquidity(sim: Simulator, owner: str, is_sell_ctez_dex: bool, shares: int) -> ctez2.RemoveLiquidityEvent:
+    remove = half_dex.RemoveLiquidity(owner, shares, 0, 0, 0, sim.now)
+    entrypoint = 'remove_ctez_liquidity' if is_sell_ctez_dex else 'remove_tez_liquidity'
+    sim.call_ctez2(owner, entrypoint, remove)
+    return sim.events[-1].payload
+
+
+def execute(sim: Simulator, action: Action) -> None:
+    """Applies the action to the simulator, raises like Simulator.call does"""
+    deadline = sim.now
+    if isinstance(action, Wait):
+        sim.advance(action.seconds)
+    elif isinstance(action, SellTez):
+        sim.call_ctez2(action.actor, 'tez_to_ctez', ctez2.TezToCtez(action.actor, 0, deadline), action.amount)
+    elif isinstance(action, SellCtez):
+        sim.call_ctez2(action.actor, 'ctez_to_tez', ctez2.CtezToTez(action.actor, action.amount, 0, deadline))
+    elif isinstance(action, AddLiquidity) and action.is_sell_ctez_dex:
+        add = ctez2.AddCtezLiquidity(action.actor, action.amount, 0, deadline)
+        sim.call_ctez2(action.actor, 'add_ctez_liquidity', add)
+    elif isinstance(action, AddLiquidity):
+        sim.call_ctez2(action.actor, 'add_tez_liquidity', ctez2.AddTezLiquidity(action.actor, 0, deadline), action.amount)
+    elif isinstance(action, RemoveLiquidity):
+        shares = int(liquidity_shares(sim, action.actor, action.is_sell_ctez_dex) * action.fraction)
+        remove_liquidity(sim, action.actor, action.is_sell_ctez_dex, shares)
+    elif isinstance(action, MintOrBurn):
+        sim.call_ctez2(action.actor, 'mint_or_burn', ctez2.MintOrBurnCtez(0, action.quantity))
+    else:
+        raise TypeError(f'unknown action {action}')
+
+
+class LiquidityOutcome(NamedTuple):
+    """What the seeding liquidity provider got back from a dex, valued in tez at
+    the final target. pnl is relative to holding the deposit, subsidy_apr is the
+    annualized subsidy over the deposit."""
+    deposit: int
+    self_redeemed: int
+    proceeds_redeemed: int
+    subsidy_redeemed: int
+    pnl: float
+    subsidy_apr: float
+
+
+class RunResult(NamedTuple):
+    duration: int
+    target: int
+    drift: int
+    target_apr: float
+    sell_ctez: Optional[LiquidityOutcome]
+    sell_tez: Optional[LiquidityOutcome]
+    executed: int
+    rejected: int
+
+
+def _liquidity_outcome(
+    sim: Simulator,
+    is_sell_ctez_dex: bool,
+    deposit: int,
+    duration: int,
+) -> Optional[LiquidityOutcome]:
+    if deposit == 0:
+        return None
+    event = remove_liquidity(sim, LIQUIDITY_PROVIDER, is_sell_ctez_dex, liquidity_shares(sim, LIQUIDITY_PROVIDER, is_sell_ctez_dex))
+    target = sim.ctez2.context.target
+
+    def ctez_value(amount: int) -> float:
+        return amount * target / Float64.ONE
+
+    if is_sell_ctez_dex:
+        held = ctez_value(deposit)
+        redeemed = ctez_value(event.self_redeemed) + event.proceeds_redeemed
+    else:
+        held = deposit
+        redeemed = event.self_redeemed + ctez_value(event.proceeds_redeemed)
+    subsidy = ctez_value(event.subsidy_redeemed)
+    return LiquidityOutcome(
+        deposit=deposit,
+        self_redeemed=event.self_redeemed,
+        proceeds_redeemed=event.proceeds_redeemed,
+        subsidy_redeemed=event.subsidy_redeemed,
+        pnl=(redeemed + subsidy) / held - 1,
+        subsidy_apr=subsidy / held * SECONDS_PER_YEAR / duration,
+    )
+
+
+def run_order_flow(flow: Sequence[Action], market: Market, now: int = 0) -> RunResult:
+    """Executes the flow on a fresh market and removes the seeding liquidity at the
+    end. Actions the contract would reject are skipped and counted."""
+    sim = setup_market(market, flow_actors(flow), now)
+    start, start_target = sim.now, market.target
+    executed = rejected = 0
+    for action in flow:
+        try:
+            execute(sim, action)
+            executed += 1
+        except (FailwithError, BalanceTooLow):
+            rejected += 1
+    duration = max(1, sim.now - start)
+    sell_ctez = _liquidity_outcome(sim, True, market.sell_ctez_liquidity, duration)
+    sell_tez = _liquidity_outcome(sim, False, market.sell_tez_liquidity, duration)
+    # the removals above ran the housekeeping up to now
+    context = sim.ctez2.context
+    return RunResult(
+        duration=duration,
+        target=context.target,
+        drift=context.drift,
+        target_apr=(context.target / start_target) ** (SECONDS_PER_YEAR / duration) - 1,
+        sell_ctez=sell_ctez,
+        sell_tez=sell_tez,
+        executed=executed,
+        rejected=rejected,
+    )
+
+
+def _run_seed(args: tuple[int, Market, FlowParameters]) -> RunResult:
+    seed, market, p = args
+    return run_order_flow(random_order_flow(Random(seed), p), market)
+
+
+def run_monte_carlo(
+    market: Market,
+    p: FlowParameters,
+    seeds: Sequence[int],
+    workers: Optional[int] = None,
+) -> list[RunResult]:
+    """Runs a random order flow for every seed, in parallel processes"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_run_seed, [(seed, market, p) for seed in seeds], chunksize=max(1, len(seeds) // 64)))
+
+
+# aggregation
+
+class Distribution(NamedTuple):
+    count: int
+    mean: float
+    stdev: float
+    p5: float
+    p50: float
+    p95: float
+
+
+def distribution(values: Sequence[float]) -> Distribution:
+    assert len(values) > 0
+    if len(values) == 1:
+        [value] = values
+        return Distribution(1, value, 0.0, value, value, value)
+    cuts = quantiles(values, n=20, method='inclusive')
+    return Distribution(len(values), fmean(values), pstdev(values), cuts[0], cuts[9], cuts[18])
+
+
+def summarize(results: Sequence[RunResult]) -> dict[str, Distribution]:
+    """Distributions of the drift, the target growth and the liquidity outcomes"""
+    series: dict[str, list[float]] = {
+        'drift': [r.drift for r in results],
+        'target_apr': [r.target_apr for r in results],
+        'rejected_share': [r.rejected / max(1, r.executed + r.rejected) for r in results],
+    }
+    for dex in ('sell_ctez', 'sell_tez'):
+        outcomes = [getattr(r, dex) for r in results if getattr(r, dex) is not None]
+        if outcomes:
+            series[f'{dex}_pnl'] = [o.pnl for o in outcomes]
+            series[f'{dex}_subsidy_apr'] = [o.subsidy_apr for o in outcomes]
+    return {name: distribution(values) for name, values in series.items()}
@@ -0,0 +1,73 @@
+from typing import NamedTuple, Optional, Union
+
+from tests.helpers.model import errors
+from tests.helpers.model.stdctez import (
+    assert_no_tez_in_transaction,
+    assert_with_error,
+    failwith,
+)
+from tests.helpers.model.tezos import Call, SetDelegate, Transaction
+
+
+class Handle(NamedTuple):
+    id: int
+    owner: str
+
+
+class RegisterDeposit(NamedTuple):
+    handle: Handle
+    amount: int
+
+
+# `None` stands for `Any`, a frozenset of addresses for `Whitelist`
+Depositors = Optional[frozenset[str]]
+
+
+class Storage(NamedTuple):
+    admin: str
+    handle: Handle
+    depositors: Depositors
+
+
+class AllowAny(NamedTuple):
+    allow: bool
+
+
+class AllowAccount(NamedTuple):
+    allow: bool
+    depositor: str
+
+
+Edit = Union[AllowAny, AllowAccount]
+
+
+def withdraw(amount: int, to_: str, s: Storage, call: Call) -> tuple[list, Storage]:
+    assert_with_error(call.sender == s.admin, errors.ONLY_MAIN_CONTRACT_CAN_CALL)
+    return [Transaction(to_, 'default', None, amount)], s
+
+
+def delegate(d: Optional[str], s: Storage, call: Call) -> tuple[list, Storage]:
+    assert_no_tez_in_transaction(call)
+    assert_with_error(call.sender == s.handle.owner, errors.ONLY_OWNER_CAN_CALL)
+    return [SetDelegate(d)], s
+
+
+def deposit(s: Storage, call: Call) -> tuple[list, Storage]:
+    is_authorized = call.sender == s.handle.owner or s.depositors is None or call.sender in s.depositors
+    assert_with_error(is_authorized, errors.UNAUTHORIZED_DEPOSITOR)
+    register = RegisterDeposit(s.handle, call.amount)
+    return [Transaction(s.admin, 'register_oven_deposit', register)], s
+
+
+def edit_depositor(edit: Edit, s: Storage, call: Call) -> tuple[list, Storage]:
+    assert_no_tez_in_transaction(call)
+    assert_with_error(call.sender == s.handle.owner, errors.ONLY_OWNER_CAN_CALL)
+    if isinstance(edit, AllowAny):
+        depositors = None if edit.allow else frozenset()
+    elif s.depositors is None:
+        failwith(errors.SET_ANY_OFF_FIRST)
+    elif edit.allow:
+        depositors = s.depositors | {edit.depositor}
+    else:
+        depositors = s.depositors - {edit.depositor}
+    return [], s._replace(depositors=depositors)
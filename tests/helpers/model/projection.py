@@ -0,0 +1,100 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional, Sequence
+
+from tests.helpers.model import ctez2
+from tests.helpers.model.tezos import Call
+
+
+class ReservesChange(NamedTuple):
+    """Sets the self reserves of both dexes from `time` seconds of a projection on"""
+    time: int
+    sell_ctez_reserves: int
+    sell_tez_reserves: int
+
+
+class Scenario(NamedTuple):
+    duration: int
+    cadence: int
+    reserves: Sequence[ReservesChange] = ()
+    record_every: Optional[int] = None
+
+
+class ProjectionPoint(NamedTuple):
+    time: int
+    target: int
+    drift: int
+    Q: int
+    sell_ctez_fee_index: int
+    sell_tez_fee_index: int
+    sell_ctez_subsidy_reserves: int
+    sell_tez_subsidy_reserves: int
+    total_supply: int
+
+
+def _point(time: int, s: ctez2.Storage, total_supply: int) -> ProjectionPoint:
+    return ProjectionPoint(
+        time=time,
+        target=s.context.target,
+        drift=s.context.drift,
+        Q=s.context.Q,
+        sell_ctez_fee_index=s.sell_ctez.fee_index,
+        sell_tez_fee_index=s.sell_tez.fee_index,
+        sell_ctez_subsidy_reserves=s.sell_ctez.subsidy_reserves,
+        sell_tez_subsidy_reserves=s.sell_tez.subsidy_reserves,
+        total_supply=total_supply,
+    )
+
+
+def _apply_reserves(s: ctez2.Storage, change: ReservesChange) -> ctez2.Storage:
+    return s._replace(
+        sell_ctez=s.sell_ctez._replace(self_reserves=change.sell_ctez_reserves),
+        sell_tez=s.sell_tez._replace(self_reserves=change.sell_tez_reserves),
+    )
+
+
+def project(s: ctez2.Storage, total_supply: int, scenario: Scenario) -> list[ProjectionPoint]:
+    """Runs the housekeeping of get_actual_state every `scenario.cadence` seconds
+    for `scenario.duration` seconds, starting at `s.last_update`.
+
+    The subsidies minted at each step are added to the ctez total supply, which
+    drives Q. The dex reserves follow `scenario.reserves`: like a swap would, a
+    change runs the housekeeping with the previous reserves first. A point is
+    recorded every `scenario.record_every` seconds (every step by default) and at
+    the end."""
+    assert scenario.cadence > 0
+    record_every = scenario.record_every or scenario.cadence
+    changes = sorted(scenario.reserves)
+    while changes and changes[0].time <= 0:
+        s = _apply_reserves(s, changes.pop(0))
+    start = s.last_update
+    points = [_point(0, s, total_supply)]
+    next_record = record_every
+    next_tick = 0
+    elapsed = 0
+    while elapsed < scenario.duration:
+        if next_tick <= elapsed:
+            next_tick += scenario.cadence
+        elapsed = min(next_tick, changes[0].time if changes else next_tick, scenario.duration)
+        minted, s = ctez2.get_actual_state(s, Call(now=start + elapsed, ctez_total_supply=total_supply))
+        total_supply += minted
+        while changes and changes[0].time <= elapsed:
+            s = _apply_reserves(s, changes.pop(0))
+        if elapsed >= next_record or elapsed == scenario.duration:
+            points.append(_point(elapsed, s, total_supply))
+            next_record = elapsed - elapsed % record_every + record_every
+    return points
+
+
+def _project(args: tuple[ctez2.Storage, int, Scenario]) -> list[ProjectionPoint]:
+    return project(*args)
+
+
+def project_scenarios(
+    s: ctez2.Storage,
+    total_supply: int,
+    scenarios: Sequence[Scenario],
+    workers: Optional[int] = None,
+) -> list[list[ProjectionPoint]]:
+    """Projects every scenario from the same state, in parallel processes"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_project, [(s, total_supply, scenario) for scenario in scenarios]))
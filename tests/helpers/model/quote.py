@@ -0,0 +1,207 @@
+from math import floor, inf, isfinite
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Union
+
+from tests.helpers.model.context import Context
+from tests.helpers.model.half_dex import Curve, Environment, HalfDex
+from tests.helpers.model.stdctez import ceil_div, clamp_nat
+from tests.helpers.model.tezos import NULL_ADDRESS
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+Column = Union[int, Sequence[int]]
+
+# Every sum of the float Newton step adds nonnegative terms, each a product of the
+# inputs, so with u = 2^-53 and the conversion of the inputs counted, num is within
+# (1 + u)^11 and denom within (1 + u)^9 of their exact values, and num / denom within
+# (1 + u)^21. y / 10^9 takes one rounding. FLOAT_RELATIVE_ERROR covers both with room
+# for the roundings of the checks themselves.
+FLOAT_RELATIVE_ERROR = 2.0**-47
+# above it the float floor can't tell consecutive integers apart
+FLOAT_EXACT_INTEGERS = 2.0**52
+
+
+class _CurveInputs(NamedTuple):
+    x: list[int]
+    q: list[int]
+    Q: list[int]
+    untaxed_y: list[int]
+
+
+class _ScalarMath:
+    minimum = staticmethod(min)
+    maximum = staticmethod(max)
+    isfinite = staticmethod(isfinite)
+
+    @staticmethod
+    def floor(v: float) -> float:
+        # nan or inf once the float path overflows, the result is then not exact
+        return float(floor(v)) if isfinite(v) else v
+
+
+def _to_float(v: int) -> float:
+    """Like float, but inf instead of OverflowError, so the element is computed again"""
+    return float(v) if v < 2**1023 else inf
+
+
+def _broadcast(*columns: Column) -> list[list[int]]:
+    sizes = {len(c) for c in columns if not isinstance(c, int)}
+    if len(sizes) > 1:
+        raise ValueError(f'batch columns have different lengths: {sorted(sizes)}')
+    size = sizes.pop() if sizes else 1
+    return [[c] * size if isinstance(c, int) else [int(v) for v in c] for c in columns]
+
+
+def _curve_inputs(env: Environment, proceeds_amounts: Column, self_reserves: Column, Q: Column, target: Column) -> _CurveInputs:
+    """Applies div_by_target and the exceeding liquidity part of the swap, both exactly"""
+    inputs = _CurveInputs([], [], [], [])
+    for amount, q, context_Q, t in zip(*_broadcast(proceeds_amounts, self_reserves, Q, target)):
+        ctxt = Context(t, 0, context_Q, NULL_ADDRESS)
+        target_Q = env.get_target_self_reserves(ctxt)
+        x, untaxed_y = Curve.swap_using_exceed_liquidity(env.div_by_target(ctxt, amount), q, target_Q)
+        inputs.x.append(x)
+        inputs.q.append(min(q, target_Q))
+        inputs.Q.append(target_Q)
+        inputs.untaxed_y.append(untaxed_y)
+    return inputs
+
+
+def quote_swaps(env: Environment, proceeds_amounts: Column, self_reserves: Column, Q: Column, target: Column) -> list[int]:
+    """Returns Curve.swap_amount for every element of the batch.
+
+    env is sell_ctez_env or sell_tez_env of the ctez2 model, Q and target are the
+    context values. Every argument is either a sequence or a single value shared
+    by the whole batch."""
+    inputs = _curve_inputs(env, proceeds_amounts, self_reserves, Q, target)
+    return [
+        y + (Curve.swap_using_incentivized_liquidity(x, q, Q) if x > 0 else 0)
+        for x, q, Q, y in zip(inputs.x, inputs.q, inputs.Q, inputs.untaxed_y)
+    ]
+
+
+def _is_floor_exact(v: Any, math: Any) -> Any:
+    """Whether every value within FLOAT_RELATIVE_ERROR of v has the floor of v"""
+    frac = v - math.floor(v)
+    margin = v * FLOAT_RELATIVE_ERROR
+    return (v < FLOAT_EXACT_INTEGERS) & (frac >= margin) & (1.0 - frac > margin)
+
+
+def _swap_using_incentivized_liquidity(x: Any, q: Any, Q_m_q: Any, Q: Any, math: Any) -> tuple[Any, Any]:
+    """Float counterpart of Curve.swap_using_incentivized_liquidity, with the
+    denominator written as 4 * ((dq - q + Q)^3 + 20 * Q^3). Also returns whether the
+    result is the exact one: every floor is the exact floor, except in the first two
+    steps where the next step only needs min(y, q), which is q on both sides."""
+    Q_cu = Q * Q * Q
+    y = x
+    exact = True
+    for step in range(3):
+        dq = math.minimum(y, q)
+        s = dq + Q_m_q
+        num = dq * dq * (3 * dq * dq + 8 * dq * Q_m_q + 6 * Q_m_q * Q_m_q) + 80 * Q_cu * x
+        denom = 4 * (s * s * s + 20 * Q_cu)
+        v = num / denom
+        y = math.floor(v)
+        exact = exact & math.isfinite(num) & math.isfinite(denom)
+        if step < 2:
+            exact = exact & (_is_floor_exact(v, math) | (v * (1.0 - 2 * FLOAT_RELATIVE_ERROR) >= q))
+        else:
+            exact = exact & _is_floor_exact(v, math)
+    fee = y / 1e9
+    exact = exact & _is_floor_exact(fee, math)
+    return math.maximum(y - math.floor(fee) - 1, 0.0), exact
+
+
+def float_quote_swaps(env: Environment, proceeds_amounts: Column, self_reserves: Column, Q: Column, target: Column) -> list[int]:
+    """Same as quote_swaps, but runs the Newton steps on float64 (with numpy when
+    it is installed). The amounts are the ones of quote_swaps: the float path bounds
+    its rounding, and the elements where a floor could be off by one are computed
+    again with Curve.swap_using_incentivized_liquidity."""
+    inputs = _curve_inputs(env, proceeds_amounts, self_reserves, Q, target)
+    Q_m_q = [Q - q for q, Q in zip(inputs.q, inputs.Q)]
+    if numpy is not None:
+        columns = (numpy.array([_to_float(v) for v in c], dtype=numpy.float64) for c in (inputs.x, inputs.q, Q_m_q, inputs.Q))
+        with numpy.errstate(over='ignore', invalid='ignore'):
+            incentivized, exact = _swap_using_incentivized_liquidity(*columns, numpy)
+        incentivized, exact = incentivized.tolist(), exact.tolist()
+    else:
+        incentivized, exact = zip(*[
+            _swap_using_incentivized_liquidity(_to_float(x), _to_float(q), _to_float(Q_m_q), _to_float(Q), _ScalarMath)
+            for x, q, Q_m_q, Q in zip(inputs.x, inputs.q, Q_m_q, inputs.Q)
+        ]) if inputs.x else ([], [])
+    amounts = []
+    for x, q, Q, y, incentivized_y, is_exact in zip(inputs.x, inputs.q, inputs.Q, inputs.untaxed_y, incentivized, exact):
+        if x == 0:
+            amounts.append(y)
+        elif is_exact:
+            amounts.append(y + int(incentivized_y))
+        else:
+            amounts.append(y + Curve.swap_using_incentivized_liquidity(x, q, Q))
+    return amounts
+
+
+def paid(dq: int, q: int, Q: int) -> int:
+    """Closed form of the proceeds to pay to buy dq self tokens from the incentivized
+    liquidity q <= Q, rounded up. It is the integral of the marginal price curve."""
+    return ceil_div(dq * (dq**3 + 6*dq*(Q-q)**2 + 4*dq**2*(Q-q) - 4*(q**3 - 3*q**2*Q + 3*q*Q**2 - 21*Q**3)), 80 * Q**3)
+
+
+def _paid_before_target(ctxt: Context, env: Environment, self_amount: int, self_reserves: int) -> int:
+    """Inverts the curve in units of self tokens, before div_by_target is applied"""
+    Q = env.get_target_self_reserves(ctxt)
+    untaxed_y = clamp_nat(self_reserves - Q)
+    if self_amount <= untaxed_y:
+        return self_amount
+    q = min(self_reserves, Q)
+    # the incentivized part must cover the safety margin y - y // 10**9 - 1 too
+    dq = self_amount - untaxed_y + 1
+    dq += dq // (1_000_000_000 - 1)
+    return untaxed_y + paid(min(dq, q), q, Q)
+
+
+def _least_proceeds(swap_amount: Callable[[int], int], self_amount: int, guess: int) -> int:
+    """Returns p such that swap_amount(p) >= self_amount > swap_amount(p - 1),
+    starting from guess and galloping when the guess is off"""
+    if swap_amount(guess) >= self_amount:
+        hi, step = guess, 1
+        while hi - step > 0 and swap_amount(hi - step) >= self_amount:
+            hi, step = hi - step, 2 * step
+        lo = max(hi - step, 0)
+    else:
+        lo, step = guess, 1
+        while swap_amount(lo + step) < self_amount:
+            lo, step = lo + step, 2 * step
+        hi = lo + step
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if swap_amount(mid) >= self_amount:
+            hi = mid
+        else:
+            lo = mid
+    return hi
+
+
+def quote_proceeds(env: Environment, self_amounts: Column, self_reserves: Column, Q: Column, target: Column) -> list[Optional[int]]:
+    """Inverse of quote_swaps: the least proceeds amount to send to buy at least
+    the given amount of self tokens, or None when the dex does not hold that much.
+
+    The closed form of the curve gives the amount up to the rounding of the Newton
+    steps and of div_by_target, which is then settled on Curve.swap_amount itself."""
+    quotes = []
+    for self_amount, q, context_Q, t in zip(*_broadcast(self_amounts, self_reserves, Q, target)):
+        if self_amount > q:
+            quotes.append(None)
+            continue
+        if self_amount == 0:
+            quotes.append(0)
+            continue
+        ctxt = Context(t, 0, context_Q, NULL_ADDRESS)
+        t_dex = HalfDex.empty()._replace(self_reserves=q)
+        x = _paid_before_target(ctxt, env, self_amount, q)
+        # div_by_target is linear up to the rounding, so scale by a large reference amount
+        reference = 2**128
+        guess = ceil_div(x * reference, max(env.div_by_target(ctxt, reference), 1))
+        quotes.append(_least_proceeds(lambda p: Curve.swap_amount(t_dex, ctxt, env, p), self_amount, guess))
+    return quotes
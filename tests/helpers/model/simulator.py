@@ -0,0 +1,159 @@
+from typing import Any, Optional
+
+from tests.helpers.model import ctez2
+from tests.helpers.model import fa12
+from tests.helpers.model import oven
+from tests.helpers.model.stdctez import Float64
+from tests.helpers.model.tezos import (
+    Call,
+    Event,
+    FailwithError,
+    Origination,
+    SetDelegate,
+    Transaction,
+)
+
+
+class BalanceTooLow(Exception):
+    """Raised when a contract would spend more tez than it holds"""
+
+
+class Simulator:
+    """In-process counterpart of a ctez2 + fa12 deployment.
+
+    Keeps the storages of ctez2, fa12 and every originated oven together with the
+    tez balances of the contracts, and executes internal operations depth-first
+    like the protocol does. A call is atomic: if any operation of it fails, the
+    whole state is left untouched. Implicit accounts have unlimited tez, their
+    balances only record the net flow."""
+
+    CTEZ2_ADDRESS = 'KT1Ctez2ModelContract'
+    FA12_ADDRESS = 'KT1Fa12ModelContract'
+
+    def __init__(
+        self,
+        now: int,
+        originator: str,
+        target: int = Float64.ONE,
+        ctez2_address: str = CTEZ2_ADDRESS,
+        fa12_address: str = FA12_ADDRESS,
+    ):
+        self.now = now
+        self.ctez2_address = ctez2_address
+        self.fa12_address = fa12_address
+        self.ctez2 = ctez2.Storage.initial(now, originator, target, fa12_address)
+        self.fa12 = fa12.Storage({}, ctez2_address, 0)
+        self.ovens: dict[str, oven.Storage] = {}
+        self.delegates: dict[str, Optional[str]] = {}
+        self.balances: dict[str, int] = {}
+        self.events: list[Event] = []
+        self._originated = 0
+
+    def advance(self, seconds: int) -> None:
+        self.now += seconds
+
+    def balance(self, address: str) -> int:
+        return self.balances.get(address, 0)
+
+    def ctez_balance(self, address: str) -> int:
+        return fa12.view_balance(address, self.fa12)
+
+    def get_actual_state(self) -> tuple[int, ctez2.Storage]:
+        return ctez2.get_actual_state(self.ctez2, self._call(self.ctez2_address))
+
+    def get_oven(self, owner: str, oven_id: int) -> ctez2.OvenInfo:
+        return self.ctez2.ovens[oven.Handle(oven_id, owner)]
+
+    def call(self, sender: str, destination: str, entrypoint: str, parameter: Any = None, amount: int = 0) -> list:
+        """Executes a call with all its internal operations and returns the
+        operations applied after it, in execution order"""
+        state = self._save()
+        try:
+            return self._apply(sender, Transaction(destination, entrypoint, parameter, amount))
+        except Exception:
+            self._restore(state)
+            raise
+
+    def call_ctez2(self, sender: str, entrypoint: str, parameter: Any = None, amount: int = 0) -> list:
+        return self.call(sender, self.ctez2_address, entrypoint, parameter, amount)
+
+    def call_fa12(self, sender: str, entrypoint: str, parameter: Any = None) -> list:
+        return self.call(sender, self.fa12_address, entrypoint, parameter)
+
+    def _save(self) -> tuple:
+        return (self.ctez2, self.fa12, dict(self.ovens), dict(self.delegates), dict(self.balances), len(self.events), self._originated)
+
+    def _restore(self, state: tuple) -> None:
+        self.ctez2, self.fa12, self.ovens, self.delegates, self.balances, events_count, self._originated = state
+        del self.events[events_count:]
+
+    def _call(self, destination: str, sender: str = None, amount: int = 0, originated_address: str = None) -> Call:
+        return Call(
+            now=self.now,
+            sender=sender if sender is not None else destination,
+            amount=amount,
+            self_address=destination,
+            ctez_total_supply=self.fa12.total_supply,
+            originated_address=originated_address,
+        )
+
+    def _move_tez(self, source: str, destination: str, amount: int) -> None:
+        if amount == 0:
+            return
+        if source.startswith('KT1') and self.balance(source) < amount:
+            raise BalanceTooLow(source)
+        self.balances[source] = self.balance(source) - amount
+        self.balances[destination] = self.balance(destination) + amount
+
+    def _next_oven_address(self) -> str:
+        self._originated += 1
+        return f'KT1OvenModelContract{self._originated}'
+
+    def _apply(self, sender: str, op: Transaction) -> list:
+        self._move_tez(sender, op.destination, op.amount)
+        call = self._call(op.destination, sender, op.amount)
+        if op.destination == self.ctez2_address:
+            if op.entrypoint == 'create_oven':
+                call = call._replace(originated_address=self._next_oven_address())
+            ops, self.ctez2 = ctez2.ENTRYPOINTS[op.entrypoint](op.parameter, self.ctez2, call)
+        elif op.destination == self.fa12_address:
+            ops, self.fa12 = getattr(fa12, _FA12_ENTRYPOINTS[op.entrypoint])(op.parameter, self.fa12, call)
+        elif op.destination in self.ovens:
+            ops, self.ovens[op.destination] = self._apply_oven(op, self.ovens[op.destination], call)
+        else:
+            ops = []
+
+        applied = []
+        for internal_op in ops:
+            applied.append(internal_op)
+            if isinstance(internal_op, Transaction):
+                applied.extend(self._apply(op.destination, internal_op))
+            elif isinstance(internal_op, Origination):
+                self._move_tez(op.destination, internal_op.address, internal_op.balance)
+                self.ovens[internal_op.address] = internal_op.storage
+                self.delegates[internal_op.address] = internal_op.delegate
+            elif isinstance(internal_op, SetDelegate):
+                self.delegates[op.destination] = internal_op.delegate
+            elif isinstance(internal_op, Event):
+                self.events.append(internal_op)
+        return applied
+
+    @staticmethod
+    def _apply_oven(op: Transaction, s: oven.Storage, call: Call) -> tuple[list, oven.Storage]:
+        if op.entrypoint == 'default':
+            return oven.deposit(s, call)
+        if op.entrypoint == 'withdraw':
+            amount, to_ = op.parameter
+            return oven.withdraw(amount, to_, s, call)
+        if op.entrypoint == 'delegate':
+            return oven.delegate(op.parameter, s, call)
+        if op.entrypoint == 'edit_depositor':
+            return oven.edit_depositor(op.parameter, s, call)
+        raise FailwithError(f'unknown oven entrypoint {op.entrypoint}')
+
+
+_FA12_ENTRYPOINTS = {
+    'transfer': 'transfer',
+    'approve': 'approve',
+    'mintOrBurn': 'mint_or_burn',
+}
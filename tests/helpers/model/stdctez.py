@@ -0,0 +1,50 @@
+from tests.helpers.model import errors
+from tests.helpers.model.tezos import Call, FailwithError
+
+
+def clamp_nat(x: int) -> int:
+    return x if x >= 0 else 0
+
+
+def ceil_div(numerator: int, denominator: int) -> int:
+    return -((-numerator) // denominator)
+
+
+class Float64:
+    POW = 64
+    ONE = 2**64
+
+    @staticmethod
+    def mul(a: int, b: int) -> int:
+        return (a * b) >> Float64.POW
+
+    @staticmethod
+    def div(num: int, denom: int) -> int:
+        return (num << Float64.POW) // denom
+
+
+def failwith(error: str):
+    raise FailwithError(error)
+
+
+def assert_with_error(condition: bool, error: str) -> None:
+    if not condition:
+        failwith(error)
+
+
+def assert_no_tez_in_transaction(call: Call) -> None:
+    assert_with_error(call.amount == 0, errors.TEZ_IN_TRANSACTION_DISALLOWED)
+
+
+def subtract_nat(a: int, b: int, error: str) -> int:
+    result = a - b
+    if result < 0:
+        failwith(error)
+    return result
+
+
+def add_int_to_nat(a: int, b: int, error: str) -> int:
+    result = a + b
+    if result < 0:
+        failwith(error)
+    return result
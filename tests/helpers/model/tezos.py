@@ -0,0 +1,47 @@
+from typing import Any, NamedTuple, Optional
+
+
+NULL_ADDRESS = 'tz1Ke2h7sDdakHJQh8WX4Z372du1KChsksyU'
+
+
+class Call(NamedTuple):
+    """Execution environment of a contract call, i.e. what the contract
+    reads through Tezos.get_* and through the viewTotalSupply view"""
+
+    now: int
+    sender: str = NULL_ADDRESS
+    amount: int = 0
+    self_address: str = NULL_ADDRESS
+    ctez_total_supply: int = 0
+    originated_address: Optional[str] = None
+
+
+class Transaction(NamedTuple):
+    destination: str
+    entrypoint: str
+    parameter: Any
+    amount: int = 0
+
+
+class Origination(NamedTuple):
+    address: str
+    delegate: Optional[str]
+    balance: int
+    storage: Any
+
+
+class SetDelegate(NamedTuple):
+    delegate: Optional[str]
+
+
+class Event(NamedTuple):
+    tag: str
+    payload: Any
+
+
+class FailwithError(Exception):
+    """Raised by the model wherever the contract would FAILWITH"""
+
+    def __init__(self, error: str):
+        super().__init__(error)
+        self.error = error
@@ -1,14 +1,22 @@
+import csv
+import fcntl
 import json
+import os
 from pytezos.operation.result import OperationResult
 from pytezos.operation.group import OperationGroup
 from pytezos.client import PyTezosClient
 from tests.helpers.utility import find_op_by_hash, get_consumed_mutez
 
+# files written by this process, the next writes merge into them
+written_files: set[str] = set()
+
 class OperationResultRecorder:
     def __init__(self):
         self.data = {}
 
-    def add_element(self, client: PyTezosClient, key: str, op : OperationGroup):
+    def add_element(self, client: PyTezosClient, key: str, op : OperationGroup, **extra):
+        """Records the costs of the applied operation group, extra values are
+        recorded along with them"""
         opg = find_op_by_hash(client, op)
 
         if key in self.data:
@@ -18,9 +26,33 @@ class OperationResultRecorder:
             'consumed_gas': OperationResult.consumed_gas(opg),
             'consumed_mutez': get_consumed_mutez(client, op),
             'paid_storage_size_diff': OperationResult.paid_storage_size_diff(opg),
+            **extra,
         }
         self.data[key] = value
 
     def write_to_file(self, filename: str):
-        with open(filename, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        """Writes the recorded keys to the file. The first write of a process replaces
+        the records of the previous runs, the next ones merge into it. The processes
+        of parallel_tests, which empties the file first, always merge. The file is
+        locked meanwhile, so they can share it"""
+        # set by scripts/parallel_tests.py
+        merge = filename in written_files or os.environ.get('SANDBOX_NODE_PORT') is not None
+        with open(filename, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            content = f.read() if merge else ''
+            data = json.loads(content) if content.strip() else {}
+            data.update(self.data)
+            f.seek(0)
+            f.truncate()
+            json.dump(data, f, indent=4)
+        written_files.add(filename)
+
+    def write_table_to_file(self, filename: str):
+        """Writes the recorded elements as CSV, one row per key"""
+        columns = list(dict.fromkeys(column for value in self.data.values() for column in value))
+        with open(filename, 'w', newline='') as f:
+            writer = csv.DictWriter(f, ['key', *columns])
+            writer.writeheader()
+            for key, value in self.data.items():
+                writer.writerow({'key': key, **value})
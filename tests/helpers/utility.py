@@ -1,4 +1,8 @@
 import pprint
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from math import gcd
 from pytezos.client import PyTezosClient
 from pytezos.contract.interface import ContractInterface
 from pytezos.operation.group import OperationGroup
@@ -7,7 +11,11 @@ from os.path import dirname
 from os.path import join
 from pytezos.michelson.parse import michelson_to_micheline
 from pytezos.michelson.types.base import MichelsonType
-from typing import Any, Iterator
+from pytezos.rpc.errors import RpcError
+from pytezos.rpc.node import RpcNode
+from requests.adapters import HTTPAdapter
+from typing import Any, Iterable, Iterator, Optional, Union
+from urllib3.util.retry import Retry
 
 
 NULL_ADDRESS = 'tz1Ke2h7sDdakHJQh8WX4Z372du1KChsksyU'
@@ -133,6 +141,162 @@ def iter_balance_updates(op_result: dict[str, any]) -> Iterator[list[dict[str, a
                         yield int_op_result['result']['balance_updates']
 
 
+def iter_lazy_storage_diffs(op_result: dict[str, any]) -> Iterator[list[dict[str, any]]]:
+    for content in OperationResult.iter_contents(op_result):
+        metadata = content.get('metadata', {})
+        results = [metadata.get('operation_result', {})]
+        results += [int_op_result.get('result', {}) for int_op_result in metadata.get('internal_operation_results', [])]
+        for result in results:
+            if result.get('status') == 'applied' and result.get('lazy_storage_diff'):
+                yield result['lazy_storage_diff']
+
+
+def iter_big_map_updates(block: dict[str, any], big_map_id: int) -> Iterator[dict[str, any]]:
+    """Yields the updates applied to the big map in the block in execution order,
+    an update without value is a removal of the key"""
+
+    for operations in block['operations']:
+        for op_result in operations:
+            for diffs in iter_lazy_storage_diffs(op_result):
+                for diff in diffs:
+                    if diff['kind'] == 'big_map' and int(diff['id']) == big_map_id and diff['diff']['action'] == 'update':
+                        yield from diff['diff'].get('updates', [])
+
+
+class PooledRpcNode(RpcNode):
+    """RpcNode keeping its connections alive in a pool, pytezos opens a new one for
+    every request otherwise. The idempotent requests failing with a transient error
+    are retried with a backoff, the injections never are."""
+
+    def __init__(self, uri: str, pool_size: int = 16, headers: Optional[dict[str, str]] = None, retries: int = 3):
+        super().__init__(uri, headers)
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def send(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        return self.session.request(
+            method=method,
+            url=f'{self.uri[0].rstrip("/")}/{path.lstrip("/")}',
+            headers={'content-type': 'application/json', 'user-agent': 'PyTezos', **self.headers},
+            **kwargs,
+        )
+
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        res = self.send(method, path, **kwargs)
+        if res.status_code == 401:
+            raise RpcError(f'Unauthorized: {path}')
+        if res.status_code == 404:
+            raise RpcError(f'Not found: {path}')
+        if res.status_code != 200:
+            raise RpcError.from_response(res)
+        return res
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def get_rpc_values(client: PyTezosClient, paths: Iterable[str], workers: int = 16, retries: int = 3) -> list[Optional[Any]]:
+    """JSON values of the RPC paths in order, None for the missing ones. They are
+    fetched concurrently by `workers` threads, over the pool of the client node when
+    it is a PooledRpcNode and over a pool opened for the call otherwise."""
+
+    node = client.shell.node
+    pooled = node if isinstance(node, PooledRpcNode) else PooledRpcNode(node.uri[0], workers, node.headers, retries)
+
+    def get_value(path: str) -> Optional[Any]:
+        res = pooled.send('GET', path)
+        if res.status_code == 404:
+            return None
+        if res.status_code != 200:
+            raise RpcError.from_response(res)
+        return res.json()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(get_value, paths))
+    finally:
+        if pooled is not node:
+            pooled.close()
+
+
+def get_big_map_values(
+    client: PyTezosClient,
+    big_map_id: int,
+    key_hashes: Iterable[str],
+    block_id: Union[str, int] = 'head',
+    workers: int = 16,
+    retries: int = 3,
+) -> dict[str, Optional[dict]]:
+    """Micheline values of the keys of the big map, None for the missing ones, see
+    get_rpc_values. Pass a block hash rather than 'head' for all the values to come
+    from the same block."""
+
+    key_hashes = list(key_hashes)
+    paths = [f'chains/main/blocks/{block_id}/context/big_maps/{big_map_id}/{key_hash}' for key_hash in key_hashes]
+    return dict(zip(key_hashes, get_rpc_values(client, paths, workers, retries)))
+
+
+def iter_events(block: dict[str, any], source: str) -> Iterator[tuple[str, dict[str, any]]]:
+    """Yields the applied events emitted by the contract in the block in execution
+    order, with the hash of their operation"""
+
+    for operations in block['operations']:
+        for op_result in operations:
+            for content in OperationResult.iter_contents(op_result):
+                for int_op_result in content.get('metadata', {}).get('internal_operation_results', []):
+                    if int_op_result['kind'] == 'event' and int_op_result['source'] == source \
+                            and int_op_result['result']['status'] == 'applied':
+                        yield op_result['hash'], int_op_result
+
+
+def plan_rounds(
+    seconds: int,
+    head_round: int,
+    first_round_duration: int,
+    delay_increment_per_round: int,
+) -> list[int]:
+    """Rounds of the blocks moving the head timestamp exactly `seconds` later, the
+    last one at round 0.
+
+    A level starts the duration of the round of its predecessor after it, and its
+    round r starts the durations of the rounds before r later. Each block takes the
+    latest round after which the next level still starts in time, and an earlier one
+    when the rest of the gap can't be reached from it."""
+
+    def round_duration(round: int) -> int:
+        return first_round_duration + round * delay_increment_per_round
+
+    def round_start(predecessor_round: int, round: int) -> int:
+        return round_duration(predecessor_round) + round * first_round_duration \
+            + delay_increment_per_round * round * (round - 1) // 2
+
+    @cache
+    def plan(seconds: int, head_round: int) -> Optional[tuple[int, ...]]:
+        if seconds == round_duration(head_round):
+            return (0,)
+        if seconds < round_start(head_round, 0) + round_duration(0):
+            return None
+        round = 0
+        while round_start(head_round, round + 1) + round_duration(round + 1) <= seconds:
+            round += 1
+        for r in range(round, -1, -1):
+            rounds = plan(seconds - round_start(head_round, r), r)
+            if rounds is not None:
+                return (r, *rounds)
+        return None
+
+    if seconds <= 0:
+        return []
+    # every round starts a multiple of the gcd of the durations later
+    rounds = plan(seconds, head_round) if seconds % gcd(first_round_duration, delay_increment_per_round) == 0 else None
+    if rounds is None:
+        raise ValueError(f'Cannot move the head timestamp {seconds} seconds later after a round {head_round} block')
+    return list(rounds)
+
+
 def get_consumed_mutez(client: PyTezosClient, opg: OperationGroup) -> int:
     fee = 0
     op_result = find_op_by_hash(client, opg)
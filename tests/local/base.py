@@ -0,0 +1,116 @@
+from contextlib import contextmanager
+from typing import Callable, Optional, Union
+from unittest import TestCase
+
+from pytezos.contract.call import ContractCall
+from pytezos.operation.group import OperationGroup
+from pytezos.rpc import RpcError
+
+from tests.ctez2.mixins import Ctez2SetupMixin
+from tests.helpers.addressable import Addressable, get_address
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.local_chain import LocalChain, LocalClient
+from tests.oven.mixins import OvenSetupMixin
+
+
+class LocalTestCase(Ctez2SetupMixin, TestCase):
+    """Counterpart of Ctez2BaseTestCase running the contracts on a LocalChain, the test
+    bodies of the mixins run on both"""
+
+    ACCOUNT_BALANCE = 10_000_000_000
+
+    def setUp(self) -> None:
+        self.chain = LocalChain()
+        self.manager = self.chain.client(balance=self.ACCOUNT_BALANCE)
+
+    def bootstrap_account(self, balance: Optional[int] = None) -> LocalClient:
+        return self.chain.client(balance=balance if balance is not None else self.ACCOUNT_BALANCE)
+
+    def bootstrap_accounts(self, count: int, balance: Optional[int] = None) -> list[LocalClient]:
+        return [self.bootstrap_account(balance) for _ in range(count)]
+
+    def bootstrap_baker(self) -> LocalClient:
+        # delegates aren't checked to be registered on a LocalChain
+        return self.bootstrap_account()
+
+    def send(self, call: Union[ContractCall, OperationGroup]) -> list[dict]:
+        return self.chain.send(call)
+
+    def dry_run(self, call: Union[ContractCall, OperationGroup]) -> list[dict]:
+        return self.chain.run(call)
+
+    def get_consumed_mutez(self, client: LocalClient, operations: list[dict]) -> int:
+        # there are no fees on a LocalChain
+        return 0
+
+    def bake_block(self) -> None:
+        self.chain.bake_block()
+
+    def bake_blocks(self, count: int) -> None:
+        for _ in range(count):
+            self.bake_block()
+
+    def advance_time(self, seconds: int) -> None:
+        self.chain.bake_block(seconds)
+
+    def deploy_ctez2(
+        self,
+        last_update: Optional[int] = None,
+        target_ctez_price = 1.0
+    ) -> Ctez2:
+        last_update = last_update if last_update is not None else self.chain.now
+        operations = self.send(Ctez2.originate(self.manager, last_update, target_ctez_price))
+        self.bake_block()
+        return Ctez2.from_address(self.manager, operations[0]['originated_contract'])
+
+    def deploy_fa12(
+        self,
+        admin: Addressable,
+        balances: dict[Addressable, int] = {},
+        allowances: Optional[list[tuple[Addressable, Addressable, int]]] = None
+    ) -> Fa12:
+        operations = self.send(Fa12.originate(self.manager, admin, balances, allowances or []))
+        self.bake_block()
+        return Fa12.from_address(self.manager, operations[0]['originated_contract'])
+
+    def default_setup(
+        self,
+        tez_liquidity: int = 0,
+        ctez_liquidity: int = 0,
+        get_ctez_token_balances: Optional[Callable[[LocalClient, LocalClient], dict[Addressable, int]]] = None,
+        ctez_total_supply: Optional[int] = None,
+        target_ctez_price: float = 1.0,
+        bootstrap_all_tez_balances = False, # every test runs on a fresh chain, the accounts get ACCOUNT_BALANCE anyway
+    ) -> tuple[Ctez2, Fa12, LocalClient, LocalClient, LocalClient]:
+        account1, account2, donor = self.bootstrap_accounts(3)
+        balances = get_ctez_token_balances(account1, account2) if get_ctez_token_balances is not None else {}
+        ctez2, ctez_token = self.deploy_default_setup(donor, tez_liquidity, ctez_liquidity, balances, ctez_total_supply, target_ctez_price)
+        return ctez2, ctez_token, account1, account2, donor
+
+    @contextmanager
+    def raises_michelson_error(self, error_message):
+        with self.assertRaises(RpcError) as r:
+            yield r
+
+        failed_with = self.extract_runtime_failwith(r.exception)
+        self.assertEqual(error_message, failed_with)
+
+    def extract_runtime_failwith(self, e: RpcError):
+        return e.args[-1]['with']['string']
+
+    def get_future_timestamp(self) -> int:
+        return self.chain.now + 1000
+
+    def get_passed_timestamp(self) -> int:
+        return self.chain.now - 1000
+
+    def get_balance_mutez(self, client_or_contract: Addressable) -> int:
+        return self.chain.balances.get(get_address(client_or_contract), 0)
+
+    def get_contract_delegate(self, contract: Addressable) -> Optional[str]:
+        return self.chain.contracts[get_address(contract)].delegate
+
+
+class LocalOvenBaseTestCase(OvenSetupMixin, LocalTestCase):
+    pass
@@ -0,0 +1,154 @@
+import asyncio
+import inspect
+from os.path import join
+from typing import Any
+from unittest import TestCase
+from pytezos import pytezos
+from pytezos.context.impl import ExecutionContext
+from pytezos.contract.interface import ContractInterface
+from pytezos.michelson.parse import michelson_to_micheline
+from pytezos.rpc.node import RpcNode
+from pytezos.rpc.shell import ShellQuery
+
+from tests.helpers.contracts.async_contract import AsyncClient, AsyncContractHelper, AsyncCtez2, AsyncFa12, AsyncOven
+from tests.helpers.contracts.contract import ContractHelper
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.contracts.oven.oven import Oven
+from tests.helpers.utility import TEST_ADDRESSES_SET, get_build_dir
+from tests.local.base import LocalTestCase
+
+ADDRESS = TEST_ADDRESSES_SET[0]
+OTHER_ADDRESS = TEST_ADDRESSES_SET[1]
+# arguments of every method in CALLS
+CALLS_ARGS: dict[type, dict[str, tuple]] = {
+    AsyncCtez2: {
+        'get_contract_at_block': (),
+        'get_ovens_big_map_type': (),
+        'decode_oven_handle': ({'prim': 'Pair', 'args': [{'int': '1'}, {'string': ADDRESS}]},),
+        'decode_oven': ({'prim': 'Pair', 'args': [{'int': '1'}, {'int': '2'}, {'string': OTHER_ADDRESS}, {'int': '3'}]},),
+        'decode_event': ({'tag': 'unknown'},),
+        'set_ctez_fa12_address': (ADDRESS,),
+        'create_oven': (0, None, None),
+        'register_oven_deposit': (0, ADDRESS, 1),
+        'withdraw_from_oven': (0, 1, ADDRESS),
+        'mint_or_burn': (0, 1),
+        'liquidate_oven': (ADDRESS, 0, 1, ADDRESS),
+        'add_ctez_liquidity': (ADDRESS, 1, 0, 0),
+        'add_tez_liquidity': (ADDRESS, 0, 0),
+        'remove_ctez_liquidity': (ADDRESS, 1, 0, 0, 0, 0),
+        'remove_tez_liquidity': (ADDRESS, 1, 0, 0, 0, 0),
+        'collect_from_tez_liquidity': (ADDRESS,),
+        'collect_from_ctez_liquidity': (ADDRESS,),
+        'tez_to_ctez': (ADDRESS, 0, 0),
+        'ctez_to_tez': (ADDRESS, 1, 0, 0),
+    },
+    AsyncFa12: {
+        'transfer': (ADDRESS, OTHER_ADDRESS, 1),
+        'approve': (ADDRESS, 1),
+        'mintOrBurn': (1, ADDRESS),
+    },
+    AsyncOven: {
+        'deposit': (),
+        'oven_withdraw': (1, ADDRESS),
+        'oven_delegate': (None,),
+        'oven_edit_depositor': (True,),
+    },
+}
+# creating contracts isn't part of the async helpers
+NOT_ASYNC = {'originate', 'from_opg'}
+
+
+class RequestsNode(RpcNode):
+    """Node failing every request, keeping the paths requested"""
+
+    def __init__(self):
+        super().__init__('http://unreachable')
+        self.paths: list[str] = []
+
+    def request(self, method: str, path: str, **kwargs: Any) -> Any:
+        self.paths.append(path)
+        raise AssertionError(f'Requested {path}')
+
+
+def get_methods(cls: type) -> set[str]:
+    return {
+        name for name, member in inspect.getmembers(cls, lambda m: inspect.isfunction(m) or inspect.ismethod(m))
+        if not name.startswith('_')
+    }
+
+
+def offline_helper(helper_type: type[ContractHelper], code: list, node: RequestsNode, **init_params: Any) -> Any:
+    """Helper whose code is given, so that only its reads request the node"""
+    client = pytezos.using(shell=ShellQuery(node))
+    context = ExecutionContext(address=ADDRESS, shell=client.shell, key=client.key, script={'code': code})
+    return helper_type(contract=ContractInterface.from_context(context), client=client, address=ADDRESS, **init_params)
+
+
+class AsyncHelpersTestCase(TestCase):
+    def test_should_classify_every_method_of_the_helpers(self) -> None:
+        for async_type in (AsyncCtez2, AsyncFa12, AsyncOven):
+            helper_methods = get_methods(async_type.helper_type) - NOT_ASYNC
+            own_methods = get_methods(async_type) & helper_methods
+            assert not async_type.READS & async_type.CALLS
+            assert helper_methods == async_type.READS | async_type.CALLS | own_methods, async_type
+            assert async_type.CALLS == set(CALLS_ARGS[async_type])
+
+    def test_should_build_the_calls_without_the_node(self) -> None:
+        node = RequestsNode()
+        with open(join(get_build_dir(), 'ctez_2.tz')) as f:
+            ctez2 = offline_helper(Ctez2, michelson_to_micheline(f.read()), node)
+        with open(join(get_build_dir(), 'fa12.tz')) as f:
+            fa12 = offline_helper(Fa12, michelson_to_micheline(f.read()), node)
+        oven = offline_helper(Oven, ctez2.get_oven_code(), node)
+
+        for async_helper in (AsyncCtez2(ctez2, AsyncClient(ctez2.client)), AsyncFa12(fa12, AsyncClient(fa12.client)), AsyncOven(oven, AsyncClient(oven.client))):
+            for name, args in CALLS_ARGS[type(async_helper)].items():
+                getattr(async_helper, name)(*args)
+        assert node.paths == []
+
+    def test_should_run_the_reads_off_the_event_loop(self) -> None:
+        node = RequestsNode()
+        with open(join(get_build_dir(), 'fa12.tz')) as f:
+            helper = offline_helper(Fa12, michelson_to_micheline(f.read()), node)
+        fa12 = AsyncFa12(helper, AsyncClient(helper.client))
+
+        read = fa12.view_total_supply()
+        assert inspect.iscoroutine(read)
+        read.close()
+        assert node.paths == []
+        with self.assertRaises(AttributeError):
+            fa12.originate
+
+
+class LocalAsyncTestCase(LocalTestCase):
+    def test_should_read_and_send_through_async_helpers(self) -> None:
+        ctez2, ctez_token, owner, *_ = self.default_setup(
+            ctez_liquidity = 1_000_000,
+        )
+        client = AsyncClient(owner, send=self.chain.send)
+
+        async def scenario() -> None:
+            async_ctez2 = await AsyncCtez2.from_address(client, ctez2.address)
+            await async_ctez2.send(async_ctez2.create_oven(0, None, None).with_amount(1_000_000))
+            await async_ctez2.send(async_ctez2.mint_or_burn(0, 500_000))
+
+            async_ctez_token = await async_ctez2.get_ctez_token()
+            oven = await async_ctez2.get_oven_contract(owner, 0)
+            oven_info, dex, balance, handle = await asyncio.gather(
+                async_ctez2.get_oven(owner, 0),
+                async_ctez2.get_sell_ctez_dex(),
+                async_ctez_token.view_balance(owner),
+                oven.get_handle(),
+            )
+            assert oven_info == ctez2.get_oven(owner, 0)
+            assert oven_info.ctez_outstanding == 500_000
+            assert dex == ctez2.get_sell_ctez_dex()
+            assert balance == ctez_token.view_balance(owner) == 500_000
+            assert handle == (0, owner.key.public_key_hash())
+            assert await client.get_balance_mutez(oven.address) == 1_000_000
+
+            with self.raises_michelson_error(Ctez2.Errors.OVEN_ALREADY_EXISTS):
+                await async_ctez2.send(async_ctez2.create_oven(0, None, None))
+
+        asyncio.run(scenario())
@@ -0,0 +1,151 @@
+from pytezos.michelson.instructions.arithmetic import SubMutezInstruction
+from pytezos.michelson.types.big_map import BigMapType
+
+from tests.ctez2.mixins import Ctez2CreateOvenTests, Ctez2MintOrBurnTests, Ctez2RegisterOvenDepositTests, Ctez2WithdrawTests
+from tests.helpers.addressable import get_address
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.model import ctez2 as ctez2_model
+from tests.helpers.model.context import Context
+from tests.helpers.model.oven import Handle
+from tests.helpers.model.tezos import Call
+from tests.helpers.utility import TEST_ADDRESSES_SET
+from tests.local.base import LocalTestCase
+
+
+class LocalCtez2TestCase(LocalTestCase):
+    def test_should_swap_tez_to_ctez(self) -> None:
+        ctez2, ctez_token, sender, receiver, *_ = self.default_setup(
+            ctez_liquidity = 100_000_000,
+        )
+
+        sent_tez = 1_000_000
+        prev_sender_tez_balance = self.get_balance_mutez(sender)
+        prev_ctez_dex = ctez2.get_sell_ctez_dex()
+        self.send(ctez2.using(sender).tez_to_ctez(receiver, 0, self.get_future_timestamp()).with_amount(sent_tez))
+        self.bake_block()
+
+        ctez_dex = ctez2.get_sell_ctez_dex()
+        bought_ctez = ctez_token.view_balance(receiver)
+        assert bought_ctez > 0
+        assert ctez_dex.self_reserves == prev_ctez_dex.self_reserves - bought_ctez
+        assert ctez_dex.proceeds_reserves == prev_ctez_dex.proceeds_reserves + sent_tez
+        assert self.get_balance_mutez(sender) == prev_sender_tez_balance - sent_tez
+
+        with self.raises_michelson_error(Ctez2.Errors.DEADLINE_HAS_PASSED):
+            self.dry_run(ctez2.using(sender).tez_to_ctez(receiver, 0, self.get_passed_timestamp()).with_amount(sent_tez))
+
+    def test_should_revert_whole_operation_group_on_failure(self) -> None:
+        ctez2, ctez_token, owner, *_ = self.default_setup()
+        prev_owner_tez_balance = self.get_balance_mutez(owner)
+
+        with self.raises_michelson_error(Fa12.Errors.NOT_ENOUGH_ALLOWANCE):
+            self.send(owner.bulk(
+                ctez2.create_oven(0, None, None).with_amount(1_000_000),
+                ctez2.mint_or_burn(0, 100_000),
+                ctez2.add_ctez_liquidity(owner, 100_000, 0, self.get_future_timestamp()),
+            ))
+
+        assert self.get_balance_mutez(owner) == prev_owner_tez_balance
+        assert ctez_token.view_total_supply() == 0
+        with self.raises_michelson_error(Ctez2.Errors.OVEN_NOT_EXISTS):
+            self.dry_run(ctez2.using(owner).mint_or_burn(0, 1))
+
+    def test_should_move_target_with_time(self) -> None:
+        ctez2, *_ = self.default_setup(
+            ctez_liquidity = 10_000_000,
+            tez_liquidity = 10_000,
+        )
+        prev_target = ctez2.get_target()
+
+        # the first housekeeping sets the drift, the next ones move the target with it
+        for _ in range(3):
+            self.advance_time(24 * 60 * 60)
+            self.send(ctez2.using(self.manager).tez_to_ctez(self.manager, 0, self.get_future_timestamp()).with_amount(1_000))
+
+        assert ctez2.get_context().drift != 0
+        assert ctez2.get_target() != prev_target
+
+    def test_should_get_ovens_and_liquidity_owners_in_bulk(self) -> None:
+        ctez2, _, owner, depositor, *_ = self.default_setup(
+            tez_liquidity = 1_000_000,
+        )
+        self.send(owner.bulk(*[ctez2.create_oven(oven_id, None, None).with_amount(oven_id) for oven_id in range(3)]))
+        self.send(ctez2.using(depositor).add_tez_liquidity(owner, 0, self.get_future_timestamp()).with_amount(1_000))
+
+        ovens = ctez2.get_ovens_by_handles([(0, owner), (2, owner), (1, depositor)])
+        owners = ctez2.get_tez_liquidity_owners([owner, depositor])
+
+        assert list(ovens) == [(0, owner.key.public_key_hash()), (2, owner.key.public_key_hash()), (1, depositor.key.public_key_hash())]
+        assert list(ovens.values()) == [ctez2.get_oven(owner, 0), ctez2.get_oven(owner, 2), None]
+        assert owners == {
+            owner.key.public_key_hash(): ctez2.get_tez_liquidity_owner(owner),
+            depositor.key.public_key_hash(): None,
+        }
+        assert ctez2.get_ctez_liquidity_owners([owner]) == {owner.key.public_key_hash(): None}
+
+    def test_should_decode_oven_storages_with_the_created_contract_type(self) -> None:
+        ctez2, _, owner, depositor, *_ = self.default_setup()
+        self.send(ctez2.using(owner).create_oven(3, None, None))
+        self.send(ctez2.using(depositor).create_oven(5, None, [TEST_ADDRESSES_SET[0]]))
+
+        storage_type = ctez2.get_oven_storage_type()
+
+        for client, oven_id in [(owner, 3), (depositor, 5)]:
+            address = ctez2.get_oven(client, oven_id).address
+            storage = storage_type.from_micheline_value(self.chain.contracts[address].storage).to_python_object()
+            assert storage['handle'] == {'id': oven_id, 'owner': client.key.public_key_hash()}
+            assert storage['admin'] == ctez2.address
+
+    def test_should_not_change_the_pytezos_types_of_other_programs(self) -> None:
+        prev_update, prev_execute = BigMapType.update, SubMutezInstruction.execute
+        ctez2, *_ = self.default_setup()
+
+        program = self.chain.contracts[ctez2.address].program
+        ovens_type = program.storage.args[0].args[0]
+        assert issubclass(ovens_type, BigMapType) and ovens_type.update is not prev_update
+        assert BigMapType.update is prev_update
+        assert SubMutezInstruction.execute == prev_execute
+
+    def test_should_evaluate_views_with_the_model(self) -> None:
+        ctez2, ctez_token, _, _, donor = self.default_setup(
+            ctez_liquidity = 10_000_000,
+            tez_liquidity = 10_000,
+        )
+        self.advance_time(24 * 60 * 60)
+        self.send(ctez2.using(self.manager).tez_to_ctez(self.manager, 0, self.get_future_timestamp()).with_amount(1_000))
+        self.advance_time(24 * 60 * 60)
+
+        s = ctez2.get_model_storage([(0, donor), (1, donor)])
+        call = Call(now=self.manager.now(), ctez_total_supply=ctez_token.view_total_supply())
+        handle = Handle(0, get_address(donor))
+
+        state = ctez2.get_current_state()
+        assert ctez2_model.get_current_state(None, s, call) == ctez2_model.CurrentState(
+            last_update = state['last_update'],
+            context = Context(state['context']['target'], state['context']['drift'], state['context']['_Q'], state['context']['ctez_fa12_address']),
+            sell_ctez = ctez2_model.HalfDexState(**state['sell_ctez']),
+            sell_tez = ctez2_model.HalfDexState(**state['sell_tez']),
+        )
+        oven = ctez2.contract.get_oven_state(handle).run_view()
+        assert ctez2_model.get_oven_state(handle, s, call) == ctez2_model.OvenInfo(**oven)
+        for is_sell_ctez_dex in [True, False]:
+            tokens = ctez2.contract.calc_tokens_to_sell({'is_sell_ctez_dex': is_sell_ctez_dex, 'proceeds_amount': 5_000}).run_view()
+            assert ctez2_model.calc_tokens_to_sell(ctez2_model.CalcTokensToSell(is_sell_ctez_dex, 5_000), s, call) == tokens
+        assert Handle(1, get_address(donor)) not in s.ovens
+
+
+class LocalCtez2CreateOvenTestCase(Ctez2CreateOvenTests, LocalTestCase):
+    pass
+
+
+class LocalCtez2MintOrBurnTestCase(Ctez2MintOrBurnTests, LocalTestCase):
+    pass
+
+
+class LocalCtez2RegisterOvenDepositTestCase(Ctez2RegisterOvenDepositTests, LocalTestCase):
+    pass
+
+
+class LocalCtez2WithdrawTestCase(Ctez2WithdrawTests, LocalTestCase):
+    pass
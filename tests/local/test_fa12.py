@@ -0,0 +1,31 @@
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.local.base import LocalTestCase
+
+
+class LocalFa12TestCase(LocalTestCase):
+    def test_should_transfer_with_allowance(self) -> None:
+        owner, spender, receiver = self.bootstrap_accounts(3)
+        fa12 = self.deploy_fa12(self.manager, {owner: 1_000}, [(owner, spender, 300)])
+
+        self.send(fa12.using(spender).transfer(owner, receiver, 200))
+        self.bake_block()
+
+        assert fa12.view_balance(owner) == 800
+        assert fa12.view_balance(receiver) == 200
+        assert fa12.view_allowance(owner, spender) == 100
+        assert fa12.view_total_supply() == 1_000
+        with self.raises_michelson_error(Fa12.Errors.NOT_ENOUGH_ALLOWANCE):
+            self.dry_run(fa12.using(spender).transfer(owner, receiver, 101))
+        with self.raises_michelson_error(Fa12.Errors.NOT_ENOUGH_BALANCE):
+            self.dry_run(fa12.using(owner).transfer(owner, receiver, 801))
+
+    def test_should_mint_only_by_admin(self) -> None:
+        admin, receiver = self.bootstrap_accounts(2)
+        fa12 = self.deploy_fa12(admin)
+
+        self.send(fa12.using(admin).mintOrBurn(500, receiver))
+
+        assert fa12.view_balance(receiver) == 500
+        assert fa12.view_total_supply() == 500
+        with self.raises_michelson_error(Fa12.Errors.ONLY_ADMIN):
+            self.dry_run(fa12.using(receiver).mintOrBurn(500, receiver))
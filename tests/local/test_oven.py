@@ -0,0 +1,18 @@
+from tests.local.base import LocalOvenBaseTestCase
+from tests.oven.mixins import OvenDelegateTests, OvenDepositTests, OvenEditDepositorTests, OvenWithdrawTests
+
+
+class LocalOvenDelegateTestCase(OvenDelegateTests, LocalOvenBaseTestCase):
+    pass
+
+
+class LocalOvenDepositTestCase(OvenDepositTests, LocalOvenBaseTestCase):
+    pass
+
+
+class LocalOvenEditDepositorTestCase(OvenEditDepositorTests, LocalOvenBaseTestCase):
+    pass
+
+
+class LocalOvenWithdrawTestCase(OvenWithdrawTests, LocalOvenBaseTestCase):
+    pass
@@ -0,0 +1,111 @@
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pytezos import pytezos
+from pytezos.rpc.errors import RpcError
+from pytezos.rpc.shell import ShellQuery
+from unittest import TestCase
+
+from tests.helpers.utility import PooledRpcNode, get_big_map_values, get_rpc_values
+
+BLOCK_HASH = 'BLockGenesisGenesisGenesisGenesisGenesisf79b5d1CoW2'
+
+
+class StubNode(BaseHTTPRequestHandler):
+    """Answers {"path": <path>} for every path, 404 for the paths containing
+    'missing', 400 for 'invalid', and 503 to the first `failures[path]` requests"""
+
+    protocol_version = 'HTTP/1.1'
+    server: 'StubServer'
+
+    def do_GET(self) -> None:
+        with self.server.lock:
+            self.server.requests[self.path] += 1
+            self.server.ports.add(self.client_address[1])
+            failing = self.server.failures[self.path] > 0
+            self.server.failures[self.path] -= 1
+        if failing:
+            self.reply(503, [{'kind': 'temporary', 'id': 'unavailable'}])
+        elif 'missing' in self.path:
+            self.reply(404, [])
+        elif 'invalid' in self.path:
+            self.reply(400, [{'kind': 'permanent', 'id': 'invalid'}])
+        else:
+            self.reply(200, {'path': self.path})
+
+    def reply(self, status: int, value: object) -> None:
+        body = json.dumps(value).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), StubNode)
+        self.lock = threading.Lock()
+        self.requests: Counter[str] = Counter()
+        self.failures: Counter[str] = Counter()
+        self.ports: set[int] = set()
+
+
+class RpcValuesTestCase(TestCase):
+    def setUp(self) -> None:
+        self.server = StubServer()
+        self.uri = f'http://127.0.0.1:{self.server.server_address[1]}'
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_should_read_every_key_at_the_block(self) -> None:
+        client = pytezos.using(shell=self.uri)
+        key_hashes = [f'expr{i}' for i in range(100)] + ['expr_missing']
+
+        values = get_big_map_values(client, 7, key_hashes, BLOCK_HASH, workers=4)
+
+        assert list(values) == key_hashes
+        assert values['expr_missing'] is None
+        for key_hash in key_hashes[:-1]:
+            assert values[key_hash] == {'path': f'/chains/main/blocks/{BLOCK_HASH}/context/big_maps/7/{key_hash}'}
+        assert all(f'/blocks/{BLOCK_HASH}/' in path for path in self.server.requests)
+        assert len(self.server.ports) <= 4
+
+    def test_should_retry_transient_errors(self) -> None:
+        client = pytezos.using(shell=self.uri)
+        self.server.failures['/flaky'] = 2
+
+        assert get_rpc_values(client, ['flaky'], retries=2) == [{'path': '/flaky'}]
+        assert self.server.requests['/flaky'] == 3
+
+        self.server.failures['/down'] = 3
+        with self.assertRaises(RpcError):
+            get_rpc_values(client, ['down'], retries=2)
+
+    def test_should_raise_other_errors(self) -> None:
+        client = pytezos.using(shell=self.uri)
+
+        with self.assertRaises(RpcError):
+            get_rpc_values(client, ['a', 'invalid', 'b'])
+        assert self.server.requests['/invalid'] == 1
+
+    def test_should_share_the_pool_of_the_client_node(self) -> None:
+        node = PooledRpcNode(self.uri, pool_size=2)
+        self.addCleanup(node.close)
+        client = pytezos.using(shell=ShellQuery(node))
+
+        for _ in range(3):
+            assert get_rpc_values(client, [f'path{i}' for i in range(20)], workers=2) == [
+                {'path': f'/path{i}'} for i in range(20)
+            ]
+        assert client.shell.node.request('GET', 'path').json() == {'path': '/path'}
+        with self.assertRaises(RpcError):
+            client.shell.node.request('GET', 'missing')
+        assert len(self.server.ports) <= 2
@@ -0,0 +1,68 @@
+from math import ceil, floor
+from typing import Callable, Optional
+from unittest import TestCase
+
+from tests.helpers.model import ctez2, fa12
+from tests.helpers.model.context import Fa12Transfer
+from tests.helpers.model.simulator import Simulator
+from tests.helpers.model.stdctez import Float64
+
+
+class ModelTestCase(TestCase):
+    """Counterpart of Ctez2BaseTestCase running on the model, one block is one second
+    and every setup step takes the same number of blocks as on the sandbox"""
+
+    GENESIS_TIMESTAMP = 1_700_000_000
+    ORIGINATOR = 'tz1Originator'
+    ACCOUNT_1 = 'tz1Account1'
+    ACCOUNT_2 = 'tz1Account2'
+    DONOR = 'tz1Donor'
+
+    def bake_block(self) -> None:
+        self.sim.advance(1)
+
+    def bake_blocks(self, count: int) -> None:
+        self.sim.advance(count)
+
+    def get_future_timestamp(self) -> int:
+        return self.sim.now + 1000
+
+    def get_passed_timestamp(self) -> int:
+        return self.sim.now - 1000
+
+    def default_setup(
+        self,
+        tez_liquidity: int = 0,
+        ctez_liquidity: int = 0,
+        get_ctez_token_balances: Optional[Callable[[str, str], dict[str, int]]] = None,
+        ctez_total_supply: Optional[int] = None,
+        target_ctez_price: float = 1.0,
+    ) -> tuple[Simulator, str, str, str]:
+        target = floor(target_ctez_price * Float64.ONE)
+        # last_update is the head timestamp at origination, then ctez2 origination, fa12 origination
+        # and set_ctez_fa12_address take one block each, so the donor bulk lands in the fourth block
+        self.sim = sim = Simulator(self.GENESIS_TIMESTAMP, self.ORIGINATOR, target)
+        self.bake_blocks(4)
+        account1, account2, donor = self.ACCOUNT_1, self.ACCOUNT_2, self.DONOR
+
+        balances = get_ctez_token_balances(account1, account2) if get_ctez_token_balances is not None else {}
+        rest_supply = ctez_total_supply if ctez_total_supply is not None else sum(balances.values()) + ctez_liquidity
+        tez_deposit = ceil(rest_supply * target_ctez_price * 16/15)
+
+        if (tez_deposit > 0) or (tez_liquidity > 0):
+            deadline = self.get_future_timestamp()
+            sim.call_ctez2(donor, 'create_oven', ctez2.CreateOven(0, None, None), tez_deposit)
+            sim.call_ctez2(donor, 'mint_or_burn', ctez2.MintOrBurnCtez(0, rest_supply))
+            if ctez_liquidity > 0:
+                sim.call_fa12(donor, 'approve', fa12.Approve(sim.ctez2_address, ctez_liquidity))
+                sim.call_ctez2(donor, 'add_ctez_liquidity', ctez2.AddCtezLiquidity(donor, ctez_liquidity, 0, deadline))
+            if tez_liquidity > 0:
+                sim.call_ctez2(donor, 'add_tez_liquidity', ctez2.AddTezLiquidity(donor, 0, deadline), tez_liquidity)
+            self.bake_block()
+
+        if len(balances):
+            for receiver, amount in balances.items():
+                sim.call_fa12(donor, 'transfer', Fa12Transfer(donor, receiver, amount))
+            self.bake_block()
+
+        return sim, account1, account2, donor
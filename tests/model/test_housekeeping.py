@@ -0,0 +1,144 @@
+from math import ceil, floor
+from parameterized import parameterized
+
+from tests.ctez2.test_cases import ctez_dex_subsidies, drift_and_target, tez_dex_subsidies
+from tests.helpers.model import ctez2, fa12
+from tests.helpers.model.half_dex import LiquidityOwner
+from tests.helpers.model.stdctez import Float64
+from tests.model.base import ModelTestCase
+
+
+class ModelHousekeepingTestCase(ModelTestCase):
+    @parameterized.expand(ctez_dex_subsidies)
+    def test_should_mint_subsidies_for_ctez_dex_correctly(self, _, ctez_liquidity, target_ctez_liquidity, target_price, expected_subsidies_per_sec) -> None:
+        sim, sender, *_ = self.default_setup(
+            target_ctez_price = target_price,
+            ctez_liquidity = ctez_liquidity,
+            ctez_total_supply = target_ctez_liquidity * 20,
+            tez_liquidity = floor(target_ctez_liquidity * target_price),
+        )
+        prev_sell_ctez_dex = sim.ctez2.sell_ctez
+        prev_total_supply = sim.fa12.total_supply
+
+        sim.call_ctez2(sender, 'collect_from_ctez_liquidity', sender)
+
+        ctez_dex_subsidies = sim.ctez2.sell_ctez.subsidy_reserves - prev_sell_ctez_dex.subsidy_reserves
+        assert sim.ctez2.context.Q == target_ctez_liquidity
+        assert ctez_dex_subsidies == expected_subsidies_per_sec
+        assert sim.fa12.total_supply == prev_total_supply + ctez_dex_subsidies
+
+    @parameterized.expand(tez_dex_subsidies)
+    def test_should_mint_subsidies_for_tez_dex_correctly(self, _, tez_liquidity, target_tez_liquidity, target_price, expected_subsidies_per_sec) -> None:
+        target_ctez_liquidity = ceil(target_tez_liquidity / target_price)
+        sim, sender, *_ = self.default_setup(
+            target_ctez_price = target_price,
+            ctez_liquidity = target_ctez_liquidity,
+            ctez_total_supply = target_ctez_liquidity * 20,
+            tez_liquidity = tez_liquidity,
+        )
+        prev_sell_tez_dex = sim.ctez2.sell_tez
+        prev_total_supply = sim.fa12.total_supply
+
+        sim.call_ctez2(sender, 'collect_from_ctez_liquidity', sender)
+
+        tez_dex_subsidies = sim.ctez2.sell_tez.subsidy_reserves - prev_sell_tez_dex.subsidy_reserves
+        assert floor(sim.ctez2.context.Q * target_price) == target_tez_liquidity
+        assert tez_dex_subsidies == expected_subsidies_per_sec
+        assert sim.fa12.total_supply == prev_total_supply + tez_dex_subsidies
+
+    def test_should_increase_outstanding_ctez_in_ovens_accordingly_to_subsidies(self) -> None:
+        sim, _, _, owner = self.default_setup(
+            target_ctez_price = 1.5,
+            ctez_liquidity = 50_000_000_000,
+            ctez_total_supply = 2_000_000_000_000,
+            tez_liquidity = 50_000_000_000,
+        )
+        oven0 = sim.get_oven(owner, 0)
+
+        self.bake_blocks(9)
+        sim.call(owner, oven0.address, 'default', None, 100)
+        sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(1, None, None), 100)
+        sim.call_ctez2(owner, 'mint_or_burn', ctez2.MintOrBurnCtez(1, 1))
+        sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(2, None, None), 200_000_000_000)
+
+        total_subsidies = sim.ctez2.sell_ctez.subsidy_reserves + sim.ctez2.sell_tez.subsidy_reserves
+        assert total_subsidies == 7745
+        assert sim.get_oven(owner, 0).ctez_outstanding - 2_000_000_000_000 == 7746
+        assert sim.get_oven(owner, 1).ctez_outstanding == 1
+        assert sim.get_oven(owner, 2).ctez_outstanding == 0
+        assert sim.get_oven(owner, 0).tez_balance == oven0.tez_balance + 100
+
+    @parameterized.expand(drift_and_target)
+    def test_should_update_drift_and_target_correctly(self, _, ctez_liquidity, target_ctez_liquidity, tez_liquidity, target_ctez_price, delta, expected_drift_change_percent) -> None:
+        sim, sender, *_ = self.default_setup(
+            target_ctez_price = target_ctez_price,
+            ctez_liquidity = ctez_liquidity,
+            ctez_total_supply = target_ctez_liquidity * 20,
+            tez_liquidity = tez_liquidity,
+        )
+        assert sim.ctez2.context.drift == 0
+        assert sim.ctez2.context.target == floor(target_ctez_price * Float64.ONE)
+
+        sim.call_ctez2(sender, 'collect_from_ctez_liquidity', sender)
+        prev_drift = sim.ctez2.context.drift
+
+        self.bake_blocks(delta)
+        sim.call_ctez2(sender, 'collect_from_ctez_liquidity', sender)
+        prev_target = sim.ctez2.context.target
+        new_drift = sim.ctez2.context.drift
+        assert round(100 * (new_drift - prev_drift) / (delta * 2**16)) == expected_drift_change_percent
+
+        self.bake_blocks(2)
+        sim.call_ctez2(sender, 'collect_from_ctez_liquidity', sender)
+        d_target = sim.ctez2.context.target - prev_target
+        assert d_target == (prev_target * abs(new_drift) * 2 // Float64.ONE) * (-1 if new_drift < 0 else 1)
+
+    def test_should_match_sandbox_state_of_prepared_ctez_dex_liquidity(self) -> None:
+        sim, depositor_1, depositor_2, depositor_0 = self.default_setup(
+            ctez_total_supply = 15_000_000 * 10_000,
+            ctez_liquidity = 15_000_000,
+            tez_liquidity = 15_000_000 * 10_000,
+            get_ctez_token_balances = lambda depositor_1, depositor_2: {
+                depositor_1: 10_000_000,
+                depositor_2: 10_000_000,
+            },
+        )
+        sim.call_ctez2(depositor_0, 'tez_to_ctez', ctez2.TezToCtez(depositor_0, 5_000_000, self.get_future_timestamp()), 5_248_754)
+        self.bake_block()
+        for depositor in (depositor_1, depositor_2):
+            sim.call_fa12(depositor, 'approve', fa12.Approve(sim.ctez2_address, 10_000_000))
+            sim.call_ctez2(depositor, 'add_ctez_liquidity', ctez2.AddCtezLiquidity(depositor, 10_000_000, 0, self.get_future_timestamp()))
+            self.bake_blocks(5)
+        sim.call_ctez2(depositor_0, 'mint_or_burn', ctez2.MintOrBurnCtez(0, -sim.ctez_balance(depositor_0)))
+
+        owners = sim.ctez2.sell_ctez.liquidity_owners
+        assert owners[depositor_0] == LiquidityOwner(liquidity_shares=15000000, proceeds_owed=0, subsidy_owed=0)
+        assert owners[depositor_1] == LiquidityOwner(liquidity_shares=15000000, proceeds_owed=5248754, subsidy_owed=142)
+        assert owners[depositor_2] == LiquidityOwner(liquidity_shares=15000000, proceeds_owed=5248754, subsidy_owed=261)
+        ctez_dex = sim.ctez2.sell_ctez
+        assert ctez_dex.total_liquidity_shares == 45000000
+        assert ctez_dex.self_reserves == 30000000
+        assert ctez_dex.proceeds_reserves == 15746262
+        assert ctez_dex.subsidy_reserves == 1019
+        assert ctez_dex.proceeds_reserves - ctez_dex.proceeds_debts == sim.balance(sim.ctez2_address) - sim.ctez2.sell_tez.self_reserves
+
+    def test_should_match_sandbox_state_of_prepared_tez_dex_liquidity(self) -> None:
+        sim, depositor_1, depositor_2, depositor_0 = self.default_setup(
+            ctez_total_supply = 15_000_000 * 10_000 + 10_000_000,
+            ctez_liquidity = 15_000_000,
+            tez_liquidity = 15_000_000,
+        )
+        sim.call_fa12(depositor_0, 'approve', fa12.Approve(sim.ctez2_address, 5_248_754))
+        sim.call_ctez2(depositor_0, 'ctez_to_tez', ctez2.CtezToTez(depositor_0, 5_248_754, 5_000_000, self.get_future_timestamp()))
+        self.bake_block()
+        for depositor in (depositor_1, depositor_2):
+            sim.call_ctez2(depositor, 'add_tez_liquidity', ctez2.AddTezLiquidity(depositor, 0, self.get_future_timestamp()), 10_000_000)
+            self.bake_blocks(5)
+        sim.call_ctez2(depositor_0, 'mint_or_burn', ctez2.MintOrBurnCtez(0, -sim.ctez_balance(depositor_0)))
+
+        owners = sim.ctez2.sell_tez.liquidity_owners
+        assert owners[depositor_1] == LiquidityOwner(liquidity_shares=15000000, proceeds_owed=5248754, subsidy_owed=94)
+        assert owners[depositor_2] == LiquidityOwner(liquidity_shares=15000000, proceeds_owed=5248754, subsidy_owed=213)
+        assert sim.ctez2.sell_tez.proceeds_reserves == 15746262
+        assert sim.ctez2.sell_tez.subsidy_reserves == 875
+
@@ -0,0 +1,147 @@
+from random import Random
+from unittest import TestCase
+
+from tests.helpers.model import ctez2, errors
+from tests.helpers.model.liquidation import LiquidationIndex, liquidation_quantity, plan_liquidations
+from tests.helpers.model.oven import Handle
+from tests.helpers.model.stdctez import Float64
+from tests.helpers.model.tezos import FailwithError
+from tests.model.base import ModelTestCase
+
+
+ORIGINATOR = 'tz1Ke2h7sDdakHJQh8WX4Z372du1KChsksyU'
+
+
+def random_oven(rng: Random, i: int, min_outstanding: int = 1) -> ctez2.OvenInfo:
+    global_fee_index = Float64.ONE * Float64.ONE
+    ctez_outstanding = rng.choice([0, rng.randint(min_outstanding, min_outstanding + 100), rng.randint(min_outstanding, 10**12)])
+    tez_balance = ctez_outstanding * rng.randint(900, 1200) // 1000 + rng.randint(0, 3)
+    fee_index = global_fee_index + rng.randint(0, global_fee_index // 100)
+    return ctez2.OvenInfo(tez_balance, ctez_outstanding, f'KT1Oven{i}', fee_index)
+
+
+def random_storage(rng: Random, ovens_count: int, min_outstanding: int = 1) -> ctez2.Storage:
+    ovens = {Handle(i, f'tz1Owner{i % 7}'): random_oven(rng, i, min_outstanding) for i in range(ovens_count)}
+    return ctez2.Storage.initial(0, ORIGINATOR)._replace(ovens=ovens)
+
+
+def with_market(s: ctez2.Storage, rng: Random) -> ctez2.Storage:
+    """Moves the global fee index and the target, like the housekeeping does"""
+    return s._replace(
+        sell_ctez=s.sell_ctez._replace(fee_index=Float64.ONE + rng.randint(0, Float64.ONE // 20)),
+        sell_tez=s.sell_tez._replace(fee_index=Float64.ONE + rng.randint(0, Float64.ONE // 20)),
+        context=s.context._replace(target=rng.randint(Float64.ONE * 9 // 10, Float64.ONE * 11 // 10)),
+    )
+
+
+def scan_under_collateralized(s: ctez2.Storage) -> set[Handle]:
+    return {
+        handle for handle in s.ovens
+        if ctez2.is_under_collateralized(ctez2.get_oven(handle, s), s.context.target)
+    }
+
+
+class ModelLiquidationIndexTestCase(TestCase):
+    def test_should_find_same_ovens_as_full_scan(self) -> None:
+        rng = Random(1)
+        s = random_storage(rng, 500)
+        index = LiquidationIndex(s.ovens)
+
+        for _ in range(20):
+            s = with_market(s, rng)
+            at_risk = index.at_risk(s)
+
+            assert {handle for handle, _ in at_risk} == scan_under_collateralized(s)
+            assert all(oven == ctez2.get_oven(handle, s) for handle, oven in at_risk)
+
+    def test_should_order_frontier_by_collateral_ratio(self) -> None:
+        rng = Random(2)
+        # big ovens only, the rounding of the debt of small ones blurs their ratios
+        s = with_market(random_storage(rng, 300, min_outstanding=10**9), rng)
+
+        at_risk = LiquidationIndex(s.ovens).at_risk(s)
+
+        ratios = [oven.tez_balance / oven.ctez_outstanding for _, oven in at_risk]
+        assert len(ratios) > 10
+        assert all(a <= b * (1 + 1e-9) for a, b in zip(ratios, ratios[1:]))
+
+    def test_should_follow_oven_updates(self) -> None:
+        rng = Random(3)
+        s = random_storage(rng, 200)
+        index = LiquidationIndex(s.ovens)
+
+        for i in range(200):
+            handle = Handle(rng.randrange(220), f'tz1Owner{rng.randrange(7)}')
+            ovens = dict(s.ovens)
+            if handle in ovens and rng.random() < 0.2:
+                del ovens[handle]
+            else:
+                ovens[handle] = random_oven(rng, i)
+            s = s._replace(ovens=ovens)
+            index.update_from_storage(s, [handle])
+
+        s = with_market(s, rng)
+        assert index.ovens == s.ovens
+        assert {handle for handle, _ in index.at_risk(s)} == scan_under_collateralized(s)
+
+
+class ModelLiquidationIndexSimulatorTestCase(ModelTestCase):
+    def test_should_pick_oven_after_target_rises(self) -> None:
+        sim, owner, liquidator, _ = self.default_setup(get_ctez_token_balances = lambda _, receiver, *__: {receiver: 900_000})
+        for oven_id, tez_balance in enumerate([1_000_000, 1_100_000, 2_000_000]):
+            sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(oven_id, None, None), tez_balance)
+            sim.call_ctez2(owner, 'mint_or_burn', ctez2.MintOrBurnCtez(oven_id, 900_000))
+        index = LiquidationIndex(sim.ctez2.ovens)
+
+        sim.ctez2 = sim.ctez2._replace(context=sim.ctez2.context._replace(target=Float64.ONE * 12 // 10))
+        _, s = sim.get_actual_state()
+
+        owner_at_risk = lambda s: [handle for handle, _ in index.at_risk(s) if handle.owner == owner]
+        assert owner_at_risk(s) == [Handle(0, owner), Handle(1, owner)]
+
+        oven_address = sim.get_oven(owner, 0).address
+        sim.call(owner, oven_address, 'default', None, 1_000_000)
+        index.update_from_storage(sim.ctez2, [Handle(0, owner)])
+        assert owner_at_risk(sim.ctez2) == [Handle(1, owner)]
+
+        sim.call_ctez2(liquidator, 'liquidate_oven', ctez2.Liquidate(Handle(1, owner), 850_000, liquidator))
+        index.update_from_storage(sim.ctez2, [Handle(1, owner)])
+        assert owner_at_risk(sim.ctez2) == [Handle(1, owner)]
+        assert index.ovens[Handle(1, owner)] == sim.get_oven(owner, 1)
+
+    def test_should_execute_liquidation_plan(self) -> None:
+        sim, owner, liquidator, _ = self.default_setup(
+            ctez_liquidity = 100_000_000,
+            get_ctez_token_balances = lambda _, receiver, *__: {receiver: 300_000},
+        )
+        for oven_id, tez_balance in enumerate([1_000_000, 1_050_000, 1_100_000, 2_000_000]):
+            sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(oven_id, None, None), tez_balance)
+            sim.call_ctez2(owner, 'mint_or_burn', ctez2.MintOrBurnCtez(oven_id, 900_000))
+        index = LiquidationIndex({handle: oven for handle, oven in sim.ctez2.ovens.items() if handle.owner == owner})
+        sim.ctez2 = sim.ctez2._replace(context=sim.ctez2.context._replace(target=Float64.ONE * 11 // 10))
+        _, s = sim.get_actual_state()
+
+        plan = plan_liquidations(index, s, sim.ctez_balance(liquidator), max_count=10)
+
+        assert [l.handle for l in plan.liquidations] == [Handle(0, owner), Handle(1, owner)]
+        assert plan.ctez_to_buy == sum(l.quantity for l in plan.liquidations) - 300_000
+        prev_balance = sim.balance(liquidator)
+        sim.call_ctez2(liquidator, 'tez_to_ctez', ctez2.TezToCtez(liquidator, plan.ctez_to_buy, self.get_future_timestamp()), plan.tez_to_sell)
+        for l in plan.liquidations:
+            sim.call_ctez2(liquidator, 'liquidate_oven', ctez2.Liquidate(l.handle, l.quantity, liquidator))
+        assert sim.balance(liquidator) - prev_balance == sum(l.extracted_balance for l in plan.liquidations) - plan.tez_to_sell > 0
+        assert sim.ctez_balance(liquidator) == 0
+
+    def test_should_liquidate_up_to_oven_balance(self) -> None:
+        sim, owner, liquidator, _ = self.default_setup(get_ctez_token_balances = lambda _, receiver, *__: {receiver: 900_000})
+        sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(1, None, None), 1_000_000)
+        sim.call_ctez2(owner, 'mint_or_burn', ctez2.MintOrBurnCtez(1, 900_000))
+        sim.ctez2 = sim.ctez2._replace(context=sim.ctez2.context._replace(target=Float64.ONE * 12 // 10))
+        _, s = sim.get_actual_state()
+        quantity = liquidation_quantity(ctez2.get_oven(Handle(1, owner), s), s.context.target)
+
+        with self.assertRaises(FailwithError) as r:
+            sim.call_ctez2(liquidator, 'liquidate_oven', ctez2.Liquidate(Handle(1, owner), quantity + 1, liquidator))
+        assert r.exception.error == errors.INSUFFICIENT_TEZ_IN_OVEN
+        sim.call_ctez2(liquidator, 'liquidate_oven', ctez2.Liquidate(Handle(1, owner), quantity, liquidator))
+        assert sim.get_oven(owner, 1).tez_balance < 2
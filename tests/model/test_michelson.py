@@ -0,0 +1,245 @@
+from os.path import join
+from typing import Any, NamedTuple
+from unittest import TestCase
+
+from pytezos import ContractInterface
+from pytezos.context.impl import ExecutionContext
+from pytezos.michelson.micheline import MichelsonRuntimeError
+from pytezos.michelson.program import MichelsonProgram
+from pytezos.michelson.stack import MichelsonStack
+
+from tests.helpers.model import ctez2, half_dex, oven
+from tests.helpers.model.tezos import Call, Event, FailwithError, Origination, Transaction
+from tests.helpers.utility import get_build_dir
+
+
+CTEZ2_ADDRESS = 'KT1BEqzn5Wx8uJrZNvuS9DVHmLvG9td3fDLi'
+FA12_ADDRESS = 'KT1RJ6PbjHpwc3M5rw5s2Nbmefwbuwbdxton'
+ORIGINATOR = 'tz1Ke2h7sDdakHJQh8WX4Z372du1KChsksyU'
+ALICE = 'tz1VSUr8wwNhLAzempoch5d6hLRiTh8Cjcjb'
+BOB = 'tz1aSkwEot3L2kmUvcoxzjMomb9mvBNuzFK6'
+CONTRACT_BALANCE = 10**12
+
+
+def to_michelson(value: Any) -> Any:
+    """Converts model parameters and storage into the python form pytezos uses"""
+    if isinstance(value, oven.Handle):
+        return (value.id, value.owner)
+    if isinstance(value, tuple) and hasattr(value, '_asdict'):
+        return {('to' if k == 'to_' else k): to_michelson(v) for k, v in value._asdict().items()}
+    if isinstance(value, frozenset):
+        return sorted(value)
+    if isinstance(value, dict):
+        return {to_michelson(k): to_michelson(v) for k, v in value.items()}
+    return value
+
+
+def storage_to_michelson(s: ctez2.Storage) -> dict:
+    storage = to_michelson(s)
+    storage['context']['_Q'] = storage['context'].pop('Q')
+    storage['metadata'] = {}
+    return storage
+
+
+def view_result_to_michelson(result: Any) -> Any:
+    result = to_michelson(result)
+    if isinstance(result, dict) and 'context' in result:
+        result['context']['_Q'] = result['context'].pop('Q')
+    return result
+
+
+def create_oven_to_michelson(p: ctez2.CreateOven) -> dict:
+    depositors = {'any': None} if p.depositors is None else {'whitelist': sorted(p.depositors)}
+    return {'id': p.id, 'delegate': p.delegate, 'depositors': depositors}
+
+
+def micheline_leaves(node: Any) -> list:
+    if isinstance(node, list):
+        return [leaf for child in node for leaf in micheline_leaves(child)]
+    if 'int' in node:
+        return [int(node['int'])]
+    if 'string' in node:
+        return [node['string']]
+    if node.get('prim') in ('True', 'False'):
+        return [node['prim'] == 'True']
+    return micheline_leaves(node.get('args', []))
+
+
+def model_leaves(value: Any) -> list:
+    if isinstance(value, tuple):
+        return [leaf for child in value for leaf in model_leaves(child)]
+    return [value]
+
+
+def summarize_michelson_op(op: dict) -> tuple:
+    if op['kind'] == 'origination':
+        return ('origination', int(op['balance']))
+    if op['kind'] == 'event':
+        return ('event', op['tag'], micheline_leaves(op['payload']))
+    value = op.get('parameters', {}).get('value', {'prim': 'Unit'})
+    entrypoint = op.get('parameters', {}).get('entrypoint', 'default')
+    return ('transaction', op['destination'], entrypoint, int(op['amount']), micheline_leaves(value))
+
+
+def summarize_model_op(op: Any) -> tuple:
+    if isinstance(op, Origination):
+        return ('origination', op.balance)
+    if isinstance(op, Event):
+        return ('event', op.tag, model_leaves(op.payload))
+    assert isinstance(op, Transaction)
+    leaves = model_leaves(op.parameter) if op.parameter is not None else []
+    return ('transaction', op.destination, op.entrypoint, op.amount, leaves)
+
+
+class Step(NamedTuple):
+    entrypoint: str
+    params: Any
+    sender: str = ALICE
+    amount: int = 0
+    elapsed: int = 1
+    total_supply: int = 100_000_000
+
+
+class ModelMichelsonTestCase(TestCase):
+    """Runs the same calls through the model and through build/ctez_2.tz on the
+    pytezos interpreter, and checks that storages, operations and errors match"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.ctez2 = ContractInterface.from_file(join(get_build_dir(), 'ctez_2.tz'))
+        # Interpreter.run_view parses the whole script again on every call
+        cls.program = MichelsonProgram.load(cls.ctez2.context, with_code=True)
+
+    def run_step(self, step: Step, s: ctez2.Storage, now: int) -> ctez2.Storage:
+        params = create_oven_to_michelson(step.params) if step.entrypoint == 'create_oven' else to_michelson(step.params)
+        call = getattr(self.ctez2, step.entrypoint)(params).with_amount(step.amount)
+        michelson_result, michelson_error = None, None
+        try:
+            michelson_result = call.interpret(
+                storage=storage_to_michelson(s),
+                sender=step.sender,
+                now=now,
+                balance=CONTRACT_BALANCE,
+                self_address=CTEZ2_ADDRESS,
+                view_results={f'{FA12_ADDRESS}%viewTotalSupply': step.total_supply},
+            )
+        except MichelsonRuntimeError as e:
+            michelson_error = e.args[-1].strip("'")
+
+        originated_address = None
+        if michelson_result is not None and step.entrypoint == 'create_oven':
+            originated_address = michelson_result.storage['ovens'][(step.params.id, step.sender)]['address']
+        model_call = Call(now, step.sender, step.amount, CTEZ2_ADDRESS, step.total_supply, originated_address)
+        try:
+            ops, s = ctez2.ENTRYPOINTS[step.entrypoint](step.params, s, model_call)
+        except FailwithError as e:
+            assert e.error == michelson_error, f'{step.entrypoint}: model failed with {e.error}, contract with {michelson_error}'
+            return None
+        assert michelson_error is None, f'{step.entrypoint}: contract failed with {michelson_error}'
+
+        expected_storage = michelson_result.storage
+        assert storage_to_michelson(s) == expected_storage, step.entrypoint
+        assert list(map(summarize_model_op, ops)) == list(map(summarize_michelson_op, michelson_result.operations)), step.entrypoint
+        return s
+
+    def run_view(self, name: str, params: Any, s: ctez2.Storage, now: int, total_supply: int) -> None:
+        view = getattr(self.ctez2, name)(to_michelson(params)) if params is not None else getattr(self.ctez2, name)()
+        context = ExecutionContext(
+            script=self.ctez2.context.script,
+            address=CTEZ2_ADDRESS,
+            now=now,
+            view_results={f'{FA12_ADDRESS}%viewTotalSupply': total_supply},
+        )
+        michelson_result, michelson_error = None, None
+        try:
+            program = self.program.instantiate_view(name, view.param_expr, view._encode_storage(storage_to_michelson(s)))
+            stack, stdout = MichelsonStack(), []
+            program.begin(stack, stdout, context)
+            program.execute_view(stack, stdout, context)
+            michelson_result = program.ret(stack, stdout).to_python_object()
+        except MichelsonRuntimeError as e:
+            michelson_error = e.args[-1].strip("'")
+
+        try:
+            result = ctez2.VIEWS[name](params, s, Call(now, ctez_total_supply=total_supply))
+        except FailwithError as e:
+            assert e.error == michelson_error, f'{name}: model failed with {e.error}, contract with {michelson_error}'
+            return
+        assert michelson_error is None, f'{name}: contract failed with {michelson_error}'
+        assert view_result_to_michelson(result) == michelson_result, name
+
+    def run_steps(self, steps: list[Step], s: ctez2.Storage) -> ctez2.Storage:
+        now = s.last_update
+        for step in steps:
+            now += step.elapsed
+            next_s = self.run_step(step, s, now)
+            s = next_s if next_s is not None else s
+        return s
+
+    def test_should_match_contract_on_every_entrypoint(self) -> None:
+        deadline = 10**9
+        remove = lambda to_, lqt: half_dex.RemoveLiquidity(to_, lqt, 0, 0, 0, deadline)
+        s = ctez2.Storage.initial(1_000, ORIGINATOR, ctez_fa12_address=FA12_ADDRESS)
+        s = self.run_steps([
+            Step('create_oven', ctez2.CreateOven(1, None, None), amount=10_000_000, total_supply=0),
+            Step('mint_or_burn', ctez2.MintOrBurnCtez(1, 9_000_000), total_supply=0),
+            Step('create_oven', ctez2.CreateOven(2, None, frozenset([BOB])), sender=BOB, amount=1_066_667),
+            Step('mint_or_burn', ctez2.MintOrBurnCtez(2, 1_000_000), sender=BOB, elapsed=0),
+            Step('add_ctez_liquidity', ctez2.AddCtezLiquidity(ALICE, 3_000_000, 0, deadline)),
+            Step('add_tez_liquidity', ctez2.AddTezLiquidity(ALICE, 0, deadline), amount=2_000_000),
+            Step('tez_to_ctez', ctez2.TezToCtez(BOB, 0, deadline), sender=BOB, amount=1_500_000, elapsed=30),
+            Step('ctez_to_tez', ctez2.CtezToTez(BOB, 400_000, 0, deadline), sender=BOB, elapsed=600),
+            Step('ctez_to_tez', ctez2.CtezToTez(BOB, 400_000, 0, 0), sender=BOB),
+            Step('add_ctez_liquidity', ctez2.AddCtezLiquidity(BOB, 1_000_000, 0, deadline), sender=BOB, elapsed=3_600),
+            Step('add_tez_liquidity', ctez2.AddTezLiquidity(BOB, 0, deadline), sender=BOB, amount=700_000),
+            Step('collect_from_ctez_liquidity', ALICE, elapsed=86_400),
+            Step('collect_from_tez_liquidity', ALICE),
+            Step('remove_tez_liquidity', remove(ALICE, 1_000_000), elapsed=86_400),
+            Step('remove_ctez_liquidity', remove(BOB, 500_000), sender=BOB),
+            Step('remove_ctez_liquidity', remove(BOB, 10**12), sender=BOB),
+            Step('withdraw_from_oven', ctez2.Withdraw(1, 100_000, ALICE)),
+            # withdrawing more than the oven balance is left out, the pytezos interpreter
+            # fails on SUB_MUTEZ underflow instead of returning None
+            Step('withdraw_from_oven', ctez2.Withdraw(1, 1_000_000, ALICE)),
+            Step('liquidate_oven', ctez2.Liquidate(oven.Handle(1, ALICE), 1_000, BOB), sender=BOB),
+            Step('liquidate_oven', ctez2.Liquidate(oven.Handle(2, BOB), 500_000, ALICE), elapsed=30 * 86_400),
+        ], s)
+        assert s.last_event_id == 4
+        assert s.ovens[oven.Handle(2, BOB)].ctez_outstanding < 1_000_000
+
+        oven_address = s.ovens[oven.Handle(2, BOB)].address
+        self.run_steps([
+            Step('register_oven_deposit', oven.RegisterDeposit(oven.Handle(2, BOB), 100), sender=oven_address),
+            Step('register_oven_deposit', oven.RegisterDeposit(oven.Handle(2, BOB), 100), sender=BOB),
+            Step('set_ctez_fa12_address', FA12_ADDRESS, sender=ORIGINATOR),
+        ], s)
+
+    def test_should_match_contract_on_set_ctez_fa12_address(self) -> None:
+        s = ctez2.Storage.initial(1_000, ORIGINATOR)
+        self.run_steps([
+            Step('set_ctez_fa12_address', FA12_ADDRESS, sender=ALICE),
+            Step('set_ctez_fa12_address', FA12_ADDRESS, sender=ORIGINATOR, amount=1),
+            Step('set_ctez_fa12_address', FA12_ADDRESS, sender=ORIGINATOR),
+        ], s)
+
+    def test_should_match_contract_on_views(self) -> None:
+        deadline = 10**9
+        s = ctez2.Storage.initial(1_000, ORIGINATOR, ctez_fa12_address=FA12_ADDRESS)
+        s = self.run_steps([
+            Step('create_oven', ctez2.CreateOven(1, None, None), amount=10_000_000, total_supply=0),
+            Step('mint_or_burn', ctez2.MintOrBurnCtez(1, 9_000_000), total_supply=0),
+            Step('add_ctez_liquidity', ctez2.AddCtezLiquidity(ALICE, 3_000_000, 0, deadline)),
+            Step('add_tez_liquidity', ctez2.AddTezLiquidity(ALICE, 0, deadline), amount=2_000_000),
+            Step('tez_to_ctez', ctez2.TezToCtez(BOB, 0, deadline), sender=BOB, amount=1_500_000, elapsed=30),
+        ], s)
+
+        for elapsed in [0, 600, 30 * 86_400]:
+            for total_supply in [9_000_000, 100_000_000]:
+                now = s.last_update + elapsed
+                self.run_view('get_current_state', None, s, now, total_supply)
+                self.run_view('get_oven_state', oven.Handle(1, ALICE), s, now, total_supply)
+                self.run_view('get_oven_state', oven.Handle(2, ALICE), s, now, total_supply)
+                for is_sell_ctez_dex in [True, False]:
+                    for proceeds_amount in [0, 1_000_000, 10**12]:
+                        params = ctez2.CalcTokensToSell(is_sell_ctez_dex, proceeds_amount)
+                        self.run_view('calc_tokens_to_sell', params, s, now, total_supply)
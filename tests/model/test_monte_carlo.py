@@ -0,0 +1,78 @@
+from random import Random
+from unittest import TestCase
+
+from tests.helpers.model.monte_carlo import (
+    AddLiquidity,
+    FlowParameters,
+    Market,
+    SellTez,
+    Wait,
+    distribution,
+    execute,
+    liquidity_shares,
+    random_order_flow,
+    remove_liquidity,
+    run_monte_carlo,
+    run_order_flow,
+    setup_market,
+    summarize,
+)
+
+
+DAY = 24 * 60 * 60
+ALICE = 'tz1Alice'
+BOB = 'tz1Bob'
+
+
+class ModelMonteCarloTestCase(TestCase):
+    def test_should_replay_recorded_flow(self) -> None:
+        # the deposit_x1_000_000_liquidity case of tests/ctez2/test_lqt.py, one block per action
+        sim = setup_market(Market(0, 0, 1_000_000), [ALICE, BOB], 0)
+        for action in [
+            Wait(1), AddLiquidity(ALICE, True, 1_000_000),
+            Wait(1), SellTez(BOB, 1_001_252),
+            Wait(1), AddLiquidity(BOB, True, 1_000_000),
+            Wait(1),
+        ]:
+            execute(sim, action)
+        assert sim.ctez2.sell_ctez.self_reserves == 1_000_000
+
+        alice = remove_liquidity(sim, ALICE, True, liquidity_shares(sim, ALICE, True))
+        bob = remove_liquidity(sim, BOB, True, liquidity_shares(sim, BOB, True))
+
+        assert (alice.self_redeemed, alice.proceeds_redeemed) == (0, 1_001_252)
+        assert (bob.self_redeemed, bob.proceeds_redeemed) == (1_000_000, 0)
+
+    def test_should_return_deposits_without_order_flow(self) -> None:
+        result = run_order_flow([Wait(30 * DAY)], Market(10**12, 10**12, 0))
+
+        assert result.executed == 1 and result.rejected == 0
+        assert result.sell_ctez.self_redeemed == 10**12 and result.sell_tez.self_redeemed == 10**12
+        assert result.sell_ctez.proceeds_redeemed == 0 and result.sell_tez.proceeds_redeemed == 0
+        assert result.sell_ctez.subsidy_apr >= 0 and result.sell_tez.subsidy_apr >= 0
+
+    def test_should_skip_rejected_actions(self) -> None:
+        # the actor only has 1_000 ctez, so the second deposit fails and leaves no trace
+        flow = [Wait(10), AddLiquidity(ALICE, True, 1_000), AddLiquidity(ALICE, True, 1), Wait(10)]
+
+        result = run_order_flow(flow, Market(10**9, 10**9, 1_000))
+
+        assert (result.executed, result.rejected) == (3, 1)
+
+    def test_should_run_seeds_in_parallel(self) -> None:
+        market = Market(10**12, 10**12, 10**11)
+        p = FlowParameters(duration=2 * DAY, mean_interval=600)
+
+        results = run_monte_carlo(market, p, seeds=range(4), workers=2)
+
+        assert results == [run_order_flow(random_order_flow(Random(seed), p), market) for seed in range(4)]
+        assert results[0] != results[1]
+        summary = summarize(results)
+        assert summary['sell_ctez_pnl'].count == 4
+        assert summary['target_apr'].p5 <= summary['target_apr'].p50 <= summary['target_apr'].p95
+
+    def test_should_describe_distribution(self) -> None:
+        d = distribution([float(i) for i in range(101)])
+
+        assert (d.count, d.mean, d.p5, d.p50, d.p95) == (101, 50.0, 5.0, 50.0, 95.0)
+        assert distribution([3.0]) == (1, 3.0, 0.0, 3.0, 3.0, 3.0)
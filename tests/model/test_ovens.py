@@ -0,0 +1,93 @@
+from math import ceil, floor
+
+from tests.helpers.model import ctez2, errors, oven
+from tests.helpers.model.tezos import FailwithError
+from tests.model.base import ModelTestCase
+
+
+class ModelOvensTestCase(ModelTestCase):
+    def test_should_fail_if_not_undercollateralized(self) -> None:
+        sim, owner, receiver, _ = self.default_setup(ctez_liquidity = 100_000_000, tez_liquidity = 100_000_000)
+        oven_id = 2
+        sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(oven_id, None, None), ceil(123 * 16/15))
+        sim.call_ctez2(owner, 'mint_or_burn', ctez2.MintOrBurnCtez(oven_id, 123))
+        self.bake_block()
+
+        with self.assertRaises(FailwithError) as r:
+            sim.call_ctez2(owner, 'liquidate_oven', ctez2.Liquidate(oven.Handle(oven_id, owner), 123, receiver))
+        assert r.exception.error == errors.NOT_UNDERCOLLATERALIZED
+
+    def test_should_fail_if_burning_more_than_outstanding_ctez(self) -> None:
+        sim, owner, receiver, _ = self.default_setup()
+        oven_id = 2
+        outstanding_balance = 150_000_000
+        sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(oven_id, None, None), ceil(outstanding_balance * 16/15))
+        sim.call_ctez2(owner, 'mint_or_burn', ctez2.MintOrBurnCtez(oven_id, outstanding_balance))
+        self.bake_blocks(100)
+
+        with self.assertRaises(FailwithError) as r:
+            sim.call_ctez2(owner, 'liquidate_oven', ctez2.Liquidate(oven.Handle(oven_id, owner), outstanding_balance + 100, receiver))
+        assert r.exception.error == errors.EXCESSIVE_CTEZ_BURNING
+
+    def test_should_liquidate_oven_completely(self) -> None:
+        target_price = 1.05
+        oven_id = 12
+        ctez_minted = 150_000_000
+        ctez_burned = ctez_minted + 9
+        sim, owner, liquidator, receiver = self.default_setup(
+            target_ctez_price = target_price,
+            get_ctez_token_balances = lambda _, liquidator: {
+                liquidator: ctez_burned
+            },
+        )
+        sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(oven_id, None, None), ceil(ctez_minted * 16/15 * target_price))
+        sim.call_ctez2(owner, 'mint_or_burn', ctez2.MintOrBurnCtez(oven_id, ctez_minted))
+        self.bake_blocks(100)
+        prev_oven_info = sim.get_oven(owner, oven_id)
+        prev_total_supply = sim.fa12.total_supply
+        prev_receiver_tez_balance = sim.balance(receiver)
+
+        sim.call_ctez2(liquidator, 'liquidate_oven', ctez2.Liquidate(oven.Handle(oven_id, owner), ctez_burned, receiver))
+
+        total_subsidies = sim.ctez2.sell_ctez.subsidy_reserves + sim.ctez2.sell_tez.subsidy_reserves
+        expected_tez_earned = floor(ctez_burned * target_price * 32/31)
+        assert sim.balance(receiver) == prev_receiver_tez_balance + expected_tez_earned
+        assert sim.balance(prev_oven_info.address) == prev_oven_info.tez_balance - expected_tez_earned
+        assert sim.get_oven(owner, oven_id).tez_balance == prev_oven_info.tez_balance - expected_tez_earned
+        assert sim.get_oven(owner, oven_id).ctez_outstanding == 0
+        assert sim.ctez_balance(liquidator) == 0
+        assert sim.fa12.total_supply == prev_total_supply + total_subsidies - ctez_burned
+
+    def test_should_register_deposits_only_from_authorized_depositors(self) -> None:
+        sim, owner, depositor, _ = self.default_setup()
+        sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(1, None, frozenset()), 10)
+        oven_address = sim.get_oven(owner, 1).address
+
+        with self.assertRaises(FailwithError) as r:
+            sim.call(depositor, oven_address, 'default', None, 10)
+        assert r.exception.error == errors.UNAUTHORIZED_DEPOSITOR
+
+        sim.call(owner, oven_address, 'edit_depositor', oven.AllowAccount(True, depositor))
+        sim.call(depositor, oven_address, 'default', None, 10)
+        assert sim.get_oven(owner, 1).tez_balance == 20
+        assert sim.balance(oven_address) == 20
+
+        with self.assertRaises(FailwithError) as r:
+            sim.call_ctez2(depositor, 'register_oven_deposit', oven.RegisterDeposit(oven.Handle(1, owner), 10))
+        assert r.exception.error == errors.ONLY_OVEN_CAN_CALL
+
+    def test_should_withdraw_from_oven(self) -> None:
+        sim, owner, receiver, _ = self.default_setup()
+        sim.call_ctez2(owner, 'create_oven', ctez2.CreateOven(1, 'tz1Baker', None), 1_600)
+        sim.call_ctez2(owner, 'mint_or_burn', ctez2.MintOrBurnCtez(1, 1_000))
+        oven_address = sim.get_oven(owner, 1).address
+        assert sim.delegates[oven_address] == 'tz1Baker'
+
+        with self.assertRaises(FailwithError) as r:
+            sim.call_ctez2(owner, 'withdraw_from_oven', ctez2.Withdraw(1, 534, receiver))
+        assert r.exception.error == errors.EXCESSIVE_TEZ_WITHDRAWAL
+
+        sim.call_ctez2(owner, 'withdraw_from_oven', ctez2.Withdraw(1, 533, receiver))
+        assert sim.balance(receiver) == 533
+        assert sim.balance(oven_address) == 1_067
+        assert sim.get_oven(owner, 1).tez_balance == 1_067
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from tests.helpers.model import ctez2
+from tests.helpers.model.projection import ReservesChange, Scenario, project, project_scenarios
+from tests.helpers.model.stdctez import Float64
+
+
+DAY = 24 * 60 * 60
+ORIGINATOR = 'tz1Ke2h7sDdakHJQh8WX4Z372du1KChsksyU'
+
+
+class ModelProjectionTestCase(TestCase):
+    def setUp(self) -> None:
+        self.s = ctez2.Storage.initial(1_000, ORIGINATOR)
+        self.total_supply = 2_000_000_000_000
+
+    def test_should_keep_target_when_dexes_are_balanced(self) -> None:
+        Q = self.total_supply // 20
+        scenario = Scenario(duration=365 * DAY, cadence=DAY, reserves=[ReservesChange(0, Q, Q)])
+
+        points = project(self.s, self.total_supply, scenario)
+
+        assert len(points) == 366
+        assert all(p.drift == 0 and p.target == Float64.ONE for p in points)
+
+    def test_should_raise_target_on_persistent_tez_shortage(self) -> None:
+        # the sell ctez dex is full and the sell tez dex is empty, so the drift grows
+        # by 2**16 per second, the fastest it can
+        scenario = Scenario(duration=183 * DAY, cadence=DAY, reserves=[ReservesChange(0, 10**18, 0)])
+
+        points = project(self.s, self.total_supply, scenario)
+
+        drift, target = 0, Float64.ONE
+        for point in points[1:]:
+            target += (drift * DAY * target) // Float64.ONE
+            drift += 2**16 * DAY
+            assert (point.drift, point.target) == (drift, target)
+        assert points[-1].total_supply > self.total_supply
+        assert points[-1].sell_tez_fee_index > points[0].sell_tez_fee_index
+
+    def test_should_run_housekeeping_before_reserves_change(self) -> None:
+        Q = self.total_supply // 20
+        scenario = Scenario(
+            duration=2 * DAY,
+            cadence=DAY,
+            reserves=[ReservesChange(0, Q, Q), ReservesChange(DAY // 2, Q, 0)],
+            record_every=DAY,
+        )
+
+        points = project(self.s, self.total_supply, scenario)
+
+        assert [p.time for p in points] == [0, DAY, 2 * DAY]
+        # the imbalance only lasts from the middle of the first day
+        assert points[1].drift == 2**16 * DAY // 2
+        assert points[1].target == Float64.ONE
+
+    def test_should_project_scenarios_in_parallel(self) -> None:
+        scenarios = [
+            Scenario(duration=30 * DAY, cadence=3_600, reserves=[ReservesChange(0, ctez_reserves, tez_reserves)], record_every=DAY)
+            for ctez_reserves, tez_reserves in [(10**11, 0), (0, 10**11), (10**11, 10**11)]
+        ]
+
+        projections = project_scenarios(self.s, self.total_supply, scenarios, workers=2)
+
+        assert projections == [project(self.s, self.total_supply, scenario) for scenario in scenarios]
+        assert projections[0][-1].target > Float64.ONE > projections[1][-1].target
+        assert projections[2][-1].target == Float64.ONE
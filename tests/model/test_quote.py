@@ -0,0 +1,128 @@
+from random import Random
+from unittest import TestCase
+from unittest.mock import patch
+
+from parameterized import parameterized
+
+from tests.ctez2.test_cases import swap_ctez_to_tez_cases, swap_tez_to_ctez_cases
+from tests.helpers.model import ctez2, quote
+from tests.helpers.model.context import Context
+from tests.helpers.model.half_dex import Curve, HalfDex
+from tests.helpers.model.stdctez import Float64
+from tests.helpers.model.tezos import NULL_ADDRESS
+
+
+def sample_range(rng: Random, n: int) -> int:
+    """Picks values near both ends of [0, n] more often, as the curve changes there"""
+    r = rng.random()
+    if r < 0.05:
+        return rng.randint(0, min(n, 3))
+    if r < 0.1:
+        return max(n - rng.randint(0, 3), 0)
+    return rng.randint(0, n)
+
+
+def random_batch(seed: int, size: int) -> tuple[list[int], list[int], list[int], list[int]]:
+    rng = Random(seed)
+    Qs = [10**rng.randint(0, 15) for _ in range(size)]
+    self_reserves = [sample_range(rng, 2 * Q) for Q in Qs]
+    proceeds_amounts = [sample_range(rng, 10**rng.randint(0, 18)) for _ in range(size)]
+    targets = [rng.randint(Float64.ONE // 2, 2 * Float64.ONE) for _ in range(size)]
+    return proceeds_amounts, self_reserves, Qs, targets
+
+
+class ModelQuoteTestCase(TestCase):
+    @parameterized.expand([
+        ('sell_ctez', ctez2.sell_ctez_env, 1),
+        ('sell_tez', ctez2.sell_tez_env, 2),
+    ])
+    def test_should_quote_same_amounts_as_swap_curve(self, _, env, seed) -> None:
+        batch = random_batch(seed, 2_000)
+
+        amounts = quote.quote_swaps(env, *batch)
+
+        for amount, proceeds_amount, q, Q, target in zip(amounts, *batch):
+            t = HalfDex.empty()._replace(self_reserves=q)
+            assert amount == Curve.swap_amount(t, Context(target, 0, Q, NULL_ADDRESS), env, proceeds_amount)
+
+    def test_should_quote_swap_cases(self) -> None:
+        for _, ctez_liquidity, Q, sent_tez, ctez_bought, target_price in swap_tez_to_ctez_cases:
+            target = int(target_price * Float64.ONE)
+            assert quote.quote_swaps(ctez2.sell_ctez_env, sent_tez, ctez_liquidity, Q, target) == [ctez_bought]
+        for _, tez_liquidity, Qt, sent_ctez, tez_bought, target_price in swap_ctez_to_tez_cases:
+            target = int(target_price * Float64.ONE)
+            Q = Float64.div(Qt, target)
+            assert quote.quote_swaps(ctez2.sell_tez_env, sent_ctez, tez_liquidity, Q, target) == [tez_bought]
+
+    def test_should_broadcast_single_values(self) -> None:
+        amounts = quote.quote_swaps(ctez2.sell_ctez_env, [0, 10, 1_000], 1_000, 1_000, Float64.ONE)
+
+        assert amounts == [quote.quote_swaps(ctez2.sell_ctez_env, x, 1_000, 1_000, Float64.ONE)[0] for x in (0, 10, 1_000)]
+        with self.assertRaises(ValueError):
+            quote.quote_swaps(ctez2.sell_ctez_env, [1, 2], [1, 2, 3], 1_000, Float64.ONE)
+
+    @parameterized.expand([
+        ('numpy', quote.numpy),
+        ('floats', None),
+    ])
+    def test_should_quote_same_amounts_on_floats(self, _, numpy) -> None:
+        for seed, env in enumerate((ctez2.sell_ctez_env, ctez2.sell_tez_env)):
+            batch = random_batch(seed + 10, 5_000)
+            with patch.object(quote, 'numpy', numpy), patch.object(Curve, 'swap_using_incentivized_liquidity', wraps=Curve.swap_using_incentivized_liquidity) as exact_swap:
+                amounts = quote.float_quote_swaps(env, *batch)
+
+            assert amounts == quote.quote_swaps(env, *batch)
+            # the margin grows with the amount, from around 2^44 most amounts are computed again
+            assert exact_swap.call_count < 5_000 // 3
+
+    @parameterized.expand([
+        ('numpy', quote.numpy),
+        ('floats', None),
+    ])
+    def test_should_compute_again_the_amounts_near_a_floor(self, _, numpy) -> None:
+        batch = random_batch(12, 500)
+        with patch.object(quote, 'numpy', numpy), patch.object(quote, 'FLOAT_RELATIVE_ERROR', 0.5):
+            amounts = quote.float_quote_swaps(ctez2.sell_ctez_env, *batch)
+
+        assert amounts == quote.quote_swaps(ctez2.sell_ctez_env, *batch)
+
+    @parameterized.expand([
+        ('numpy', quote.numpy),
+        ('floats', None),
+    ])
+    def test_should_compute_again_the_amounts_out_of_float_range(self, _, numpy) -> None:
+        batch = ([10**400, 10**6, 10**110], 10**200, [10**200, 10**200, 10**100], Float64.ONE)
+        with patch.object(quote, 'numpy', numpy):
+            amounts = quote.float_quote_swaps(ctez2.sell_ctez_env, *batch)
+
+        assert amounts == quote.quote_swaps(ctez2.sell_ctez_env, *batch)
+
+    @parameterized.expand([
+        ('sell_ctez', ctez2.sell_ctez_env, 3),
+        ('sell_tez', ctez2.sell_tez_env, 4),
+    ])
+    def test_should_quote_least_proceeds_to_buy_amount(self, _, env, seed) -> None:
+        rng = Random(seed)
+        _, self_reserves, Qs, targets = random_batch(seed, 2_000)
+        self_amounts = [sample_range(rng, q) for q in self_reserves]
+
+        proceeds_amounts = quote.quote_proceeds(env, self_amounts, self_reserves, Qs, targets)
+
+        bought = quote.quote_swaps(env, proceeds_amounts, self_reserves, Qs, targets)
+        bought_with_less = quote.quote_swaps(env, [max(p - 1, 0) for p in proceeds_amounts], self_reserves, Qs, targets)
+        for self_amount, proceeds_amount, amount, amount_with_less in zip(self_amounts, proceeds_amounts, bought, bought_with_less):
+            assert amount >= self_amount
+            assert proceeds_amount == 0 or amount_with_less < self_amount
+
+    def test_should_not_quote_more_than_self_reserves(self) -> None:
+        assert quote.quote_proceeds(ctez2.sell_ctez_env, [500, 1_000, 1_001], 1_000, 500, Float64.ONE) == [500, 1_008, None]
+
+    def test_should_match_paid_closed_form_with_newton_steps(self) -> None:
+        rng = Random(5)
+        for _ in range(2_000):
+            Q = 10**rng.randint(0, 9)
+            q = sample_range(rng, Q)
+            dq = sample_range(rng, q)
+            x = quote.paid(dq, q, Q)
+            y = Curve.swap_using_incentivized_liquidity(x, q, Q)
+            assert y <= dq <= y + y // 1_000_000_000 + 2
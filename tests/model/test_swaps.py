@@ -0,0 +1,76 @@
+from math import floor
+from parameterized import parameterized
+
+from tests.ctez2.test_cases import swap_ctez_to_tez_cases, swap_tez_to_ctez_cases
+from tests.helpers.model import ctez2, errors, fa12
+from tests.helpers.model.tezos import FailwithError
+from tests.model.base import ModelTestCase
+
+
+class ModelSwapTestCase(ModelTestCase):
+    @parameterized.expand(swap_tez_to_ctez_cases)
+    def test_should_swap_tez_to_ctez_tokens_correctly(self, _, ctez_liquidity, target_liquidity, sent_tez, ctez_bought, target_price) -> None:
+        total_supply = target_liquidity * 20
+        sim, sender, receiver, donor = self.default_setup(
+            ctez_liquidity = ctez_liquidity,
+            target_ctez_price = target_price,
+            get_ctez_token_balances = lambda *_: {
+                'tz1Somebody' : total_supply - ctez_liquidity
+            },
+        )
+        prev_sell_ctez_dex = sim.ctez2.sell_ctez
+
+        sim.call_ctez2(sender, 'tez_to_ctez', ctez2.TezToCtez(receiver, ctez_bought, self.get_future_timestamp()), sent_tez)
+
+        assert sim.ctez2.context.Q == target_liquidity
+        assert sim.ctez_balance(receiver) == ctez_bought
+        assert sim.ctez2.sell_ctez.self_reserves == prev_sell_ctez_dex.self_reserves - ctez_bought
+        assert sim.ctez2.sell_ctez.proceeds_reserves == prev_sell_ctez_dex.proceeds_reserves + sent_tez
+
+    @parameterized.expand(swap_ctez_to_tez_cases)
+    def test_should_swap_ctez_to_tez_tokens_correctly(self, _, tez_liquidity, target_liquidity, sent_ctez, tez_bought, target_price) -> None:
+        total_supply = floor(target_liquidity * 20 / target_price)
+        sim, sender, receiver, _ = self.default_setup(
+            get_ctez_token_balances = lambda sender, *_: {
+                sender: sent_ctez,
+            },
+            ctez_total_supply = total_supply,
+            tez_liquidity = tez_liquidity,
+            target_ctez_price = target_price,
+        )
+        prev_receiver_tez_balance = sim.balance(receiver)
+        prev_sell_tez_dex = sim.ctez2.sell_tez
+
+        sim.call_fa12(sender, 'approve', fa12.Approve(sim.ctez2_address, sent_ctez))
+        sim.call_ctez2(sender, 'ctez_to_tez', ctez2.CtezToTez(receiver, sent_ctez, tez_bought, self.get_future_timestamp()))
+
+        assert sim.balance(receiver) == prev_receiver_tez_balance + tez_bought
+        assert sim.ctez_balance(sender) == 0
+        assert sim.ctez2.sell_tez.self_reserves == prev_sell_tez_dex.self_reserves - tez_bought
+        assert sim.ctez2.sell_tez.proceeds_reserves == prev_sell_tez_dex.proceeds_reserves + sent_ctez
+
+    def test_should_fail_if_deadline_has_passed(self) -> None:
+        sim, sender, receiver, _ = self.default_setup(ctez_liquidity = 100)
+
+        with self.assertRaises(FailwithError) as r:
+            sim.call_ctez2(sender, 'tez_to_ctez', ctez2.TezToCtez(receiver, 1, self.get_passed_timestamp()), 10)
+        assert r.exception.error == errors.DEADLINE_HAS_PASSED
+
+    def test_should_fail_if_insufficient_tokens_liquidity(self) -> None:
+        sim, sender, receiver, _ = self.default_setup(ctez_liquidity = 7)
+
+        with self.assertRaises(FailwithError) as r:
+            sim.call_ctez2(sender, 'tez_to_ctez', ctez2.TezToCtez(receiver, 1, self.get_future_timestamp()), 10)
+        assert r.exception.error == errors.INSUFFICIENT_TOKENS_LIQUIDITY
+
+    def test_should_leave_state_untouched_if_call_fails(self) -> None:
+        sim, sender, receiver, _ = self.default_setup(ctez_liquidity = 100)
+        self.bake_blocks(100)
+        prev_ctez2, prev_fa12, prev_balances = sim.ctez2, sim.fa12, dict(sim.balances)
+
+        with self.assertRaises(FailwithError):
+            sim.call_ctez2(sender, 'tez_to_ctez', ctez2.TezToCtez(receiver, 1_000, self.get_future_timestamp()), 10)
+
+        assert sim.ctez2 == prev_ctez2
+        assert sim.fa12 == prev_fa12
+        assert sim.balances == prev_balances
@@ -0,0 +1,178 @@
+from typing import Callable, Optional
+from parameterized import parameterized
+from pytezos.client import PyTezosClient
+
+from tests.helpers.addressable import Addressable, get_address
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.contracts.oven.oven import Oven
+from tests.helpers.utility import TEST_ADDRESSES_SET
+
+
+class OvenSetupMixin:
+    """Ctez2 default setup with an oven of the owner, on top of the default_setup of
+    the sandboxed node or of the in-process chain"""
+
+    def default_setup(
+        self,
+        oven_id = 0,
+        delegate: Optional[Addressable] = None,
+        depositors: Optional[Callable[[PyTezosClient, PyTezosClient, PyTezosClient], list[Addressable]]] = None,
+        tez_liquidity: int = 0,
+        ctez_liquidity: int = 0,
+        get_ctez_token_balances: Optional[Callable[[PyTezosClient, PyTezosClient], dict[Addressable, int]]] = None,
+        ctez_total_supply: Optional[int] = None,
+        target_ctez_price: float = 1.0,
+        bootstrap_all_tez_balances = False # starts from a fresh node (snapshot) and transfers all bakers balances to bootstrapped accounts
+    ) -> tuple[Oven, Ctez2, Fa12, PyTezosClient, PyTezosClient, PyTezosClient]:
+        ctez2, ctez_token, owner, account2, donor = super().default_setup(
+            tez_liquidity,
+            ctez_liquidity,
+            get_ctez_token_balances,
+            ctez_total_supply,
+            target_ctez_price,
+            bootstrap_all_tez_balances
+        )
+
+        depositors = depositors(owner, account2, donor) if depositors is not None else None
+        self.send(ctez2.using(owner).create_oven(oven_id, delegate, depositors))
+        self.bake_block()
+
+        oven = ctez2.get_oven_contract(owner, owner, oven_id)
+
+        return oven, ctez2, ctez_token, owner, account2, donor
+
+
+class OvenDelegateTests:
+    def test_should_fail_if_tez_in_transaction(self) -> None:
+        oven, _, _, owner, *_ = self.default_setup()
+
+        with self.raises_michelson_error(Oven.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
+            self.dry_run(oven.using(owner).oven_delegate(None).with_amount(1))
+
+    def test_should_fail_if_called_not_by_owner(self) -> None:
+        oven, _, _, _, not_owner, *_ = self.default_setup()
+
+        with self.raises_michelson_error(Oven.Errors.ONLY_OWNER_CAN_CALL):
+            self.dry_run(oven.using(not_owner).oven_delegate(None))
+
+    def test_should_set_and_unset_delegate_correctly(self) -> None:
+        oven, _, _, owner, *_ = self.default_setup()
+        baker = self.bootstrap_baker()
+
+        assert self.get_contract_delegate(oven) == None
+
+        self.send(oven.using(owner).oven_delegate(baker))
+        self.bake_block()
+        assert self.get_contract_delegate(oven) == get_address(baker)
+
+        self.send(oven.using(owner).oven_delegate(None))
+        self.bake_block()
+        assert self.get_contract_delegate(oven) == None
+
+
+class OvenDepositTests:
+    def test_should_fail_if_not_authorized_depositor(self) -> None:
+        oven, _, _, _, depositor, not_depositor = self.default_setup(
+            depositors = lambda depositor, *_: [depositor]
+        )
+
+        with self.raises_michelson_error(Oven.Errors.UNAUTHORIZED_DEPOSITOR):
+            self.dry_run(oven.using(not_depositor).deposit().with_amount(123))
+
+
+    @parameterized.expand([
+        ('owner_call__any_allowed',             lambda owner, _: owner,         lambda *_ : None ),
+        ('owner_call__no_allowed_depositors',   lambda owner, _: owner,         lambda *_ : [] ),
+        ('not_owner_call__any_allowed',         lambda _, not_owner: not_owner, lambda *_ : None ),
+        ('not_owner_call__not_owner_allowed',   lambda _, not_owner: not_owner, lambda _, not_owner : [not_owner] ),
+    ])
+    def test_should_deposit_correctly(
+        self,
+        _name: str,
+        get_sender: Callable[[PyTezosClient, PyTezosClient], PyTezosClient],
+        get_allowed_depositors: Callable[[PyTezosClient, PyTezosClient], Optional[list[Addressable]]]
+    ) -> None:
+        oven_id = 1
+        oven, ctez2, ctez_token, owner, not_owner, *_ = self.default_setup(
+            oven_id = 1,
+            depositors = lambda owner, not_owner, *_ : get_allowed_depositors(owner, not_owner),
+            ctez_liquidity = 100_000_000,
+            tez_liquidity = 100_000_000
+        )
+
+        sender = get_sender(owner, not_owner)
+
+        deposit_amount = 123
+
+        prev_ctez2_tez_balance = self.get_balance_mutez(ctez2)
+        prev_ctez2_ctez_balance = ctez_token.view_balance(ctez2)
+        prev_oven_info = ctez2.get_oven(owner, oven_id)
+        prev_oven_tez_balance = self.get_balance_mutez(oven)
+        prev_oven_ctez_balance = ctez_token.view_balance(oven)
+        prev_depositor_tez_balance = self.get_balance_mutez(sender)
+        prev_depositor_ctez_balance = ctez_token.view_balance(sender)
+
+        opg = self.send(oven.using(sender).deposit().with_amount(deposit_amount))
+        self.bake_block()
+
+        oven_info = ctez2.get_oven(owner, oven_id)
+        assert self.get_balance_mutez(ctez2) == prev_ctez2_tez_balance
+        assert ctez_token.view_balance(ctez2) == prev_ctez2_ctez_balance
+        assert oven_info.ctez_outstanding == prev_oven_info.ctez_outstanding
+        assert oven_info.tez_balance == prev_oven_info.tez_balance + deposit_amount
+        assert self.get_balance_mutez(oven) == prev_oven_tez_balance + deposit_amount
+        assert ctez_token.view_balance(oven) == prev_oven_ctez_balance
+        assert self.get_balance_mutez(sender) == prev_depositor_tez_balance - deposit_amount - self.get_consumed_mutez(sender, opg)
+        assert ctez_token.view_balance(sender) == prev_depositor_ctez_balance
+
+
+class OvenEditDepositorTests:
+    def test_should_fail_if_tez_in_transaction(self) -> None:
+        oven, _, _, owner, *_ = self.default_setup()
+
+        with self.raises_michelson_error(Oven.Errors.TEZ_IN_TRANSACTION_DISALLOWED):
+            self.dry_run(oven.using(owner).oven_edit_depositor(True).with_amount(1))
+
+    def test_should_fail_if_called_not_by_owner(self) -> None:
+        oven, _, _, _, not_owner, *_ = self.default_setup()
+
+        with self.raises_michelson_error(Oven.Errors.ONLY_OWNER_CAN_CALL):
+            self.dry_run(oven.using(not_owner).oven_edit_depositor(True))
+
+    def test_should_fail_if_allow_depositor_when_anyone_allowed(self) -> None:
+        oven, _, _, owner, not_owner, *_ = self.default_setup(
+            depositors = None
+        )
+
+        for allowed in (True, False):
+            with self.raises_michelson_error(Oven.Errors.SET_ANY_OFF_FIRST):
+                self.dry_run(oven.using(owner).oven_edit_depositor((not_owner, allowed)))
+
+    @parameterized.expand([
+        ('allow_all', True, True),
+        ('disallow_all', False, []),
+        ('add_depositor', (TEST_ADDRESSES_SET[1], True), [TEST_ADDRESSES_SET[0], TEST_ADDRESSES_SET[1]]),
+        ('remove_depositor', (TEST_ADDRESSES_SET[0], False), []),
+    ])
+    def test_should_update_allowed_depositors_correctly(
+        self,
+        _name: str,
+        depositor_or_allow_any: tuple[Addressable, bool] | bool,
+        expected_storage_value: list[str] | bool
+    ) -> None:
+        oven, _, _, owner, *_ = self.default_setup(
+            depositors = lambda *_: [TEST_ADDRESSES_SET[0]]
+        )
+
+        self.send(oven.using(owner).oven_edit_depositor(depositor_or_allow_any))
+        self.bake_block()
+        assert oven.get_depositors() == expected_storage_value
+
+
+class OvenWithdrawTests:
+    def test_should_fail_if_called_not_by_main_contract(self) -> None:
+        oven, _, _, owner, receiver, *_ = self.default_setup()
+
+        with self.raises_michelson_error(Oven.Errors.ONLY_MAIN_CONTRACT_CAN_CALL):
+            self.dry_run(oven.using(owner).oven_withdraw(123, receiver))
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+from typing import Optional
+
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+
+CTEZ2_ADDRESS = 'KT1BEqzn5Wx8uJrZNvuS9DVHmLvG9td3fDLi'
+OTHER_ADDRESS = 'KT1RJ6PbjHpwc3M5rw5s2Nbmefwbuwbdxton'
+ALICE = 'tz1VSUr8wwNhLAzempoch5d6hLRiTh8Cjcjb'
+BOB = 'tz1aSkwEot3L2kmUvcoxzjMomb9mvBNuzFK6'
+OVENS_BIG_MAP_ID = 7
+
+
+def oven(tez_balance: int, ctez_outstanding: int = 0) -> Ctez2.OvenInfo:
+    return Ctez2.OvenInfo(tez_balance, ctez_outstanding, f'KT1Oven{tez_balance}', 2**128 + tez_balance)
+
+
+def make_block(level: int, block_hash: str, predecessor: str, updates: list[tuple[tuple[int, str], Optional[Ctez2.OvenInfo]]] = ()) -> dict:
+    """Block whose only operation updates the ovens big_map, keys and values are
+    kept as python objects, the fake ctez2 decodes them as they are"""
+    diff = {
+        'kind': 'big_map',
+        'id': str(OVENS_BIG_MAP_ID),
+        'diff': {
+            'action': 'update',
+            'updates': [{'key': handle, **({'value': value} if value is not None else {})} for handle, value in updates],
+        },
+    }
+    content = {'kind': 'transaction', 'metadata': {'operation_result': {'status': 'applied', 'lazy_storage_diff': [diff]}}}
+    return {
+        'hash': block_hash,
+        'header': {'level': level, 'predecessor': predecessor},
+        'operations': [[{'contents': [content]}]],
+    }
+
+
+class FakeCtez2:
+    def __init__(self, address: str, ovens: dict):
+        self.address = address
+        self.ovens = ovens
+        self.loads = 0
+
+    def get_ovens_big_map_id(self) -> int:
+        return OVENS_BIG_MAP_ID
+
+    def get_ovens(self, block_id: str) -> dict:
+        self.loads += 1
+        return dict(self.ovens)
+
+    def decode_oven_handle(self, key: tuple[int, str]) -> tuple[int, str]:
+        return key
+
+    def decode_oven(self, value: Ctez2.OvenInfo) -> Ctez2.OvenInfo:
+        return value
+
+
+class FakeClient:
+    """Node whose head and blocks by hash are set by the test"""
+
+    def __init__(self, head: dict):
+        self.head = head
+        self.blocks: dict[str, dict] = {}
+        self.shell = SimpleNamespace(
+            head=SimpleNamespace(header=lambda: self.head['header'] | {'hash': self.head['hash']}),
+            blocks=self,
+        )
+
+    def __getitem__(self, block_hash: str):
+        return lambda: self.blocks[block_hash]
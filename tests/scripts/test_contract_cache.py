@@ -0,0 +1,140 @@
+import os
+from collections import Counter
+from os.path import join
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from unittest import TestCase
+from pytezos.michelson.parse import michelson_to_micheline
+from pytezos.michelson.program import MichelsonProgram
+
+from scripts.contract_cache import ContractCache, get_code_hash
+from tests.helpers.contracts.fa12.fa12 import Fa12
+from tests.helpers.utility import NULL_ADDRESS, get_build_dir
+from tests.scripts.base import CTEZ2_ADDRESS
+
+FA12_ADDRESS = 'KT1FakeFa12'
+MAINNET = 'NetXdQprcVkpaWU'
+GHOSTNET = 'NetXnHfVqm9iesp'
+
+
+class FakeNode:
+    """Node serving the same code at every address and counting the requests"""
+
+    def __init__(self, uri: str, chain_id: str, code: list):
+        self.code = code
+        self.requests: Counter[str] = Counter()
+        self.shell = SimpleNamespace(
+            node=SimpleNamespace(uri=[uri]),
+            chains=SimpleNamespace(main=SimpleNamespace(chain_id=lambda: self.count('chain_id', chain_id))),
+            contracts=self,
+        )
+        self.key = None
+
+    def count(self, name: str, value: object) -> object:
+        self.requests[name] += 1
+        return value
+
+    def __getitem__(self, address: str) -> SimpleNamespace:
+        return SimpleNamespace(script=lambda: self.count('script', {'code': self.code}))
+
+    def contract(self, address: str) -> str:
+        return self.count('contract', f'interface of {address}')
+
+
+class FakeCtez2:
+    def __init__(self, client: FakeNode, fa12_addresses: list[str]):
+        self.client = client
+        self.address = CTEZ2_ADDRESS
+        self.fa12_addresses = fa12_addresses
+        self.reads = 0
+
+    def get_ctez_fa12_address(self) -> str:
+        self.reads += 1
+        return self.fa12_addresses[min(self.reads, len(self.fa12_addresses)) - 1]
+
+
+class ContractCacheTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        with open(join(get_build_dir(), 'fa12.tz')) as f:
+            cls.code = michelson_to_micheline(f.read())
+
+    def setUp(self) -> None:
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.client = FakeNode('http://mainnet', MAINNET, self.code)
+
+    def test_should_download_the_code_once(self) -> None:
+        assert ContractCache(self.directory).get_code(self.client, FA12_ADDRESS) == self.code
+        assert ContractCache(self.directory).get_code(self.client, FA12_ADDRESS) == self.code
+
+        assert self.client.requests['script'] == 1
+        assert os.listdir(join(self.directory, 'code')) == [f'{get_code_hash(self.code)}.json']
+
+    def test_should_load_an_interface_matching_the_code(self) -> None:
+        fa12 = ContractCache(self.directory).load(Fa12, self.client, FA12_ADDRESS)
+
+        program = MichelsonProgram.match(self.code)
+        assert fa12.address == FA12_ADDRESS
+        assert fa12.contract.program.storage.as_micheline_expr() == program.storage.as_micheline_expr()
+        assert fa12.contract.program.parameter.as_micheline_expr() == program.parameter.as_micheline_expr()
+        assert {'transfer', 'approve', 'viewBalance', 'viewTotalSupply', 'viewAllowance'} <= set(dir(fa12.contract))
+
+    def test_should_keep_the_addresses_of_each_network_apart(self) -> None:
+        cache = ContractCache(self.directory)
+        other_client = FakeNode('http://ghostnet', GHOSTNET, self.code)
+        cache.get_code(self.client, FA12_ADDRESS)
+        cache.get_code(self.client, FA12_ADDRESS)
+        cache.get_code(other_client, FA12_ADDRESS)
+
+        assert self.client.requests == {'chain_id': 1, 'script': 1}
+        assert other_client.requests == {'chain_id': 1, 'script': 1}
+        assert os.path.exists(join(self.directory, MAINNET, 'contracts', f'{FA12_ADDRESS}.json'))
+        assert os.path.exists(join(self.directory, GHOSTNET, 'contracts', f'{FA12_ADDRESS}.json'))
+
+    def test_should_read_the_node_without_a_directory(self) -> None:
+        cache = ContractCache(None)
+        ctez2 = FakeCtez2(self.client, [FA12_ADDRESS])
+
+        assert cache.load_contract(self.client, FA12_ADDRESS) == f'interface of {FA12_ADDRESS}'
+        assert cache.get_ctez_fa12_address(ctez2) == FA12_ADDRESS
+        assert cache.get_ctez_fa12_address(ctez2) == FA12_ADDRESS
+        assert ctez2.reads == 2
+        assert self.client.requests == {'contract': 1}
+
+    def test_should_not_cache_the_unset_fa12_address(self) -> None:
+        cache = ContractCache(self.directory)
+        ctez2 = FakeCtez2(self.client, [NULL_ADDRESS, FA12_ADDRESS])
+
+        assert cache.get_ctez_fa12_address(ctez2) == NULL_ADDRESS
+        assert cache.get_ctez_fa12_address(ctez2) == FA12_ADDRESS
+        assert ContractCache(self.directory).get_ctez_fa12_address(ctez2) == FA12_ADDRESS
+        assert ctez2.reads == 2
+
+    def test_should_keep_the_fa12_address_with_the_code_hash(self) -> None:
+        cache = ContractCache(self.directory)
+        ctez2 = FakeCtez2(self.client, [FA12_ADDRESS])
+        cache.get_ctez_fa12_address(ctez2)
+        cache.get_code(self.client, CTEZ2_ADDRESS)
+
+        assert cache.read(MAINNET, 'contracts', f'{CTEZ2_ADDRESS}.json') == {
+            'ctez_fa12_address': FA12_ADDRESS,
+            'code_hash': get_code_hash(self.code),
+        }
+
+    def test_should_download_again_over_a_corrupt_file(self) -> None:
+        cache = ContractCache(self.directory)
+        cache.get_code(self.client, FA12_ADDRESS)
+        entry_path = join(self.directory, MAINNET, 'contracts', f'{FA12_ADDRESS}.json')
+        code_path = join(self.directory, 'code', f'{get_code_hash(self.code)}.json')
+
+        for path, content in [(code_path, '[{"prim": "para'), (entry_path, '{"code_ha'), (code_path, '')]:
+            with open(path, 'w') as f:
+                f.write(content)
+            assert ContractCache(self.directory).get_code(self.client, FA12_ADDRESS) == self.code
+
+        os.remove(code_path)
+        assert ContractCache(self.directory).get_code(self.client, FA12_ADDRESS) == self.code
+        assert self.client.requests['script'] == 5
+        assert not [name for name in os.listdir(join(self.directory, 'code')) if name.endswith('.tmp')]
@@ -0,0 +1,69 @@
+from unittest import TestCase
+
+from scripts.gas_profile import CallGas, profile_call
+from tests.scripts.base import CTEZ2_ADDRESS
+
+FA12_ADDRESS = 'KT1FakeFa12'
+NAMES = {CTEZ2_ADDRESS: 'ctez2', FA12_ADDRESS: 'fa12'}
+HOUSEKEEPING = 3_000
+BODY = 5_000
+# paid by the first add_liquidity of the sender, whether housekeeping ran before or not
+OWNER_ENTRY = 2_000
+
+
+def content(milligas: int, internal: list[dict] = ()) -> dict:
+    return {'metadata': {
+        'operation_result': {'status': 'applied', 'consumed_milligas': str(milligas)},
+        'internal_operation_results': list(internal),
+    }}
+
+
+def mint(milligas: int) -> dict:
+    return {'kind': 'transaction', 'destination': FA12_ADDRESS, 'parameters': {'entrypoint': 'mint_or_burn'}, 'result': {'status': 'applied', 'consumed_milligas': str(milligas)}}
+
+
+class FakeGroup:
+    """Simulates the ctez2 calls of the group, housekeeping is paid by the first one
+    and the owner entry by the first add_liquidity"""
+
+    def __init__(self, manager: 'FakeManager', calls: tuple[str, ...]):
+        self.manager = manager
+        self.calls = calls
+
+    def fill(self) -> 'FakeGroup':
+        return self
+
+    def run(self) -> dict:
+        self.manager.groups.append(self.calls)
+        contents = []
+        housekeeping, owner_entry = HOUSEKEEPING, OWNER_ENTRY
+        for call in self.calls:
+            if call == 'approve':
+                contents.append(content(100))
+                continue
+            internal = [mint(700)] if housekeeping else []
+            milligas = housekeeping + (owner_entry + BODY if call == 'add_liquidity' else 1_000)
+            contents.append(content(milligas, internal))
+            housekeeping = 0
+            owner_entry = 0 if call == 'add_liquidity' else owner_entry
+        return {'contents': contents}
+
+
+class FakeManager:
+    def __init__(self):
+        self.groups: list[tuple[str, ...]] = []
+
+    def bulk(self, *calls: str) -> FakeGroup:
+        return FakeGroup(self, calls)
+
+
+class GasProfileTestCase(TestCase):
+    def test_should_only_count_the_housekeeping_out_of_the_first_call(self) -> None:
+        manager = FakeManager()
+
+        profile = profile_call(manager, 'add_liquidity', 'add_liquidity', ['approve'], 'create_oven', NAMES)
+
+        assert manager.groups == [('approve', 'add_liquidity'), ('approve', 'create_oven', 'add_liquidity')]
+        assert profile.first == CallGas(HOUSEKEEPING + OWNER_ENTRY + BODY, {'fa12 %mint_or_burn': 700})
+        assert profile.after_warm_up == CallGas(OWNER_ENTRY + BODY, {})
+        assert profile.housekeeping == HOUSEKEEPING
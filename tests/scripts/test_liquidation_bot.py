@@ -0,0 +1,114 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest import TestCase
+from pytezos.client import PyTezosClient
+from pytezos.context.impl import ExecutionContext
+from pytezos.crypto.key import Key
+
+from scripts.liquidation_bot import PENDING_BLOCKS, LiquidationBot
+from tests.helpers.model import ctez2 as ctez2_model
+from tests.helpers.model.liquidation import Liquidation, LiquidationPlan
+from tests.helpers.model.oven import Handle
+from tests.scripts.base import ALICE, BOB, CTEZ2_ADDRESS, FakeClient, FakeCtez2, make_block, oven
+
+COST_PER_BYTE = 250
+FEE = 1_000
+STORAGE_LIMIT = 100
+
+
+class FakeLiquidationCtez2(FakeCtez2):
+    def get_ctez_fa12_address(self) -> str:
+        return 'KT1FakeFa12'
+
+    def tez_to_ctez(self, to: str, min_ctez_bought: int, deadline: int) -> SimpleNamespace:
+        return SimpleNamespace(with_amount=lambda amount: ('tez_to_ctez', min_ctez_bought, amount))
+
+    def liquidate_oven(self, owner: str, oven_id: int, quantity: int, to: str) -> tuple:
+        return ('liquidate_oven', owner, oven_id, quantity)
+
+
+class FakeOperationGroup:
+    def __init__(self, manager: 'FakeManager', calls: tuple):
+        self.manager = manager
+        self.calls = calls
+        self.contents = [{'fee': str(FEE), 'storage_limit': str(STORAGE_LIMIT)} for _ in calls]
+
+    def autofill(self) -> 'FakeOperationGroup':
+        return self
+
+    def sign(self) -> 'FakeOperationGroup':
+        return self
+
+    def inject(self) -> dict:
+        self.manager.injected.append(self.calls)
+        return {'hash': f'op{len(self.manager.injected)}'}
+
+
+class FakeManager(PyTezosClient):
+    """Manager whose node is a FakeClient and whose operation groups are recorded
+    instead of injected"""
+
+    def __init__(self, head: dict):
+        super().__init__(context=ExecutionContext(key=Key.generate(export=False)))
+        self.node = FakeClient(head)
+        self.node.shell.head.context = SimpleNamespace(constants=lambda: {'minimal_block_delay': '8', 'cost_per_byte': str(COST_PER_BYTE)})
+        self.injected: list[tuple] = []
+
+    @property
+    def shell(self) -> SimpleNamespace:
+        return self.node.shell
+
+    def contract(self, address: str) -> None:
+        return None
+
+    def bulk(self, *calls: Any) -> FakeOperationGroup:
+        return FakeOperationGroup(self, calls)
+
+
+class LiquidationBotTestCase(TestCase):
+    def setUp(self) -> None:
+        self.ctez2 = FakeLiquidationCtez2(CTEZ2_ADDRESS, {(0, ALICE): oven(100, 10)})
+        self.manager = FakeManager(make_block(10, 'B10', 'B9'))
+        self.bot = LiquidationBot(self.manager, self.ctez2, max_liquidations=10, dry_run=False)
+        asyncio.run(self.bot.bootstrap())
+
+    def test_should_switch_branch_without_reloading(self) -> None:
+        self.bot.apply_block(make_block(11, 'B11', 'B10', [((0, ALICE), oven(110, 10))]))
+        self.bot.apply_block(make_block(12, 'B12', 'B11', [((1, BOB), oven(120, 20))]))
+
+        # levels 11 and 12 are replaced by another branch
+        self.manager.node.blocks['C12'] = make_block(12, 'C12', 'C11', [((2, BOB), oven(220, 20))])
+        self.manager.node.blocks['C11'] = make_block(11, 'C11', 'B10', [((0, ALICE), None)])
+
+        assert asyncio.run(self.bot.switch_branch(make_block(13, 'C13', 'C12', [((0, ALICE), oven(130))]))) is True
+        assert self.ctez2.loads == 1
+        assert self.bot.block_hash == 'C13'
+        assert self.bot.index.ovens == {
+            Handle(0, ALICE): ctez2_model.OvenInfo(*oven(130)),
+            Handle(2, BOB): ctez2_model.OvenInfo(*oven(220, 20)),
+        }
+        # only the ovens with ctez outstanding can be liquidated
+        assert Handle(0, ALICE) not in self.bot.index
+        assert Handle(2, BOB) in self.bot.index
+
+    def test_should_not_switch_a_branch_forking_before_the_kept_blocks(self) -> None:
+        self.bot.apply_block(make_block(11, 'B11', 'B10'))
+        self.manager.node.blocks['C11'] = make_block(11, 'C11', 'C10')
+        self.manager.node.blocks['C10'] = make_block(10, 'C10', 'C9')
+
+        assert asyncio.run(self.bot.switch_branch(make_block(12, 'C12', 'C11'))) is False
+
+    def test_should_only_inject_a_plan_the_balance_covers(self) -> None:
+        plan = LiquidationPlan([Liquidation(Handle(0, ALICE), 10, 90)], ctez_to_buy=10, tez_to_sell=1_000)
+        spent = plan.tez_to_sell + 2 * (FEE + STORAGE_LIMIT * COST_PER_BYTE)
+
+        asyncio.run(self.bot.submit(plan, 11, 100, spent - 1))
+
+        assert self.manager.injected == []
+        assert self.bot.pending == {}
+
+        asyncio.run(self.bot.submit(plan, 11, 100, spent))
+
+        assert self.manager.injected == [(('tez_to_ctez', 10, 1_000), ('liquidate_oven', ALICE, 0, 10))]
+        assert self.bot.pending == {Handle(0, ALICE): 11 + PENDING_BLOCKS}
@@ -0,0 +1,107 @@
+from unittest import TestCase
+from pytezos.rpc.errors import RpcError
+
+from scripts.liquidity_events import EventGapError, LiquidityEvent, check_continuity, find_event_level, get_last_event_id
+from tests.helpers.contracts.ctez2.ctez2 import Ctez2
+from tests.scripts.base import CTEZ2_ADDRESS, OTHER_ADDRESS
+
+
+class FakeEventsCtez2:
+    """Contract originated at origination_level whose last_event_id at each level
+    is given, the node answers 404 before the origination like pytezos raises it"""
+
+    def __init__(self, origination_level: int, last_event_ids: list[int]):
+        self.address = CTEZ2_ADDRESS
+        self.origination_level = origination_level
+        self.last_event_ids = last_event_ids
+        self.levels: list[int] = []
+
+    def get_last_event_id(self, level: int) -> int:
+        self.levels.append(level)
+        if level < self.origination_level:
+            raise RpcError(f'Not found: /chains/main/blocks/{level}/context/contracts/{self.address}/storage')
+        return self.last_event_ids[level - self.origination_level]
+
+
+def event(event_id: int, level: int = 1) -> LiquidityEvent:
+    return LiquidityEvent(level, f'op{event_id}', 'collect_from_liquidity', Ctez2.CollectFromLiquidityEvent(event_id, 10, 1, True))
+
+
+class CheckContinuityTestCase(TestCase):
+    def test_should_pass_the_following_events(self) -> None:
+        events = [event(4), event(5), event(6)]
+
+        assert list(check_continuity(events, 3)) == events
+
+    def test_should_skip_the_events_up_to_the_last_event_id(self) -> None:
+        # the first block of the backfill can hold events already yielded
+        events = [event(2), event(3), event(4), event(4), event(5)]
+
+        assert list(check_continuity(events, 3)) == [event(4), event(5)]
+
+    def test_should_raise_on_a_gap_after_the_previous_events(self) -> None:
+        events = check_continuity([event(4), event(6, level=7)], 3)
+
+        assert next(events) == event(4)
+        with self.assertRaises(EventGapError) as r:
+            next(events)
+        assert r.exception.expected_id == 5
+        assert r.exception.event == event(6, level=7)
+
+    def test_should_raise_on_a_gap_before_the_first_event(self) -> None:
+        with self.assertRaises(EventGapError) as r:
+            list(check_continuity([event(5)], 3))
+        assert r.exception.expected_id == 4
+
+
+class FindEventLevelTestCase(TestCase):
+    def setUp(self) -> None:
+        # levels 10 to 17, events 1 and 2 at level 11, none from 12 to 15, event 3 at level 16
+        self.ctez2 = FakeEventsCtez2(10, [0, 2, 2, 2, 2, 2, 3, 3])
+
+    def test_should_find_the_level_of_each_event(self) -> None:
+        assert [find_event_level(self.ctez2, event_id, 17) for event_id in [1, 2, 3]] == [11, 11, 16]
+
+    def test_should_find_an_event_of_the_head(self) -> None:
+        assert find_event_level(self.ctez2, 3, 16) == 16
+
+    def test_should_find_an_event_of_the_origination_level(self) -> None:
+        ctez2 = FakeEventsCtez2(10, [1, 1])
+
+        assert find_event_level(ctez2, 1, 11) == 10
+
+    def test_should_fail_for_an_event_after_the_head(self) -> None:
+        with self.assertRaises(ValueError):
+            find_event_level(self.ctez2, 3, 15)
+        with self.assertRaises(ValueError):
+            find_event_level(self.ctez2, 4, 17)
+
+    def test_should_bisect_the_levels(self) -> None:
+        ctez2 = FakeEventsCtez2(10, [0] * 1_000 + [1])
+
+        assert find_event_level(ctez2, 1, 1_010) == 1_010
+        assert len(ctez2.levels) <= 2 + (1_010).bit_length()
+
+
+class GetLastEventIdTestCase(TestCase):
+    def test_should_be_0_before_the_origination(self) -> None:
+        ctez2 = FakeEventsCtez2(10, [4])
+
+        assert get_last_event_id(ctez2, 9) == 0
+        assert get_last_event_id(ctez2, 10) == 4
+
+    def test_should_raise_the_other_errors(self) -> None:
+        ctez2 = FakeEventsCtez2(10, [4])
+        errors = [
+            RpcError(f'Unauthorized: /chains/main/blocks/9/context/contracts/{CTEZ2_ADDRESS}/storage'),
+            RpcError(f'Not found: /chains/main/blocks/9/context/contracts/{OTHER_ADDRESS}/storage'),
+            RpcError({'kind': 'temporary', 'id': 'failure', 'msg': 'Too many requests'}),
+        ]
+        for error in errors:
+            def get_last_event_id_failing(level: int, error: RpcError = error) -> int:
+                raise error
+            ctez2.get_last_event_id = get_last_event_id_failing
+
+            with self.assertRaises(RpcError) as r:
+                get_last_event_id(ctez2, 9)
+            assert r.exception is error
@@ -0,0 +1,76 @@
+import json
+import os
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import click
+from click.testing import CliRunner
+
+from scripts.newton_fuzz import load_checkpoint, merge_results, newton_fuzz, run_shard, save_checkpoint, severity, shard_sizes
+
+CONFIG = {'samples': 300, 'shards': 3, 'seed': 0, 'max_exponent': 3, 'worst': 5}
+
+
+class NewtonFuzzTestCase(TestCase):
+    def setUp(self) -> None:
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = join(directory.name, 'newton_fuzz.json')
+
+    def test_should_split_the_samples_between_the_shards(self) -> None:
+        assert shard_sizes(10, 3) == [4, 3, 3]
+        assert shard_sizes(2, 3) == [1, 1, 0]
+
+    def test_should_run_the_same_samples_for_a_shard(self) -> None:
+        result = run_shard(0, 1, 100, 3, 5)
+
+        assert result == run_shard(0, 1, 100, 3, 5)
+        assert result != run_shard(0, 2, 100, 3, 5)
+        assert sum(result['histogram'].values()) == 100
+        assert len(result['worst']) == 5
+        assert [severity(s) for s in result['worst']] == sorted((severity(s) for s in result['worst']), reverse=True)
+        assert result['failures_count'] == 0
+
+    def test_should_keep_the_shards_of_the_same_config(self) -> None:
+        shards = {'0': run_shard(0, 0, 10, 3, 5)}
+
+        assert load_checkpoint(self.checkpoint, CONFIG) == {}
+        save_checkpoint(self.checkpoint, CONFIG, shards)
+
+        assert load_checkpoint(self.checkpoint, CONFIG) == shards
+        assert not os.path.exists(f'{self.checkpoint}.tmp')
+        with self.assertRaises(click.ClickException):
+            load_checkpoint(self.checkpoint, {**CONFIG, 'seed': 1})
+
+    def test_should_merge_the_shards(self) -> None:
+        # the shards go through the checkpoint, with the histogram keys as strings
+        results = json.loads(json.dumps([run_shard(0, i, n, 3, 5) for i, n in enumerate(shard_sizes(300, 3))]))
+
+        merged = merge_results(results, 5)
+
+        assert merged['samples'] == 300
+        assert sum(merged['histogram'].values()) == 300
+        assert all(isinstance(error, int) for error in merged['histogram'])
+        all_worst = sorted((s for r in results for s in r['worst']), key=severity, reverse=True)
+        assert [severity(s) for s in merged['worst']] == [severity(s) for s in all_worst[:5]]
+        assert merged['failures_count'] == 0
+
+    def test_should_resume_from_the_checkpoint(self) -> None:
+        args = ['--samples', '300', '--shards', '3', '--max-exponent', '3', '--worst', '5', '--workers', '1', '--checkpoint', self.checkpoint]
+        result = CliRunner().invoke(newton_fuzz, args)
+        assert result.exit_code == 0, result.output
+        with open(self.checkpoint) as f:
+            checkpoint = json.load(f)
+        assert checkpoint['config'] == CONFIG
+
+        # the run stopped before the last shard
+        shards = dict(checkpoint['shards'])
+        del shards['2']
+        save_checkpoint(self.checkpoint, CONFIG, shards)
+        resumed = CliRunner().invoke(newton_fuzz, args)
+
+        assert resumed.exit_code == 0, resumed.output
+        assert '2 of 3 shards are already done, running 1' in resumed.output
+        assert resumed.output.split('Samples:')[1] == result.output.split('Samples:')[1]
+        with open(self.checkpoint) as f:
+            assert json.load(f) == checkpoint
@@ -0,0 +1,48 @@
+import json
+import os
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from tests.helpers import operation_result_recorder
+from tests.helpers.operation_result_recorder import OperationResultRecorder
+
+
+def recorder(**data: dict) -> OperationResultRecorder:
+    recorder = OperationResultRecorder()
+    recorder.data = data
+    return recorder
+
+
+class WriteToFileTestCase(TestCase):
+    def setUp(self) -> None:
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = join(directory.name, 'gas_consumption.json')
+        with open(self.filename, 'w') as f:
+            json.dump({'stale': {'consumed_gas': 1}}, f)
+        patcher = patch.object(operation_result_recorder, 'written_files', set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def load(self) -> dict:
+        with open(self.filename) as f:
+            return json.load(f)
+
+    def test_should_replace_the_records_of_a_previous_run(self) -> None:
+        recorder(first={'consumed_gas': 2}).write_to_file(self.filename)
+
+        assert self.load() == {'first': {'consumed_gas': 2}}
+
+    def test_should_merge_the_records_of_the_same_run(self) -> None:
+        recorder(first={'consumed_gas': 2}).write_to_file(self.filename)
+        recorder(second={'consumed_gas': 3}).write_to_file(self.filename)
+
+        assert self.load() == {'first': {'consumed_gas': 2}, 'second': {'consumed_gas': 3}}
+
+    def test_should_merge_into_the_file_of_parallel_tests(self) -> None:
+        with patch.dict(os.environ, {'SANDBOX_NODE_PORT': '18732'}):
+            recorder(first={'consumed_gas': 2}).write_to_file(self.filename)
+
+        assert self.load() == {'stale': {'consumed_gas': 1}, 'first': {'consumed_gas': 2}}
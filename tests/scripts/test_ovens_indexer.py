@@ -0,0 +1,145 @@
+import asyncio
+from typing import AsyncIterator, Optional
+from unittest import TestCase
+from unittest.mock import patch
+
+from scripts.ovens_indexer import HISTORY_LEVELS, OvensIndexer, OvensStore
+from tests.scripts.base import ALICE, BOB, CTEZ2_ADDRESS, OTHER_ADDRESS, FakeClient, FakeCtez2, make_block, oven
+
+
+class OvensStoreTestCase(TestCase):
+    def setUp(self) -> None:
+        self.store = OvensStore(':memory:')
+        self.store.reset(CTEZ2_ADDRESS, {(0, ALICE): oven(100), (1, BOB): oven(200)}, 10, 'B10')
+
+    def test_should_reset_the_ovens_and_the_block(self) -> None:
+        assert self.store.get_block() == (10, 'B10')
+        assert self.store.get_ctez_address() == CTEZ2_ADDRESS
+        assert self.store.count() == 2
+
+        self.store.reset(OTHER_ADDRESS, {(2, ALICE): oven(300)}, 20, 'B20')
+
+        assert self.store.get_block() == (20, 'B20')
+        assert self.store.get_ctez_address() == OTHER_ADDRESS
+        assert list(self.store.iter_ovens()) == [((2, ALICE), oven(300))]
+        assert self.store.rollback() is False
+
+    def test_should_apply_updates_and_removals(self) -> None:
+        self.store.apply([((0, ALICE), oven(150, 10)), ((1, BOB), None), ((3, ALICE), oven(400))], 11, 'B11')
+
+        assert self.store.get_block() == (11, 'B11')
+        assert self.store.get_oven(ALICE, 0) == oven(150, 10)
+        assert self.store.get_oven(BOB, 1) is None
+        assert dict(self.store.iter_ovens(ALICE)) == {(0, ALICE): oven(150, 10), (3, ALICE): oven(400)}
+        assert list(self.store.iter_ovens(BOB)) == []
+        assert self.store.count() == 2
+
+    def test_should_roll_back_the_last_blocks(self) -> None:
+        initial = dict(self.store.iter_ovens())
+        self.store.apply([((0, ALICE), oven(150)), ((3, ALICE), oven(400))], 11, 'B11')
+        after_11 = dict(self.store.iter_ovens())
+        # the same oven updated twice in a block is restored to its value before the block
+        self.store.apply([((0, ALICE), oven(160)), ((0, ALICE), None), ((1, BOB), None)], 12, 'B12')
+
+        assert self.store.rollback() is True
+        assert self.store.get_block() == (11, 'B11')
+        assert dict(self.store.iter_ovens()) == after_11
+
+        assert self.store.rollback() is True
+        assert self.store.get_block() == (10, 'B10')
+        assert dict(self.store.iter_ovens()) == initial
+        assert self.store.rollback() is False
+
+    def test_should_keep_a_limited_history(self) -> None:
+        for level in range(11, 11 + 2 * HISTORY_LEVELS):
+            self.store.apply([((0, ALICE), oven(level))], level, f'B{level}')
+
+        rollbacks = 0
+        while self.store.rollback():
+            rollbacks += 1
+
+        assert rollbacks == HISTORY_LEVELS - 1
+        level, _ = self.store.get_block()
+        assert self.store.get_oven(ALICE, 0) == oven(level)
+
+
+class OvensIndexerTestCase(TestCase):
+    def setUp(self) -> None:
+        self.ctez2 = FakeCtez2(CTEZ2_ADDRESS, {(0, ALICE): oven(100)})
+        self.client = FakeClient(make_block(10, 'B10', 'B9'))
+        self.store = OvensStore(':memory:')
+
+    def make_indexer(self, ctez2: Optional[FakeCtez2] = None) -> OvensIndexer:
+        return OvensIndexer(self.client, ctez2 or self.ctez2, self.store)
+
+    def test_should_load_the_big_map_into_an_empty_store(self) -> None:
+        assert self.make_indexer().start() == 10
+        assert self.ctez2.loads == 1
+        assert self.store.get_block() == (10, 'B10')
+        assert list(self.store.iter_ovens()) == [((0, ALICE), oven(100))]
+
+    def test_should_resume_from_the_store(self) -> None:
+        self.make_indexer().start()
+        self.make_indexer().process_block(make_block(11, 'B11', 'B10', [((1, BOB), oven(200))]))
+        self.client.head = make_block(15, 'B15', 'B14')
+
+        assert self.make_indexer().start() == 11
+        assert self.ctez2.loads == 1
+        assert self.store.count() == 2
+
+    def test_should_reload_a_store_of_another_contract(self) -> None:
+        self.make_indexer().start()
+        other = FakeCtez2(OTHER_ADDRESS, {(5, BOB): oven(500)})
+
+        assert self.make_indexer(other).start() == 10
+        assert other.loads == 1
+        assert self.store.get_ctez_address() == OTHER_ADDRESS
+        assert list(self.store.iter_ovens()) == [((5, BOB), oven(500))]
+
+    def test_should_switch_branch_without_reloading(self) -> None:
+        indexer = self.make_indexer()
+        indexer.start()
+        indexer.process_block(make_block(11, 'B11', 'B10', [((0, ALICE), oven(110))]))
+        indexer.process_block(make_block(12, 'B12', 'B11', [((1, BOB), oven(120))]))
+
+        # levels 11 and 12 are replaced by another branch
+        self.client.blocks['C12'] = make_block(12, 'C12', 'C11', [((2, BOB), oven(220))])
+        self.client.blocks['C11'] = make_block(11, 'C11', 'B10', [((0, ALICE), None)])
+        level = indexer.process_block(make_block(13, 'C13', 'C12', [((3, BOB), oven(230))]))
+
+        assert level == 13
+        assert self.ctez2.loads == 1
+        assert self.store.get_block() == (13, 'C13')
+        assert dict(self.store.iter_ovens()) == {(2, BOB): oven(220), (3, BOB): oven(230)}
+
+    def test_should_reload_when_the_branch_forks_before_the_history(self) -> None:
+        indexer = self.make_indexer()
+        indexer.start()
+        indexer.process_block(make_block(11, 'B11', 'B10'))
+        self.client.blocks['C11'] = make_block(11, 'C11', 'C10')
+        self.client.blocks['C10'] = make_block(10, 'C10', 'C9')
+        self.client.head = make_block(12, 'C12', 'C11')
+
+        assert indexer.process_block(make_block(12, 'C12', 'C11')) == 12
+        assert self.ctez2.loads == 2
+        assert self.store.get_block() == (12, 'C12')
+
+    def test_should_run_on_the_followed_blocks(self) -> None:
+        followed_from = []
+
+        async def follow_blocks(client: FakeClient, level: int, poll_interval: float, confirmations: int) -> AsyncIterator[dict]:
+            followed_from.append(level)
+            for block in [
+                make_block(10, 'B10', 'B9'),
+                make_block(11, 'B11', 'B10', [((1, BOB), oven(200))]),
+                make_block(12, 'B12', 'B11', [((0, ALICE), None)]),
+            ]:
+                yield block
+
+        # the store is created on this thread and used from the threads of asyncio.to_thread
+        with patch('scripts.ovens_indexer.follow_blocks', follow_blocks):
+            asyncio.run(self.make_indexer().run(0, 2))
+
+        assert followed_from == [10]
+        assert self.store.get_block() == (12, 'B12')
+        assert list(self.store.iter_ovens()) == [((1, BOB), oven(200))]
@@ -0,0 +1,67 @@
+from unittest import TestCase
+
+from tests.helpers.utility import plan_rounds
+
+
+def elapsed(rounds: list[int], head_round: int, first_round_duration: int, delay_increment_per_round: int) -> int:
+    """Seconds between the head and the last of the blocks baked at the rounds, a level
+    starts the duration of the round of its predecessor after it and each of its
+    rounds starts when the previous one ends"""
+    round_duration = lambda round: first_round_duration + round * delay_increment_per_round
+    seconds = 0
+    for round in rounds:
+        seconds += round_duration(head_round) + sum(round_duration(r) for r in range(round))
+        head_round = round
+    return seconds
+
+
+class PlanRoundsTestCase(TestCase):
+    def test_should_bake_a_round_0_block_after_the_duration_of_the_head_round(self) -> None:
+        assert plan_rounds(1, 0, 1, 1) == [0]
+        assert plan_rounds(3, 2, 1, 1) == [0]
+        assert plan_rounds(8, 3, 2, 2) == [0]
+        assert plan_rounds(0, 3, 2, 2) == []
+
+    def test_should_bake_late_rounds_for_a_long_gap(self) -> None:
+        rounds = plan_rounds(1_000, 0, 1, 1)
+
+        assert elapsed(rounds, 0, 1, 1) == 1_000
+        assert rounds[-1] == 0
+        assert max(rounds) > 10
+        assert len(rounds) < 10
+
+    def test_should_start_after_the_duration_of_the_head_round(self) -> None:
+        rounds = plan_rounds(50, 3, 2, 1)
+
+        assert elapsed(rounds, 3, 2, 1) == 50
+        assert rounds[-1] == 0
+        assert rounds != plan_rounds(50, 0, 2, 1)
+        assert elapsed(plan_rounds(50, 0, 2, 1), 0, 2, 1) == 50
+
+    def test_should_reach_every_gap_above_the_shortest_blocks(self) -> None:
+        for head_round in range(4):
+            for seconds in range(1 + head_round, 300):
+                rounds = plan_rounds(seconds, head_round, 1, 1)
+
+                assert elapsed(rounds, head_round, 1, 1) == seconds
+                assert rounds[-1] == 0
+
+    def test_should_fail_for_a_gap_that_cannot_be_reached(self) -> None:
+        # shorter than a round 0 block
+        with self.assertRaises(ValueError):
+            plan_rounds(1, 2, 1, 1)
+        # longer than a round 0 block, shorter than two
+        with self.assertRaises(ValueError):
+            plan_rounds(3, 0, 2, 1)
+        # the same gap is reached from a later round
+        assert plan_rounds(3, 1, 2, 1) == [0]
+        # not a multiple of the durations
+        with self.assertRaises(ValueError):
+            plan_rounds(1_001, 0, 2, 2)
+
+    def test_should_take_an_earlier_round_when_the_rest_cannot_be_reached(self) -> None:
+        # the latest round 7 leaves 10 seconds, less than a round 7 block and a round 0 one
+        rounds = plan_rounds(50, 3, 2, 1)
+
+        assert rounds[0] < 7
+        assert elapsed(rounds, 3, 2, 1) == 50